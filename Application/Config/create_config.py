@@ -1,10 +1,14 @@
+import glob
+import hashlib
+import heapq
 import json
 import os
 
 # noinspection PyPep8Naming
 import config_main as CONFIG
 from Application.Frame.transferJobPorts import create_ports_dict
-from Utils.log_handler import log_job_to_config, log_setup_info_to_console, verbose_log_to_console
+from Application.Utils.job_plan import read_plan_file, write_plan_file, remove_plan_files
+from Utils.log_handler import log_job_to_config, log_setup_info_to_console, verbose_log_to_console, log_error_to_console
 
 """
 Module handles the processing of desired jobs into json config file that is used by APPL layer for execution
@@ -13,6 +17,10 @@ Module handles the processing of desired jobs into json config file that is used
 jobs_dict = []
 # list of (name, save, show, is_image) -> not to search all the dictionary for them
 created_port_list = []
+# ports of deleted duplicated jobs and the ports of the jobs that compute the same data
+merged_ports = dict()
+# warnings of the job sort and duplicate search as (text, error), logged again when the plan is read from a plan file
+plan_warnings = []
 # Process level default value
 PROCESS_DEFAULT_VALUE = -1
 
@@ -37,7 +45,7 @@ def process_ports_list(ports_list: list):
 
 def create_dictionary_element(job_module: str, job_name: str, init_func_name: str, main_func_name: str,
                               main_func_param: list = None, output_ports: list = None, init_func_param: list = None,
-                              input_ports: list = None, max_wave: int = 0):
+                              input_ports: list = None, max_wave: int = 0, input_wave_offsets: list = None):
     """
     Creates a dictionary element for a job.
     :param job_module: name of the python module where the job functions are
@@ -49,6 +57,7 @@ def create_dictionary_element(job_module: str, job_name: str, init_func_name: st
     :param main_func_param: list of maine function param
     :param output_ports: list of output ports
     :param max_wave: port wave offset. If 0 it is in current wave.
+    :param input_wave_offsets: wave offset of each input port, None if all input ports use max_wave
     :return: dictionary for the job
     """
     assert max_wave < CONFIG.APPL_NR_WAVES, 'CONFIG ERROR: PLEASE CHECK NUMBER OF WAVES'
@@ -61,10 +70,13 @@ def create_dictionary_element(job_module: str, job_name: str, init_func_name: st
     dict_element['module'] = job_module
     dict_element['name'] = job_name
 
+    if input_wave_offsets is None and input_ports is not None:
+        input_wave_offsets = [max_wave] * len(input_ports)
+
     input_port_list = []
     if input_ports is not None:
-        for port in input_ports:
-            input_port_list.append({'port name': port})
+        for port, wave_offset in zip(input_ports, input_wave_offsets):
+            input_port_list.append({'port name': port, 'wave offset': wave_offset})
     else:
         input_port_list = None
 
@@ -102,6 +114,7 @@ def create_dictionary_element(job_module: str, job_name: str, init_func_name: st
         output_port_list = None
 
     dict_element['output ports'] = output_port_list
+    dict_element['max wave'] = max_wave
 
     log_job_to_config(dict_element['name'], process_ports_list(dict_element['input ports']),
                       process_ports_list(dict_element['output ports']))
@@ -109,9 +122,73 @@ def create_dictionary_element(job_module: str, job_name: str, init_func_name: st
     return dict_element
 
 
+def rename_ports(value, ports: dict):
+    """
+    Replaces the port names in a value from the json of a job
+    :param value: value to change, can be a string or a list or dictionary with strings
+    :param ports: dictionary of old and new port names
+    :return: changed value
+    """
+    if isinstance(value, str):
+        return ports.get(value, value)
+    if isinstance(value, (list, tuple)):
+        return [rename_ports(el, ports) for el in value]
+    if isinstance(value, dict):
+        return {key: rename_ports(el, ports) for key, el in value.items()}
+
+    return value
+
+
+def get_job_hash(job: dict) -> str:
+    """
+    Canonical hash of a job. The names of the output ports are replaced with their position so jobs that compute the same data
+    with other port names have the same hash. Jobs without input or output ports can have side effects so their name is used too.
+    :param job: dictionary of job
+    :return: hash of job
+    """
+    output_names = dict()
+    if job['output ports'] is not None:
+        output_names = {job['output ports'][index]['port name']: '$OUTPUT_{}'.format(index) for index in range(len(job['output ports']))}
+
+    ignored_keys = ['processing level', 'active']
+    if job['input ports'] is not None and job['output ports'] is not None:
+        ignored_keys.append('name')
+
+    canonical_job = {key: rename_ports(value, output_names) for key, value in job.items() if key not in ignored_keys}
+
+    return hashlib.blake2b(json.dumps(canonical_job, sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
+
+
+def log_plan_warning(text: str, error: str = None) -> None:
+    """
+    Logs a warning of the job sort or duplicate search and keeps it for the plan file
+    :param text: warning
+    :param error: details of an error, None if the warning is a setup info
+    :return: None
+    """
+    plan_warnings.append((text, error))
+
+    if error is None:
+        log_setup_info_to_console(text)
+    else:
+        log_error_to_console(text, error)
+
+
+def apply_merged_ports() -> None:
+    """
+    Removes the ports of the deleted duplicated jobs from the created ports. The ports configured to be saved or shown keep the
+    requested names and are read from the ports that replace them(APPL_MERGED_PORTS).
+    :return: None
+    """
+    created_port_list[:] = [port for port in created_port_list if port[0] not in merged_ports]
+    CONFIG.APPL_MERGED_PORTS = dict(merged_ports)
+
+
 def find_duplicates_in_jobs(verbose: bool = False):
     """
-    Function that eliminates the identical jobs from list
+    Function that eliminates the jobs that compute the same data.
+    Jobs are taken in processing level order. If a job has the same hash as a previous job it is disabled and the jobs after
+    it use the outputs of the previous job.
     :param verbose: if we want debug
     :return: None
     """
@@ -124,29 +201,40 @@ def find_duplicates_in_jobs(verbose: bool = False):
                 m=job['main function'], n=job['init function'])
             verbose_log_to_console(text)
 
-    # find duplicates in each level
-    for level in range(1, jobs_dict[-1]['processing level'] + 1, 1):
-        for index in range(len(jobs_dict)):
-            if jobs_dict[index]['processing level'] == level and jobs_dict[index]['active'] is True:
-                for other_index in range(index + 1, len(jobs_dict), 1):
-                    for key in jobs_dict[index].keys():
-                        if jobs_dict[index][key] != jobs_dict[other_index][key]:
-                            break
-                    else:
-                        jobs_dict[other_index]['active'] = False
-
-    # delete identical jobs
-    while True:
-        for index in range(len(jobs_dict)):
-            if not jobs_dict[index]['active']:
-                log_setup_info_to_console(jobs_dict[index]['name'] + ' DUPLICATED JOB -> JOB DELETED')
-                del jobs_dict[index]
-                break
-        else:
-            break
+    job_hashes = dict()
+    renamed_ports = dict()
+
+    for job in sorted(jobs_dict, key=lambda x: x['processing level']):
+        if job['active'] is not True:
+            continue
+
+        if renamed_ports:
+            for key in ['input ports', 'init function parameters', 'main function parameters']:
+                job[key] = rename_ports(job[key], renamed_ports)
+
+        job_hash = get_job_hash(job)
+        original_job = job_hashes.get(job_hash)
+
+        if original_job is None:
+            job_hashes[job_hash] = job
+            continue
+
+        job['active'] = False
+        log_plan_warning(job['name'] + ' DUPLICATED JOB OF ' + original_job['name'] + ' -> JOB DELETED')
+
+        for index in range(len(job['output ports'] or [])):
+            old_port = job['output ports'][index]['port name']
+            new_port = original_job['output ports'][index]['port name']
+            if old_port != new_port:
+                renamed_ports[old_port] = new_port
+                merged_ports[old_port] = new_port
+
+    # delete disabled jobs
+    jobs_dict[:] = [job for job in jobs_dict if job['active']]
+    apply_merged_ports()
 
     if verbose:
-        verbose_log_to_console('FIND DUPLICATES JOBS FUNCTION: Job list at start')
+        verbose_log_to_console('FIND DUPLICATES JOBS FUNCTION: Job list at end')
         for job in jobs_dict:
             text = 'Job name: {name:40s} level: {lvl:4d} inputs: {a:60s} output: {b:60s} main_func: {m:30s} init_func:{n}'.format(
                 name=job['name'], lvl=job['processing level'], a=process_ports_list(job['input ports']),
@@ -155,17 +243,70 @@ def find_duplicates_in_jobs(verbose: bool = False):
             verbose_log_to_console(text)
 
 
+def get_cycles(dependents: list, positions: set) -> list:
+    """
+    Finds the cycles of jobs with the strongly connected components of the dependency graph(Kosaraju's algorithm)
+    :param dependents: list of positions of the jobs that wait for each job
+    :param positions: positions of the jobs to search
+    :return: list of cycles, every cycle is a sorted list of job positions
+    """
+    order = []
+    visited = set()
+
+    for start in sorted(positions):
+        if start in visited:
+            continue
+        visited.add(start)
+        stack = [(start, iter(dependents[start]))]
+        while stack:
+            position, children = stack[-1]
+            for child in children:
+                if child in positions and child not in visited:
+                    visited.add(child)
+                    stack.append((child, iter(dependents[child])))
+                    break
+            else:
+                order.append(position)
+                stack.pop()
+
+    waits_for = {position: [] for position in positions}
+    for position in positions:
+        for child in dependents[position]:
+            if child in positions:
+                waits_for[child].append(position)
+
+    cycles = []
+    assigned = set()
+    for start in reversed(order):
+        if start in assigned:
+            continue
+        component = []
+        stack = [start]
+        assigned.add(start)
+        while stack:
+            position = stack.pop()
+            component.append(position)
+            for parent in waits_for[position]:
+                if parent not in assigned:
+                    assigned.add(parent)
+                    stack.append(parent)
+        if len(component) > 1:
+            cycles.append(sorted(component))
+
+    return cycles
+
+
 def sort_jobs_to_avoid_missing_inputs(verbose: bool = False):
     """
     :param verbose: if we want debug
-    Resets process level of jobs to order them in input availability order
-    First job will allays pe set the image retrieval job
-    Second job will be the pyramid level job to set up the possibility of parallel run in application
-    Will disable jobs without inputs.
+    Sets the process level of jobs so every job comes after the jobs that create its input ports(Kahn's algorithm).
+    The jobs without inputs(image retrieval) get the first levels in the order they were added. Of the other jobs whose inputs are
+    created the one added first gets the next level, so jobs keep the order they were added unless they wait for a job added later.
+    Input ports of previous waves(wave offset > 0) don't order the jobs, the port was written in an earlier frame.
+    A job that reads its own output port uses the port of a previous wave and doesn't wait for itself.
+    Disables the jobs with input ports that no job creates, the jobs in a cycle and the jobs that wait for them.
     :return: None
     """
-    process_index = 0
-
     if verbose:
         verbose_log_to_console('SORT JOBS FUNCTION: After resetting process level')
         for job in jobs_dict:
@@ -173,50 +314,43 @@ def sort_jobs_to_avoid_missing_inputs(verbose: bool = False):
                 name=job['name'], lvl=job['processing level'], a=str(job['input ports']), b=str(job['output ports']))
             verbose_log_to_console(text)
 
-    # find begging of pipeline
-    for job in jobs_dict:
-        # get image job should be the first
-        if job['input ports'] is None:
-            job['processing level'] = process_index
-            process_index += 1
-
-    # loop continuous for jobs.
-    last_jobs_without_process_counter = 0
-    while True:
-        jobs_without_process = []
-        jobs_with_process = []
-
-        # create 2 list with processed jobs and unprocessed
-        for position in range(len(jobs_dict)):
-            if jobs_dict[position]['processing level'] == PROCESS_DEFAULT_VALUE:
-                jobs_without_process.append([position, [jobs_dict[position]['input ports'][p]['port name'] for p in
-                                                        range(len(jobs_dict[position]['input ports']))]])
-            else:
-                jobs_with_process.append([position, [jobs_dict[position]['output ports'][p]['port name'] for p in
-                                                     range(len(jobs_dict[position]['output ports']))]])
-
-        # break loop if all jobs were sorted
-        if len(jobs_without_process) == 0:
-            break
-
-        # break loop if we can't sort the remaining jobs
-        if last_jobs_without_process_counter != len(jobs_without_process):
-            last_jobs_without_process_counter = len(jobs_without_process)
-        else:
-            break
-
-        # for each unresolved job we search if the necessary inputs are found in a resolved job
-        for unresolved_job in jobs_without_process:
-            inputs_found = []
-            for resolved_job in jobs_with_process:
-                for input_job in unresolved_job[-1]:
-                    if input_job in resolved_job[-1] and input_job not in inputs_found:
-                        inputs_found.append(input_job)
-
-            if inputs_found.sort() == unresolved_job[-1].sort():
-                jobs_dict[unresolved_job[0]]['processing level'] = process_index
+    # port name -> positions of the jobs that create it
+    producers = dict()
+    for position in range(len(jobs_dict)):
+        for port in jobs_dict[position]['output ports'] or []:
+            producers.setdefault(port['port name'], []).append(position)
+
+    dependents = [[] for _ in range(len(jobs_dict))]
+    nr_inputs = [0] * len(jobs_dict)
+    missing_ports = [[] for _ in range(len(jobs_dict))]
+    for position in range(len(jobs_dict)):
+        for port in jobs_dict[position]['input ports'] or []:
+            if port['port name'] not in producers:
+                missing_ports[position].append(port['port name'])
+            if port.get('wave offset', 0) != 0:
+                continue
+            for producer in producers.get(port['port name'], []):
+                if producer != position:
+                    dependents[producer].append(position)
+                    nr_inputs[position] += 1
+
+    # ready jobs as (0 for jobs without inputs, position), get image job should be the first
+    ready = []
+    for position in range(len(jobs_dict)):
+        jobs_dict[position]['processing level'] = PROCESS_DEFAULT_VALUE
+        if nr_inputs[position] == 0 and not missing_ports[position]:
+            ready.append((0 if jobs_dict[position]['input ports'] is None else 1, position))
+    heapq.heapify(ready)
 
+    process_index = 0
+    while ready:
+        _, position = heapq.heappop(ready)
+        jobs_dict[position]['processing level'] = process_index
         process_index += 1
+        for dependent in dependents[position]:
+            nr_inputs[dependent] -= 1
+            if nr_inputs[dependent] == 0 and not missing_ports[dependent]:
+                heapq.heappush(ready, (1, dependent))
 
     if verbose:
         verbose_log_to_console('SORT JOBS FUNCTION: After loop for process level')
@@ -225,54 +359,119 @@ def sort_jobs_to_avoid_missing_inputs(verbose: bool = False):
                 name=job['name'], lvl=job['processing level'], a=str(job['input ports']), b=str(job['output ports']))
             verbose_log_to_console(text)
 
+    unresolved = set(position for position in range(len(jobs_dict)) if nr_inputs[position] != 0 or missing_ports[position])
+
+    for position in sorted(unresolved):
+        if missing_ports[position]:
+            log_plan_warning('JOB {} INPUT PORTS NOT CREATED BY ANY JOB'.format(jobs_dict[position]['name']),
+                             ', '.join(missing_ports[position]))
+
+    in_cycle = set()
+    for cycle in get_cycles(dependents=dependents, positions=unresolved):
+        in_cycle.update(cycle)
+        ports = [port['port name'] for position in cycle for port in jobs_dict[position]['input ports'] if port.get('wave offset', 0) == 0
+                 and any(producer in cycle and producer != position for producer in producers.get(port['port name'], []))]
+        log_plan_warning('CYCLE OF JOBS {} THROUGH PORTS'.format(', '.join(jobs_dict[position]['name'] for position in cycle)),
+                         ', '.join(dict.fromkeys(ports)))
+
+    for position in sorted(unresolved - in_cycle):
+        ports = [port['port name'] for port in jobs_dict[position]['input ports'] if port.get('wave offset', 0) == 0
+                 and any(producer in unresolved and producer != position for producer in producers.get(port['port name'], []))]
+        if ports:
+            log_plan_warning('JOB {} WAITS FOR DISABLED JOBS THROUGH PORTS'.format(jobs_dict[position]['name']), ', '.join(ports))
+
     # set to invalid jobs without inputs
-    for job in jobs_dict:
-        if job['processing level'] == PROCESS_DEFAULT_VALUE:
-            job['active'] = False
-            log_setup_info_to_console(job['name'] + ' INPUTS MISSING -> JOB DISABLED')
+    for position in sorted(unresolved):
+        jobs_dict[position]['processing level'] = PROCESS_DEFAULT_VALUE
+        jobs_dict[position]['active'] = False
+        log_plan_warning(jobs_dict[position]['name'] + ' INPUTS MISSING -> JOB DISABLED')
+
+
+def get_plan_key() -> str:
+    """
+    The sort and the duplicate search use only the jobs and the created ports, so the settings of config_main are not in the hash.
+    :return: hash of the job list and of the created ports
+    """
+    return hashlib.blake2b(json.dumps([jobs_dict, created_port_list], sort_keys=True, default=str).encode(), digest_size=16).hexdigest()
 
 
 def create_config_file(verbose: bool = False):
     """
     :param verbose: if we want debug
-    Creates config file for application to run on
+    Creates config file for application to run on.
+    With APPL_PLAN_CACHE the sorted job list is written in a binary plan file named with the hash of the jobs and of the
+    created ports, the plan files of other job lists are removed. If the plan file exists the jobs are not sorted again and the
+    warnings of the sort are logged from the plan file. The json file is written without APPL_PLAN_CACHE or with APPL_PLAN_JSON.
     :param verbose: if we want debug
     :return: None
     """
     global jobs_dict
 
+    # ports merged for the job list of a previous configuration
+    merged_ports.clear()
+    CONFIG.APPL_MERGED_PORTS = dict()
+    plan_warnings.clear()
+
     if not os.path.exists(os.path.join(os.getcwd(), CONFIG.JSON_FILE_LOCATION)):
         os.makedirs(CONFIG.JSON_FILE_LOCATION)
 
-    file = open(os.path.join(os.getcwd(), CONFIG.JSON_FILE_LOCATION, CONFIG.JSON_FILE_NAME + '.json'), 'w')
+    json_file = os.path.join(os.getcwd(), CONFIG.JSON_FILE_LOCATION, CONFIG.JSON_FILE_NAME + '.json')
+    CONFIG.APPL_INPUT_JOB_LIST = json_file
 
     if verbose:
-        verbose_log_to_console('Json file location: ' + str(file))
+        verbose_log_to_console('Json file location: ' + str(json_file))
 
     log_setup_info_to_console('NUMBER OF JOBS TRIGGERED BY USER: {}'.format(len(jobs_dict)))
 
     if len(jobs_dict) > 0:
-        sort_jobs_to_avoid_missing_inputs(verbose)
-        data_list = sorted(jobs_dict, key=lambda x: x['processing level'])
-        find_duplicates_in_jobs(verbose)
+        plan_key = get_plan_key()
+        plan_file = os.path.join(os.getcwd(), CONFIG.JSON_FILE_LOCATION, CONFIG.JSON_FILE_NAME + '_' + plan_key + '.plan')
+        plan = read_plan_file(plan_file) if CONFIG.APPL_PLAN_CACHE is True else None
+
+        if plan is not None and plan['key'] == plan_key:
+            log_setup_info_to_console('JOB PLAN READ FROM: {}'.format(plan_file))
+            for text, error in plan['warnings']:
+                log_plan_warning(text, error)
+            data_list = plan['jobs']
+            created_port_list[:] = plan['ports']
+            merged_ports.update(plan['merged ports'])
+            apply_merged_ports()
+            jobs_dict[:] = [job for job in data_list if job['active']]
+        else:
+            sort_jobs_to_avoid_missing_inputs(verbose)
+            data_list = sorted(jobs_dict, key=lambda x: x['processing level'])
+            find_duplicates_in_jobs(verbose)
 
-        for el in data_list:
-            del el['processing level']
+            for el in data_list:
+                del el['processing level']
 
-        data_to_write = json.dumps(data_list, indent=2)
+            if CONFIG.APPL_PLAN_CACHE is True:
+                # the jobs are kept as they are read from the json file
+                write_plan_file(plan_file, {'key': plan_key, 'jobs': json.loads(json.dumps(data_list)), 'ports': list(created_port_list),
+                                            'merged ports': dict(merged_ports), 'warnings': list(plan_warnings)})
+                plan_pattern = os.path.join(glob.escape(os.path.dirname(plan_file)), glob.escape(CONFIG.JSON_FILE_NAME) + '_*.plan')
+                remove_plan_files(pattern=plan_pattern, keep=plan_file)
 
-        if verbose:
-            verbose_log_to_console('Data that will be writen in json file: ')
-            verbose_log_to_console(data_to_write)
+        if verbose or CONFIG.APPL_PLAN_CACHE is False or CONFIG.APPL_PLAN_JSON is True:
+            data_to_write = json.dumps(data_list, indent=2)
+
+            if verbose:
+                verbose_log_to_console('Data that will be writen in json file: ')
+                verbose_log_to_console(data_to_write)
+
+            if CONFIG.APPL_PLAN_CACHE is False or CONFIG.APPL_PLAN_JSON is True:
+                with open(json_file, 'w') as file:
+                    file.write(data_to_write)
 
         log_setup_info_to_console('NUMBER OF JOBS ADDED TO JSON TO RUN BY APPL: {}'.format(len(jobs_dict)))
         log_setup_info_to_console('NUMBER OF PORTS ADDED TO JSON TO RUN BY APPL: {}'.format(len(created_port_list)))
 
-        file.write(data_to_write)
-        file.close()
+        if CONFIG.APPL_PLAN_CACHE is True:
+            CONFIG.APPL_INPUT_JOB_LIST = plan_file
+    else:
+        open(json_file, 'w').close()
 
-    CONFIG.APPL_INPUT_JOB_LIST = file.buffer.name
-    create_ports_dict(CONFIG.APPL_NR_WAVES)
+    create_ports_dict(CONFIG.APPL_NR_WAVES + CONFIG.APPL_PIPELINE_DEPTH - 1)
     jobs_dict.clear()
 
 
@@ -137,6 +137,43 @@ def do_get_video_capture_job(port_output_name: str = 'RAW') -> str:
     return port_output_name
 
 
+def do_tact_simulation_job(time_ms: float, port_input_name: str = None, wave_offset: int = 0, port_output_name: str = None,
+                           level: PYRAMID_LEVEL = PYRAMID_LEVEL.LEVEL_0) -> str:
+    """
+    Function for configure a job that holds the system occupied for a fixed time.
+    Used to test the schedulers and the frame deadline without real processing jobs.
+    The job is added to the job buffer.
+    :param time_ms: time the job runs in ms
+    :param port_input_name: name of port the job waits for, None for no input
+    :param wave_offset: port wave offset. If 0 it is in current wave.
+    :param port_output_name: name of port the job sets valid, None for no output
+    :param level: pyramid level to calculate at
+    :return: output port name, None for no output
+    """
+    input_port_name = transform_port_name_lvl(name=port_input_name, lvl=level) if port_input_name is not None else None
+    output_port_name = transform_port_name_lvl(name=port_output_name, lvl=level) if port_output_name is not None else None
+
+    input_port_list = [input_port_name] if input_port_name is not None else None
+    main_func_list = [time_ms, input_port_name, wave_offset, output_port_name]
+    output_port_list = [(output_port_name, transform_port_size_lvl(lvl=level, rgb=False), 'B', True)] if output_port_name is not None \
+        else []
+
+    job_name = job_name_create(action='Simulate {} ms'.format(time_ms), input_list=input_port_list, wave_offset=[wave_offset], level=level)
+
+    d = create_dictionary_element(job_module='simulation_tact_1ms',
+                                  job_name=job_name,
+                                  input_ports=input_port_list,
+                                  init_func_name='init_func', init_func_param=None,
+                                  main_func_name='main_func',
+                                  main_func_param=main_func_list,
+                                  output_ports=output_port_list,
+                                  max_wave=wave_offset)
+
+    jobs_dict.append(d)
+
+    return port_output_name
+
+
 def do_get_image_from_txt_job(line_separator, pixel_separator,
                               port_output_name: str = 'RAW', is_rgb=False) -> str:
     """
@@ -946,6 +983,7 @@ def do_matrix_difference_job(port_input_name_1: str, port_input_name_2: str,
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_port_1, wave_offset_port_2),
+                                  input_wave_offsets=[wave_offset_port_1, wave_offset_port_2],
                                   init_func_name='init_func', init_func_param=None,
                                   main_func_name='difference_2_matrix',
                                   main_func_param=main_func_list,
@@ -991,6 +1029,7 @@ def do_matrix_difference_1_px_offset_job(port_input_name_1: str, port_input_name
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_port_1, wave_offset_port_2),
+                                  input_wave_offsets=[wave_offset_port_1, wave_offset_port_2],
                                   init_func_name='init_func', init_func_param=None,
                                   main_func_name='difference_2_matrix_1_px_offset',
                                   main_func_param=main_func_list,
@@ -1038,6 +1077,7 @@ def do_matrix_sum_job(port_input_name_1: str, port_input_name_2: str,
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_port_1, wave_offset_port_2),
+                                  input_wave_offsets=[wave_offset_port_1, wave_offset_port_2],
                                   init_func_name='init_func', init_func_param=None,
                                   main_func_name='add_2_matrix',
                                   main_func_param=main_func_list,
@@ -1083,6 +1123,7 @@ def do_matrix_bitwise_and_job(port_input_name_1: str, port_input_name_2: str,
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_port_1, wave_offset_port_2),
+                                  input_wave_offsets=[wave_offset_port_1, wave_offset_port_2],
                                   init_func_name='init_func', init_func_param=None,
                                   main_func_name='and_bitwise_between_2_images',
                                   main_func_param=main_func_list,
@@ -1128,6 +1169,7 @@ def do_matrix_bitwise_or_job(port_input_name_1: str, port_input_name_2: str,
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_port_1, wave_offset_port_2),
+                                  input_wave_offsets=[wave_offset_port_1, wave_offset_port_2],
                                   init_func_name='init_func', init_func_param=None,
                                   main_func_name='or_bitwise_between_2_images',
                                   main_func_param=main_func_list,
@@ -1184,6 +1226,7 @@ def do_matrix_bitwise_or_4_job(port_input_name_1: str, port_input_name_2: str, p
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_port_1, wave_offset_port_2, wave_offset_port_3, wave_offset_port_4),
+                                  input_wave_offsets=[wave_offset_port_1, wave_offset_port_2, wave_offset_port_3, wave_offset_port_4],
                                   init_func_name='init_func', init_func_param=None,
                                   main_func_name='or_bitwise_between_4_images',
                                   main_func_param=main_func_list,
@@ -1229,6 +1272,7 @@ def do_matrix_bitwise_xor_job(port_input_name_1: str, port_input_name_2: str,
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_port_1, wave_offset_port_2),
+                                  input_wave_offsets=[wave_offset_port_1, wave_offset_port_2],
                                   init_func_name='init_func', init_func_param=None,
                                   main_func_name='xor_bitwise_between_2_images',
                                   main_func_param=main_func_list,
@@ -1274,6 +1318,7 @@ def do_matrix_intersect_job(port_input_name: str, port_input_mask: str,
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_port_1, wave_offset_port_2),
+                                  input_wave_offsets=[wave_offset_port_1, wave_offset_port_2],
                                   init_func_name='init_func', init_func_param=None,
                                   main_func_name='intersect_between_2_images',
                                   main_func_param=main_func_list,
@@ -2903,7 +2948,8 @@ def do_kernel_cross_convolution_job(job_name: str, port_input_name: str,
                                   init_func_name='init_func_global', init_func_param=None,
                                   main_func_name='main_func_cross',
                                   main_func_param=main_func_list,
-                                  output_ports=output_port_list)
+                                  output_ports=output_port_list,
+                                  max_wave=wave_offset)
 
     jobs_dict.append(d)
 
@@ -3042,6 +3088,7 @@ def do_gradient_magnitude_job(job_name: str, port_input_name_gx: str, port_input
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_gx, wave_offset_gy),
+                                  input_wave_offsets=[wave_offset_gx, wave_offset_gy],
                                   init_func_name='init_func_global', init_func_param=None,
                                   main_func_name='main_func',
                                   main_func_param=main_func_list,
@@ -3084,6 +3131,7 @@ def do_gradient_orientation_job(job_name: str, port_input_name_gx: str, port_inp
                                   job_name=job_name,
                                   input_ports=input_port_list,
                                   max_wave=max(wave_offset_gx, wave_offset_gy),
+                                  input_wave_offsets=[wave_offset_gx, wave_offset_gy],
                                   init_func_name='init_func_global', init_func_param=None,
                                   main_func_name='main_func_orientation',
                                   main_func_param=main_func_list,
@@ -4961,7 +5009,8 @@ def do_u_net_edge(port_input_name: str, location_model: str = 'unet_edge',
                                   init_func_name='init_func', init_func_param=[location_model],
                                   main_func_name='main_run_unet_edge_func',
                                   main_func_param=main_func_list,
-                                  output_ports=output_port_list)
+                                  output_ports=output_port_list,
+                                  max_wave=wave_offset)
 
     jobs_dict.append(d)
 
@@ -5215,7 +5264,8 @@ def do_semseg_base_job(port_input_name: str, number_of_classes: int, model: str,
                                   init_func_name='init_func_semseg_keras_repo', init_func_param=[location_model, model_name, output_port_size],
                                   main_func_name='main_func_semseg_keras_repo',
                                   main_func_param=main_func_list,
-                                  output_ports=output_port_list)
+                                  output_ports=output_port_list,
+                                  max_wave=wave_offset)
 
     jobs_dict.append(d)
 
@@ -5,8 +5,9 @@ import shutil
 
 import config_main
 
-from Application.Config.create_config import created_port_list
-from Utils.log_handler import log_setup_info_to_console, log_error_to_console
+from Application.Config.create_config import created_port_list, merged_ports
+from Utils.log_handler import log_setup_info_to_console, log_error_to_console, set_log_level, LOG_LEVEL_DEBUG, LOG_LEVEL_INFO, \
+    LOG_LEVEL_ERROR
 from Application.Utils.image_handler import rotate_picture
 
 """
@@ -73,6 +74,274 @@ def set_number_waves(waves: int) -> None:
     log_setup_info_to_console('NUMBER OF WAVES IN PARALLEL TO RUN BY APPL: {}'.format(str(config_main.APPL_NR_WAVES)))
 
 
+def set_number_workers(workers: int) -> None:
+    """
+    Service that sets the number of threads used to run in parallel the independent jobs of a wave
+    :param workers: number of threads. 1 for running the jobs one after another.
+    :return: None
+    """
+    config_main.APPL_NR_WORKERS = workers
+
+    log_setup_info_to_console('NUMBER OF WORKERS TO RUN JOBS BY APPL: {}'.format(str(config_main.APPL_NR_WORKERS)))
+
+
+def set_pipeline_depth(depth: int) -> None:
+    """
+    Service that sets the number of frames that are processed in the same time for video and camera input.
+    Each frame in flight gets its own wave slot so the early jobs of the next frame can start while the last jobs of current frame run.
+    :param depth: number of frames. 1 for running one frame after another.
+    :return: None
+    """
+    config_main.APPL_PIPELINE_DEPTH = depth
+
+    log_setup_info_to_console('NUMBER OF FRAMES IN PARALLEL TO RUN BY APPL: {}'.format(str(config_main.APPL_PIPELINE_DEPTH)))
+
+
+def set_number_processes(processes: int) -> None:
+    """
+    Service that sets the number of processes that split the frames of the image folder input.
+    Each process runs the same json job list on a consecutive part of the frames and the KPI files are merged at the end.
+    Works only if the jobs don't use data from previous waves.
+    :param processes: number of processes. 1 for running all frames in this process.
+    :return: None
+    """
+    config_main.APPL_NR_PROCESSES = processes
+
+    log_setup_info_to_console('NUMBER OF PROCESSES TO RUN BY APPL: {}'.format(str(config_main.APPL_NR_PROCESSES)))
+
+
+def set_port_shared_memory(location: str = '/dev/shm/eecvf') -> None:
+    """
+    Service that sets the ports of the application to be memory mapped files that other processes can read with port.map_port_memory.
+    Each application process uses the subfolder with its process id. The files are deleted when the jobs terminate.
+    The files are for external tools that read the ports while the application runs. Jobs always read the ports of their own process,
+    also the worker processes of set_number_processes that run all the jobs for their part of the frames.
+    :param location: folder for the files. None for private port arrays.
+    :return: None
+    """
+    config_main.APPL_PORT_MEMORY_LOCATION = location
+
+    log_setup_info_to_console('PORT SHARED MEMORY LOCATION: {}'.format(str(config_main.APPL_PORT_MEMORY_LOCATION)))
+
+
+def set_port_aliasing(enable: bool = True) -> None:
+    """
+    Service that sets the ports that are not used in the same time in a wave to share the same memory.
+    Jobs can change the data of an intermediate port after the last job that reads it has finished so it can be used only if
+    all jobs declare the ports they read in the input port list.
+    :param enable: if the ports share memory
+    :return: None
+    """
+    config_main.APPL_PORT_ALIASING = enable
+
+    log_setup_info_to_console('PORT ALIASING: {}'.format(str(config_main.APPL_PORT_ALIASING)))
+
+
+def set_port_zero_on_reset(enable: bool = True, ports: dict = None) -> None:
+    """
+    Service that sets which ports are filled with zero before they are reused by the next waves.
+    Only the ports of jobs that don't write the full output array need it.
+    :param enable: if the ports are filled with zero
+    :param ports: ports that are filled with zero or not, by port name(ex: {'GREY_L0': True}). The other ports use enable
+    :return: None
+    """
+    config_main.APPL_PORT_ZERO_ON_RESET = enable
+    config_main.APPL_PORT_ZERO_PORTS = dict(ports) if ports is not None else dict()
+
+    log_setup_info_to_console('PORT ZERO ON RESET: {}'.format(str(config_main.APPL_PORT_ZERO_ON_RESET)))
+    log_setup_info_to_console('PORT ZERO ON RESET BY PORT: {}'.format(str(config_main.APPL_PORT_ZERO_PORTS)))
+
+
+def set_dead_job_elimination(enable: bool = True, root_ports: list = None) -> None:
+    """
+    Service that sets the application to remove the jobs whose output ports are not needed by the saved, shown or root ports.
+    Jobs without output ports and jobs without input ports are always kept.
+    :param enable: if the jobs are removed
+    :param root_ports: ports that are needed even if they are not saved or shown
+    :return: None
+    """
+    config_main.APPL_DEAD_JOB_ELIMINATION = enable
+
+    if root_ports is not None:
+        config_main.APPL_ROOT_PORTS = list(root_ports)
+
+    log_setup_info_to_console('DEAD JOB ELIMINATION: {}'.format(str(config_main.APPL_DEAD_JOB_ELIMINATION)))
+    log_setup_info_to_console('ROOT PORTS: {}'.format(config_main.APPL_ROOT_PORTS))
+
+
+def set_job_cache(location: str = 'Logs/job_cache', max_size: int = 10 << 30, version: int = 0) -> None:
+    """
+    Service that sets the outputs of the jobs to be saved in a cache that is kept between runs.
+    If a job runs with the same parameters on the same input data the outputs are loaded from cache.
+    The jobs should not keep data between frames because the main function of a job is not called when its outputs are in cache.
+    :param location: folder of the cache. None to run all the jobs
+    :param max_size: maximum size of cache in bytes
+    :param version: version of the cache, change it to compute again all the outputs
+    :return: None
+    """
+    config_main.APPL_JOB_CACHE_LOCATION = location
+    config_main.APPL_JOB_CACHE_MAX_BYTES = max_size
+    config_main.APPL_JOB_CACHE_VERSION = version
+
+    log_setup_info_to_console('JOB CACHE LOCATION: {}'.format(str(config_main.APPL_JOB_CACHE_LOCATION)))
+    log_setup_info_to_console('JOB CACHE MAXIMUM SIZE[bytes]: {}'.format(config_main.APPL_JOB_CACHE_MAX_BYTES))
+
+
+def set_trace(file: str = 'Logs/trace.json', max_events: int = 1 << 20) -> None:
+    """
+    Service that sets the application to trace the runs of the jobs, the changes of ports and the read and save of images.
+    The trace file can be opened with Perfetto or chrome://tracing.
+    :param file: location of trace file. None to not trace
+    :param max_events: maximum number of events kept, the oldest events are dropped
+    :return: None
+    """
+    config_main.APPL_TRACE_FILE = file
+    config_main.APPL_TRACE_BUFFER_EVENTS = max_events
+
+    log_setup_info_to_console('TRACE FILE: {}'.format(str(config_main.APPL_TRACE_FILE)))
+    log_setup_info_to_console('TRACE MAXIMUM EVENTS: {}'.format(config_main.APPL_TRACE_BUFFER_EVENTS))
+
+
+def set_image_prefetch(frames: int = 4, threads: int = 2) -> None:
+    """
+    Service that sets the input images of the next frames to be read by background threads while the jobs of a frame run.
+    Works for image, satellite and txt inputs.
+    :param frames: number of next frames to read, 0 to not prefetch
+    :param threads: number of threads that read images
+    :return: None
+    """
+    config_main.APPL_PREFETCH_FRAMES = frames
+    config_main.APPL_PREFETCH_THREADS = threads
+
+    log_setup_info_to_console('IMAGE PREFETCH FRAMES: {}'.format(config_main.APPL_PREFETCH_FRAMES))
+    log_setup_info_to_console('IMAGE PREFETCH THREADS: {}'.format(config_main.APPL_PREFETCH_THREADS))
+
+
+def set_video_decoder(ring_size: int = 4, drop_frames: bool = None, frame_step: int = 1, start_frame: int = 0) -> None:
+    """
+    Service that sets the thread that decodes the next video or camera frames while the jobs of a frame run.
+    :param ring_size: number of preallocated arrays for decoded frames, 0 to decode a frame when it starts
+    :param drop_frames: if the oldest decoded frame is dropped when all arrays are full, None to drop only for camera input
+    :param frame_step: every n-th frame is processed
+    :param start_frame: frame of the video where the processing starts
+    :return: None
+    """
+    config_main.APPL_VIDEO_RING_SIZE = ring_size
+    config_main.APPL_VIDEO_DROP_FRAMES = drop_frames
+    config_main.APPL_VIDEO_FRAME_STEP = frame_step
+    config_main.APPL_VIDEO_START_FRAME = start_frame
+
+    log_setup_info_to_console('VIDEO DECODER RING SIZE: {}'.format(config_main.APPL_VIDEO_RING_SIZE))
+    log_setup_info_to_console('VIDEO DECODER DROP FRAMES: {}'.format(config_main.APPL_VIDEO_DROP_FRAMES))
+    log_setup_info_to_console('VIDEO FRAME STEP: {}'.format(config_main.APPL_VIDEO_FRAME_STEP))
+    log_setup_info_to_console('VIDEO START FRAME: {}'.format(config_main.APPL_VIDEO_START_FRAME))
+
+
+def set_frame_deadline(deadline_ms: float, job_priorities: dict = None) -> None:
+    """
+    Service that sets a time budget for every frame. When a frame would miss the deadline the optional jobs are skipped and their
+    output ports are invalid. For camera input the frames that waited during a late frame are dropped.
+    Works with the round robin and the DAG schedulers.
+    :param deadline_ms: time budget of a frame in ms, None for no deadline
+    :param job_priorities: priority of the optional jobs by job name, jobs with lower priority are skipped first
+    :return: None
+    """
+    config_main.APPL_FRAME_DEADLINE_MS = deadline_ms
+    if job_priorities is not None:
+        config_main.APPL_JOB_PRIORITIES = dict(job_priorities)
+
+    log_setup_info_to_console('FRAME DEADLINE[ms]: {}'.format(config_main.APPL_FRAME_DEADLINE_MS))
+    log_setup_info_to_console('OPTIONAL JOBS: {}'.format(config_main.APPL_JOB_PRIORITIES))
+
+
+def set_image_writer(threads: int = 2, queue_size: int = 64, png_compression: int = None) -> None:
+    """
+    Service that sets the threads that write the saved ports while the next frames run.
+    :param threads: number of writer threads, 0 to write the images when the ports are saved
+    :param queue_size: maximum number of images waiting to be written
+    :param png_compression: compression level of png images, 0 to 9. None for the default of OpenCV
+    :return: None
+    """
+    config_main.APPL_SAVE_THREADS = threads
+    config_main.APPL_SAVE_QUEUE_SIZE = queue_size
+    config_main.APPL_SAVE_PNG_COMPRESSION = png_compression
+
+    log_setup_info_to_console('IMAGE WRITER THREADS: {}'.format(config_main.APPL_SAVE_THREADS))
+    log_setup_info_to_console('IMAGE WRITER QUEUE SIZE: {}'.format(config_main.APPL_SAVE_QUEUE_SIZE))
+    log_setup_info_to_console('IMAGE WRITER PNG COMPRESSION: {}'.format(str(config_main.APPL_SAVE_PNG_COMPRESSION)))
+
+
+def set_save_array_store(enable: bool = True, chunk_size: int = 1 << 28) -> None:
+    """
+    Service that sets the saved ports to be appended to an array store in the folder of every port instead of one image file for
+    every frame. The arrays are kept with the name the image file would have, without extension.
+    Benchmarking reads the stores with Benchmarking.Util.image_parsing.read_saved_image.
+    :param enable: if array stores are used
+    :param chunk_size: size of chunk files of the stores in bytes
+    :return: None
+    """
+    config_main.APPL_SAVE_ARRAY_STORE = enable
+    config_main.APPL_SAVE_STORE_CHUNK_BYTES = chunk_size
+
+    log_setup_info_to_console('SAVE PORTS IN ARRAY STORE: {}'.format(config_main.APPL_SAVE_ARRAY_STORE))
+    log_setup_info_to_console('ARRAY STORE CHUNK SIZE[bytes]: {}'.format(config_main.APPL_SAVE_STORE_CHUNK_BYTES))
+
+
+def set_checkpoint(frames: int = 100, location: str = 'Logs/checkpoint', resume: bool = False) -> None:
+    """
+    Service that sets the state of the run to be saved every n frames. A run with resume continues from the checkpoint of the run
+    with the same jobs and configuration, for example after a crash. Checkpoints are not used for camera input, for frames run
+    in worker processes or by the pipeline scheduler.
+    :param frames: number of frames between checkpoints, 0 for no checkpoints
+    :param location: folder of the checkpoints
+    :param resume: if the run continues from its checkpoint
+    :return: None
+    """
+    config_main.APPL_CHECKPOINT_FRAMES = frames
+    config_main.APPL_CHECKPOINT_LOCATION = location
+    config_main.APPL_CHECKPOINT_RESUME = resume
+
+    log_setup_info_to_console('CHECKPOINT EVERY FRAMES: {}'.format(config_main.APPL_CHECKPOINT_FRAMES))
+    log_setup_info_to_console('CHECKPOINT LOCATION: {}'.format(config_main.APPL_CHECKPOINT_LOCATION))
+    log_setup_info_to_console('CHECKPOINT RESUME: {}'.format(config_main.APPL_CHECKPOINT_RESUME))
+
+
+def set_plan_cache(enable: bool = True, save_json: bool = True) -> None:
+    """
+    Service that sets the sorted job list to be kept in a binary plan file in the json folder. Runs with the same jobs and
+    configuration read the plan file and don't sort the jobs again.
+    :param enable: if the plan file is used
+    :param save_json: if the json file of the jobs is written for debug
+    :return: None
+    """
+    config_main.APPL_PLAN_CACHE = enable
+    config_main.APPL_PLAN_JSON = save_json
+
+    log_setup_info_to_console('JOB PLAN CACHE: {}'.format(config_main.APPL_PLAN_CACHE))
+    log_setup_info_to_console('JOB PLAN JSON FILE: {}'.format(config_main.APPL_PLAN_JSON))
+
+
+def set_logging(level: str = 'INFO', asynchronous: bool = True) -> None:
+    """
+    Service that sets the texts that are logged and how they are written.
+    :param level: DEBUG to log also the state of the jobs every frame, INFO to log the info messages and errors, ERROR to log only
+                  errors. The setup messages are always logged
+    :param asynchronous: if the console and log files are written by a writer thread
+    :return: None
+    """
+    levels = {'DEBUG': LOG_LEVEL_DEBUG, 'INFO': LOG_LEVEL_INFO, 'ERROR': LOG_LEVEL_ERROR}
+
+    if level not in levels:
+        log_error_to_console('LOG LEVEL NOT KNOWN', level)
+        return
+
+    config_main.LOG_ASYNC = asynchronous
+    set_log_level(levels[level])
+
+    log_setup_info_to_console('LOG LEVEL: {}'.format(level))
+    log_setup_info_to_console('LOG ASYNCHRONOUS: {}'.format(config_main.LOG_ASYNC))
+
+
 def set_input_camera_video(frames: int) -> None:
     """
     Service that sets up the camera video nr of frames that we want to capture
@@ -106,11 +375,14 @@ def configure_save_pictures(location: str = 'DEFAULT', job_name_in_port: bool =
             for port in created_port_list:
                 if port[-1] is True:
                     save_port_list.append(port[0])
+            # ports of duplicated jobs are saved from the ports of the job that computes the same data
+            save_port_list.extend(old_port for old_port, new_port in merged_ports.items() if new_port in save_port_list)
         else:
             for el in ports_to_save:
+                # ports of duplicated jobs are saved from the ports of the job that computes the same data
                 for port in created_port_list:
-                    if el == port[0]:
-                        save_port_list.append(port[0])
+                    if merged_ports.get(el, el) == port[0] and el not in save_port_list:
+                        save_port_list.append(el)
     except:
         log_error_to_console('PORT IS NOT OK!')
 
@@ -143,8 +415,8 @@ def configure_show_pictures(ports_to_show: list = 'ALL', time_to_show: int = 0,
     else:
         for el in ports_to_show:
             for port in created_port_list:
-                if el == port[0]:
-                    save_port_list.append(port[0])
+                if merged_ports.get(el, el) == port[0]:
+                    save_port_list.append(el)
 
     config_main.APPL_SHOW_LIST = list(set(save_port_list))
 
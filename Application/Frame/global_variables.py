@@ -1,5 +1,6 @@
 # number of picture, default value it will be updated.
 import math
+import threading
 
 from Application.Frame.job import JobState
 from Utils.log_handler import log_to_console, log_error_to_console
@@ -12,6 +13,9 @@ Module handles the global variables for the APPL block
 # noinspection PyPep8
 JobInitStateReturn = lambda v: JobState.INIT if v is True else JobState.NOT_INIT
 
+# frame processed by the current thread when frames are pipelined
+frame_context = threading.local()
+
 
 # noinspection PyUnresolvedReferences
 class global_var_handler:
@@ -127,6 +131,26 @@ class global_var_handler:
         global_var_handler.STR_L0_SIZE = str(global_var_handler.HEIGHT_L0) + 'x' + str(global_var_handler.WIDTH_L0)
 
 
+    @classmethod
+    def get_frame(cls) -> int:
+        """
+        :param cls
+        :return: Frame processed by the current thread. If frames are not pipelined this is FRAME
+        """
+        frame = getattr(frame_context, 'frame', None)
+
+        return global_var_handler.FRAME if frame is None else frame
+
+    @classmethod
+    def set_thread_frame(cls, frame: int = None) -> None:
+        """
+        Sets the frame processed by the current thread when frames are pipelined
+        :param cls
+        :param frame: frame processed by the thread. None to use FRAME
+        :return: None
+        """
+        frame_context.frame = frame
+
     @classmethod
     def get_size_equivalence(cls, level):
         """
@@ -134,12 +158,10 @@ class global_var_handler:
         :param level: string with pyramid level
         :return: Returns the attribute from the class equivalent to string
         """
+        from Application.Utils.job_plan import get_port_size
+
         try:
-            # backward compatibility
-            if 'SIZE' in level:
-                return eval('global_var_handler.' + level)
-            else:
-                return eval(level)
+            return get_port_size(level)
         except BaseException as error:
             log_error_to_console("SIZE IS NOT A PYRAMID LVL: ", str(error))
             return global_var_handler.L0_SIZE
@@ -1,6 +1,10 @@
 from Application.Utils.TimeLogger import Timer
-from Application.Frame.transferJobPorts import add_port, exist_port, set_invalid_ports_of_job
-from Utils.log_handler import log_to_console, log_to_file, log_error_to_console
+from Application.Utils.job_cache import run_job_cached
+from Application.Utils.tracer import trace_begin, trace_end
+from Application.Frame.transferJobPorts import add_port, exist_port, set_invalid_ports_of_job, claim_ports_of_job, detach_ports_of_job, \
+    get_port_from_wave
+from Utils.log_handler import log_to_console, log_to_file, log_error_to_console, debug_log_to_console, start_log_capture, \
+    stop_log_capture, is_error
 
 """
 Module handles the jobs for the APPL block
@@ -30,7 +34,8 @@ class Job:
     __state__ = JobState.NOT_INIT
 
     def __init__(self, name: str, main_function, init_function=None, output_ports: list = None, input_ports: list = None,
-                 init_func_param: list = None, main_func_param: list = None, waves: int = 1) -> None:
+                 init_func_param: list = None, main_func_param: list = None, waves: int = 1, priority: int = None,
+                 max_wave: int = 0) -> None:
         """
         Constructor of job class
         At creation the job state will be NOT_INIT
@@ -41,6 +46,9 @@ class Job:
         :param input_ports: list of ports(data) are necessary for job to run
         :param init_func_param: parameters for init function
         :param main_func_param: parameters for main function
+        :param waves: number of waves of the output ports
+        :param priority: priority of an optional job, jobs with lower priority are skipped first. None for required jobs
+        :param max_wave: biggest wave offset of the input ports, 0 if all the input ports are from the current wave
         """
 
         # create list of ports
@@ -62,6 +70,14 @@ class Job:
         self.__main_func_param__ = main_func_param
         self.__input_ports__ = input_ports
         self.__output_ports__ = output_ports
+        self.__priority__ = priority
+        self.__max_wave__ = max_wave
+        # number of values the job logged in the last frame, None if the job did not run
+        self.__nr_logged__ = None
+        # number of values the job logs every frame, the names of the values are logged by the init function
+        self.__nr_values__ = 0
+        # number of frames in which the job was skipped because of invalid input ports
+        self.__nr_skipped__ = 0
 
         # get output ports
         for wave in range(waves):
@@ -76,12 +92,23 @@ class Job:
         If init function of job runs OK the state of the jobs changes to INIT
         :return: None
         """
+        begin = trace_begin()
+
         if self.verify_input_ports():
             if self.__init_function__ is not None:
-                if self.__init_func_param__ is None:
-                    self.__state__ = self.__init_function__()
-                else:
-                    self.__state__ = self.__init_function__(self.__init_func_param__)
+                start_log_capture()
+                try:
+                    if self.__init_func_param__ is None:
+                        self.__state__ = self.__init_function__()
+                    else:
+                        self.__state__ = self.__init_function__(self.__init_func_param__)
+                finally:
+                    log, error = stop_log_capture()
+                    self.__nr_values__ = len(log)
+                    for text in log:
+                        log_to_file(text)
+                    if error is True:
+                        is_error()
             else:
                 self.__state__ = JobState.INIT
             log_to_file('{} Avg Time[ms]'.format(self.__name__))
@@ -91,6 +118,8 @@ class Job:
         if self.__state__ is not JobState.NOT_INIT:
             log_to_console(self.get_echo())
 
+        trace_end(begin, self.__name__, 'job init')
+
     def run(self) -> None:
         """
         Runs the main function for the job
@@ -100,25 +129,88 @@ class Job:
         """
         if self.__state__ != JobState.NOT_INIT:
             if self.__state__ != JobState.TERMINATE:
+                begin = trace_begin()
                 self.__timer__.start_cycle_timer()
                 self.__state__ = JobState.RUN
 
                 # set invalid flag to ports to be sure that nobody uses invalidated data
                 set_invalid_ports_of_job(ports=self.__output_ports__)
+                claim_ports_of_job(ports=self.__output_ports__)
+
+                # optional jobs count the values they log so the KPI columns stay aligned when they are skipped
+                if self.__priority__ is not None:
+                    start_log_capture()
+
+                try:
+                    # Runs the main function of job
+                    if run_job_cached(job=self) is False:
+                        log_to_console('ERROR: JOB {job:150s} DROPPED. INPUT NOK!'.format(job=self.__name__))
+                    else:
+                        debug_log_to_console('JOB : {job:150s} is in STATE: {state:50s}', job=self.__name__, state=self.__state__)
+                finally:
+                    if self.__priority__ is not None:
+                        log, error = stop_log_capture()
+                        self.__nr_logged__ = len(log)
+                        for text in log:
+                            log_to_file(text)
+                        if error is True:
+                            is_error()
 
-                # Runs the main function of job
-                if self.__main_function__(self.__main_func_param__) is False:
-                    log_to_console('ERROR: JOB {job:150s} DROPPED. INPUT NOK!'.format(job=self.__name__))
-                else:
-                    log_to_console(str(self.get_echo()))
+                detach_ports_of_job(ports=self.__output_ports__)
 
                 self.__timer__.end_cycle_timer()
                 self.__timer__.cycle_updater()
+                trace_end(begin, self.__name__, 'job run')
             else:
                 log_to_console("JOB : {job:150s} IS TERMINATED!".format(job=self.__name__))
         else:
             log_to_console("JOB : {job:150s} IS NOT INITED!".format(job=self.__name__))
 
+    def skip(self, invalid_inputs: bool = False) -> None:
+        """
+        Skips the job for the current frame. The output ports are invalid and the values the job logged in the last frame, or the
+        values named at init if the job did not run, are logged empty.
+        :param invalid_inputs: if the job is skipped because of invalid input ports
+        :return: None
+        """
+        set_invalid_ports_of_job(ports=self.__output_ports__)
+
+        for _ in range(self.__nr_logged__ if self.__nr_logged__ is not None else self.__nr_values__):
+            log_to_file('')
+
+        if invalid_inputs is True:
+            self.__nr_skipped__ += 1
+
+        self.__timer__.__current_time__ = 0.0
+        debug_log_to_console('JOB : {job:150s} SKIPPED', job=self.__name__)
+
+    def has_invalid_inputs(self) -> bool:
+        """
+        Jobs that use ports from previous waves check their inputs themselves.
+        :return: True if the job uses only ports from the current wave and one of its input ports is invalid
+        """
+        if self.__max_wave__ != 0:
+            return False
+
+        for name in self.__input_ports__:
+            port = get_port_from_wave(name=name)
+            if port is not None and port.is_valid() is False:
+                return True
+
+        return False
+
+    def can_skip(self) -> bool:
+        """
+        :return: True if the job is optional and it ran once
+        """
+        return self.__priority__ is not None and self.__nr_logged__ is not None
+
+    def get_priority(self) -> int:
+        """
+        :return: priority of optional job, None for required job
+        """
+        return self.__priority__
+
     def verify_input_ports(self) -> bool:
         """
         Check if all the input ports all OK
@@ -136,8 +228,10 @@ class Job:
         Set's the state to TERMINATE
         :return: None
         """
+        begin = trace_begin()
         self.__state__ = JobState.TERMINATE
         log_to_console(self.get_echo())
+        trace_end(begin, self.__name__, 'job terminate')
 
     def get_echo(self) -> str:
         """
@@ -162,3 +256,9 @@ class Job:
         :return: output port list of job
         """
         return self.__output_ports__
+
+    def get_input_ports(self):
+        """
+        :return: input port list of job
+        """
+        return self.__input_ports__
@@ -1,6 +1,9 @@
+import numpy as np
+
 from Utils.log_handler import log_to_console, log_end_of_wave
 from Application.Frame.job import Job
-from Application.Utils.parseJsonFile import FIELD_POSITION
+from Application.Frame.port import PORT_TYPES
+from Application.Frame.transferJobPorts import release_ports
 # noinspection PyPep8Naming
 import config_main as CONFIG
 
@@ -15,23 +18,74 @@ Module handles the manipulations of jobs for the APPL block
 def job_creation(job_description: list) -> list:
     """
     Creates a list of job objects.
-    :param job_description: a list of tuples that contain the necessary information for construction jobs
-           See FIELD_POSITION in parseJsonFile module for details
+    :param job_description: a list of JobSpec that contain the necessary information for construction jobs
+           See JobSpec in job_plan module for details
     :return: list of jobs
     """
     job_list = []
 
     for job in job_description:
-        job_list.append(Job(name=job[FIELD_POSITION.NAME], main_function=job[FIELD_POSITION.MAIN_FUNC],
-                            init_function=job[FIELD_POSITION.INIT_FUNC], output_ports=job[FIELD_POSITION.OUTPUT_PORTS],
-                            input_ports=job[FIELD_POSITION.INPUT_PORTS], init_func_param=job[FIELD_POSITION.INIT_FUNC_PARAM],
-                            main_func_param=job[FIELD_POSITION.MAIN_FUNC_PARAM], waves=CONFIG.APPL_NR_WAVES))
+        job_list.append(Job(name=job.name, main_function=job.main_function, init_function=job.init_function, output_ports=job.output_ports,
+                            input_ports=job.input_ports, init_func_param=job.init_func_param, main_func_param=job.main_func_param,
+                            waves=CONFIG.APPL_NR_WAVES + CONFIG.APPL_PIPELINE_DEPTH - 1, priority=CONFIG.APPL_JOB_PRIORITIES.get(job.name),
+                            max_wave=job.max_wave))
 
         log_to_console(job_list[-1].get_echo())
 
     return job_list
 
 
+def remove_dead_jobs(job_description: list) -> list:
+    """
+    Removes the jobs whose output ports are not needed by the sink ports.
+    Sink ports are the saved ports, the shown ports and APPL_ROOT_PORTS. Jobs without output ports(logging jobs) and jobs
+    without input ports(image retrieval) are always kept.
+    :param job_description: a list of JobSpec that contain the necessary information for construction jobs
+    :return: list of JobSpec of the jobs that are kept
+    """
+    if CONFIG.APPL_DEAD_JOB_ELIMINATION is False:
+        return job_description
+
+    producer = dict()
+    for index in range(len(job_description)):
+        for port in job_description[index].output_ports or []:
+            producer[port.name] = index
+
+    needed_ports = list(CONFIG.APPL_ROOT_PORTS)
+    if CONFIG.APPL_SAVE_PICT is True:
+        needed_ports.extend(CONFIG.APPL_SAVE_PICT_LIST)
+    if CONFIG.APPL_SHOW_PICT is True:
+        needed_ports.extend(CONFIG.APPL_SHOW_LIST)
+    needed_ports = [CONFIG.APPL_MERGED_PORTS.get(port, port) for port in needed_ports]
+
+    alive = [not job.input_ports or not job.output_ports for job in job_description]
+    for index in range(len(job_description)):
+        if alive[index] is True:
+            needed_ports.extend(job_description[index].input_ports or [])
+
+    # walk back from the sink ports to the jobs that produce them
+    while needed_ports:
+        index = producer.get(needed_ports.pop())
+        if index is not None and alive[index] is False:
+            alive[index] = True
+            needed_ports.extend(job_description[index].input_ports or [])
+
+    removed_ports = 0
+    removed_bytes = 0
+    for index in range(len(job_description)):
+        if alive[index] is False:
+            log_to_console('JOB : {job:150s} OUTPUTS NOT SAVED, SHOWN OR USED -> JOB REMOVED'.format(
+                job=job_description[index].name))
+            for port in job_description[index].output_ports:
+                removed_ports += 1
+                removed_bytes += int(np.prod(port.size)) * np.dtype(PORT_TYPES[port.port_type]).itemsize
+
+    log_to_console('DEAD JOB ELIMINATION: {jobs} JOBS AND {ports} PORTS REMOVED. PORT MEMORY REMOVED FOR A WAVE[bytes]: {size}'.format(
+        jobs=alive.count(False), ports=removed_ports, size=removed_bytes))
+
+    return [job_description[index] for index in range(len(job_description)) if alive[index] is True]
+
+
 def init_jobs(list_jobs: list) -> None:
     """
     Initialises the list of jobs
@@ -53,6 +107,8 @@ def terminate_jobs(list_jobs: list) -> None:
     for job in list_jobs:
         job.terminate()
 
+    release_ports()
+
     if CONFIG.CUDA_GPU is True:
         tf.keras.backend.clear_session()
 
@@ -66,7 +122,34 @@ def log_to_console_avg_time(job_list: list) -> None:
     log_to_console("Average time of jobs:")
 
     for job in job_list:
-        log_to_console("JOB : {job:150s} AVERAGE TIME[ms]: {time:10.4f}".format(job=job.__name__, time=job.get_average_time()))
+        log_to_console_job_time(name=job.__name__, job_timer=job.__timer__)
+
+
+def log_to_console_skipped_jobs(job_list: list) -> None:
+    """
+    Logs to console the number of frames in which each job was skipped because of invalid input ports
+    :param job_list: list of jobs
+    :return: None
+    """
+    for job in job_list:
+        if job.__nr_skipped__ != 0:
+            log_to_console('JOB : {job:150s} SKIPPED FOR INVALID INPUTS: {skipped:6d}'.format(job=job.__name__, skipped=job.__nr_skipped__))
+
+
+def log_to_console_job_time(name: str, job_timer) -> None:
+    """
+    Logs to console the average time and the latency percentiles of a job
+    :param name: name of job
+    :param job_timer: Timer object of job
+    :return: None
+    """
+    statistics = job_timer.get_statistics()
+
+    log_to_console("JOB : {job:150s} AVERAGE TIME[ms]: {time:10.4f} P50[ms]: {p50:10.4f} P95[ms]: {p95:10.4f} P99[ms]: {p99:10.4f} "
+                   "MIN[ms]: {min:10.4f} MAX[ms]: {max:10.4f} CPU AVERAGE TIME[ms]: {cpu:10.4f} CPU P99[ms]: {cpu_p99:10.4f}".format(
+                    job=name, time=statistics['average[ms]'], p50=statistics['p50[ms]'], p95=statistics['p95[ms]'],
+                    p99=statistics['p99[ms]'], min=statistics['min[ms]'], max=statistics['max[ms]'], cpu=statistics['cpu average[ms]'],
+                    cpu_p99=statistics['cpu p99[ms]']))
 
 
 if __name__ == "__main__":
@@ -1,11 +1,28 @@
+import collections
+import os
+import re
 import numpy as np
 
-from Utils.log_handler import log_to_console
+import config_main
+from Application.Frame.port_pool import get_array, release_array, zero_array, count_shape_array
+from Utils.log_handler import log_to_console, log_error_to_console
 
 """
 Module handles the transfer ports for the APPL block
 """
 
+# numpy types of the port types
+PORT_TYPES = {'b': np.byte,
+              'B': np.ubyte,
+              'h': np.short,
+              'H': np.ushort,
+              'i': np.intc,
+              'I': np.uintc,
+              'l': np.int_,
+              'L': np.uint,
+              'f': np.single,
+              'd': np.double}
+
 
 class Port:
     """
@@ -14,13 +31,14 @@ class Port:
 
     arr = None
 
-    def __init__(self, name: str, size: int, port_type: str, is_image: bool) -> None:
+    def __init__(self, name: str, size: int, port_type: str, is_image: bool, wave: int = 0) -> None:
         """
         Constructor for class port
         Creates a transfer port that is actually a array with the given size and type
         :param name: name of port
         :param size: size in bytes of array
         :param is_image: if port is an image
+        :param wave: wave slot of the port
         :param port_type: type of array the port will be
             'b'	signed char	int	1
             'B'	unsigned char	int	1
@@ -36,18 +54,21 @@ class Port:
         """
         self.name = name
         self.isValid = False
+        self.wave = wave
+        # memory mapped file of the array if ports use shared memory
+        self.file = None
+        # array owned by the port, from the pool or memory mapped
+        self.buffer = None
+        # if data was written in the array since last reset
+        self.dirty = False
+        # memory shared with other ports of the wave, set by the port memory planner
+        self.shared = None
+        # key of the data of the port in the job cache
+        self.cache_key = None
+        # arrays kept for other shapes, the least recently used first: (shape, dtype) -> (array, if array has to be filled with zero)
+        self.shape_buffers = collections.OrderedDict()
 
-        eq_dict = {'b': 'np.byte',
-                   'B': 'np.ubyte',
-                   'h': 'np.short',
-                   'H': 'np.ushort',
-                   'i': 'np.intc',
-                   'I': 'np.uintc',
-                   'l': 'np.int_',
-                   'L': 'np.uint',
-                   'f': 'np.single',
-                   'd': 'np.double'}
-        self.arr = np.zeros(size, dtype=eval(eq_dict[port_type]))
+        self.arr = self.allocate_arr(shape=size, dtype=PORT_TYPES[port_type])
         self.is_image = is_image
 
         log_to_console("PORT: {port:150s} is INITIALIZED with SIZE: {size} and CHANNELS: {channel}".
@@ -59,6 +80,7 @@ class Port:
         :return: None
         """
         self.isValid = True
+        self.dirty = True
 
     def set_invalid(self) -> None:
         """
@@ -80,6 +102,12 @@ class Port:
         """
         return self.isValid
 
+    def needs_zero(self) -> bool:
+        """
+        :return: if the array of the port is filled with zero before reuse, see APPL_PORT_ZERO_PORTS
+        """
+        return config_main.APPL_PORT_ZERO_PORTS.get(self.name, config_main.APPL_PORT_ZERO_ON_RESET)
+
     def get_name(self) -> str:
         """
         :return: Name of port
@@ -92,6 +120,122 @@ class Port:
         """
         return self.is_image
 
+    def allocate_arr(self, shape, dtype) -> np.ndarray:
+        """
+        Creates a zero filled array for the port. The old array of the port is kept for its shape or given back to the pool.
+        If APPL_PORT_MEMORY_LOCATION is set the array is a memory mapped npy file that other processes can read with map_port_memory.
+        Every shape gets a new file, so a process that still maps the old file keeps reading the old data instead of a truncated file.
+        :param shape: shape of array
+        :param dtype: type of array
+        :return: new array
+        """
+        if not isinstance(shape, tuple):
+            shape = (shape,)
+
+        self.release_buffer(keep=True)
+
+        if self.shared is not None:
+            self.buffer = self.shared.get_view(port=self, shape=shape, dtype=dtype)
+            return self.buffer
+
+        if config_main.APPL_PORT_MEMORY_LOCATION is None or int(np.prod(shape)) == 0:
+            self.buffer = self.take_shape_buffer(shape=shape, dtype=dtype)
+            return self.buffer
+
+        location = get_port_memory_location()
+        if not os.path.exists(location):
+            os.makedirs(location, exist_ok=True)
+
+        old_file = self.file
+        self.file = get_port_memory_file(location=location, name=self.name, wave=self.wave, shape=shape, dtype=dtype)
+        if self.file == old_file:
+            # release the old map before the file is rewritten
+            self.arr = None
+            old_file = None
+        self.buffer = np.lib.format.open_memmap(self.file, mode='w+', dtype=dtype, shape=shape)
+
+        if old_file is not None:
+            try:
+                os.remove(old_file)
+            except BaseException as error:
+                log_error_to_console('PORT MEMORY NOK TO RELEASE: ' + str(old_file), str(error))
+
+        return self.buffer
+
+    def release_buffer(self, keep: bool = False) -> None:
+        """
+        Gives back to the pool the array of the port
+        :param keep: if the array is kept by the port for its shape. The least recently used array is given back to the pool when the
+                     port keeps more than APPL_PORT_SHAPES_KEPT arrays.
+        :return: None
+        """
+        if self.buffer is not None and self.file is None and self.shared is None:
+            if keep is True and config_main.APPL_PORT_SHAPES_KEPT > 1:
+                self.shape_buffers[(self.buffer.shape, self.buffer.dtype)] = \
+                    (self.buffer, self.dirty is True or self.needs_zero() is False)
+                while len(self.shape_buffers) >= config_main.APPL_PORT_SHAPES_KEPT:
+                    release_array(self.shape_buffers.popitem(last=False)[1][0])
+            else:
+                release_array(self.buffer)
+        self.buffer = None
+
+        if keep is False:
+            for arr, _ in self.shape_buffers.values():
+                release_array(arr)
+            self.shape_buffers.clear()
+
+    def take_shape_buffer(self, shape: tuple, dtype) -> np.ndarray:
+        """
+        Gives the array kept for the shape or a new one from the pool
+        :param shape: shape of array
+        :param dtype: type of array
+        :return: zero filled array
+        """
+        if not self.shape_buffers:
+            return get_array(shape=shape, dtype=dtype)
+
+        kept = self.shape_buffers.pop((shape, np.dtype(dtype)), None)
+        count_shape_array(hit=kept is not None)
+
+        if kept is None:
+            return get_array(shape=shape, dtype=dtype)
+
+        arr, to_zero = kept
+        if to_zero is True:
+            zero_array(arr)
+
+        return arr
+
+    def set_shared(self, shared) -> None:
+        """
+        Moves the array of the port in memory shared with other ports
+        :param shared: SharedPortMemory object
+        :return: None
+        """
+        self.release_buffer()
+        self.shared = shared
+        shared.ports.append(self)
+        self.arr = self.allocate_arr(shape=self.arr.shape, dtype=self.arr.dtype)
+
+    def claim_shared(self) -> None:
+        """
+        Called before the job of the port writes it. If other port wrote the shared memory in this wave the array is filled with zero.
+        :return: None
+        """
+        if self.shared is not None and self.shared.owner is not self:
+            if self.needs_zero() is True:
+                zero_array(self.buffer)
+            self.shared.owner = self
+
+    def detach_view(self) -> None:
+        """
+        If the job replaced the array of the port with a view of other array the data is copied, because the viewed array can be
+        shared memory that other ports will overwrite.
+        :return: None
+        """
+        if self.arr is not self.buffer and self.arr.base is not None:
+            self.arr = self.arr.copy()
+
     def reshape_arr(self, size_new_array: tuple, type_new_array: str) -> None:
         """
         Reshape arr of port
@@ -99,11 +243,134 @@ class Port:
         :param type_new_array: type of shape
         :return: none
         """
-        self.arr = np.zeros(size_new_array, dtype=type_new_array)
+        self.arr = self.allocate_arr(shape=size_new_array, dtype=type_new_array)
 
     def self_reset(self):
         """
         Reset arr of port
+        The array of the port is reused. It is filled with zero only if the port was valid since the last reset, because jobs don't
+        use the data of invalid ports. If a job replaced the array with one of other shape a new array is taken.
+        The array is changed in place, so a job must not keep a reference to port.arr from one wave to the next: the data seen through
+        it is overwritten when the wave slot is used again. Jobs that need the data of older frames read the ports of previous waves
+        or keep a copy of the array.
         :return: none
         """
-        self.arr = np.zeros(shape=self.arr.shape, dtype=self.arr.dtype)
+        if self.buffer is not None and self.arr.shape == self.buffer.shape and self.arr.dtype == self.buffer.dtype:
+            self.arr = self.buffer
+            if self.shared is not None:
+                # the array is filled with zero when the job of the port claims the memory
+                self.shared.owner = None
+            elif self.dirty is True and self.needs_zero() is True:
+                zero_array(self.arr)
+        else:
+            self.arr = self.allocate_arr(shape=self.arr.shape, dtype=self.arr.dtype)
+
+        self.dirty = False
+        self.cache_key = None
+
+    def release(self) -> None:
+        """
+        Gives back the array of the port and deletes the memory mapped file of the port
+        :return: none
+        """
+        self.release_buffer()
+
+        if self.shared is not None:
+            self.shared.release()
+            self.shared = None
+
+        if self.file is not None:
+            self.arr = None
+            try:
+                os.remove(self.file)
+            except BaseException as error:
+                log_error_to_console('PORT MEMORY NOK TO RELEASE: ' + str(self.file), str(error))
+            self.file = None
+
+
+class SharedPortMemory:
+    """
+    class that describes the memory shared by ports of a wave that are not used in the same time
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor for class SharedPortMemory
+        """
+        self.memory = get_array(shape=(0,), dtype=np.uint8)
+        # ports that use the memory
+        self.ports = []
+        # port that claimed the memory last in the current wave
+        self.owner = None
+
+    def get_view(self, port: Port, shape: tuple, dtype) -> np.ndarray:
+        """
+        Gives an array that uses the shared memory. If the memory is too small a bigger one is taken and the arrays of the other
+        ports are moved in it.
+        :param port: port that needs the array
+        :param shape: shape of array
+        :param dtype: type of array
+        :return: array
+        """
+        nr_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+        if nr_bytes > self.memory.nbytes:
+            release_array(self.memory)
+            self.memory = get_array(shape=(nr_bytes,), dtype=np.uint8)
+
+            for other in self.ports:
+                if other is not port and other.buffer is not None:
+                    old_buffer = other.buffer
+                    other.buffer = self.memory[:old_buffer.nbytes].view(old_buffer.dtype).reshape(old_buffer.shape)
+                    if other.arr is old_buffer:
+                        other.arr = other.buffer
+
+        return self.memory[:nr_bytes].view(dtype).reshape(shape)
+
+    def release(self) -> None:
+        """
+        Gives back the memory to the pool
+        :return: None
+        """
+        if self.memory is not None:
+            release_array(self.memory)
+            self.memory = None
+
+
+def get_port_memory_location() -> str:
+    """
+    Every process has its own folder so worker processes don't overwrite each other's ports.
+    :return: folder where the ports of this process are memory mapped
+    """
+    return os.path.join(config_main.APPL_PORT_MEMORY_LOCATION, str(os.getpid()))
+
+
+def get_port_memory_file(location: str, name: str, wave: int, shape: tuple, dtype) -> str:
+    """
+    :param location: folder of the memory mapped ports
+    :param name: name of port
+    :param wave: wave slot of port
+    :param shape: shape of array
+    :param dtype: type of array
+    :return: location of the memory mapped file of the port for this shape
+    """
+    return os.path.join(location, 'W{wave}_{name}_{shape}_{dtype}.npy'.format(wave=wave, name=name, shape='x'.join(str(el) for el in shape),
+                                                                              dtype=np.dtype(dtype).name))
+
+
+def map_port_memory(name: str, wave: int = 0, pid: int = None) -> np.ndarray:
+    """
+    Maps the array of a port from an application process for reading.
+    Can be used by external tools while the application runs, jobs don't read ports of other processes. The data is not synchronized
+    with the frames of the application. The map keeps the shape the port had when it was mapped, after the port changes shape it has
+    to be mapped again.
+    :param name: name of port
+    :param wave: wave slot of port
+    :param pid: process id of the application. None for this process
+    :return: read only array of the port
+    """
+    location = os.path.join(config_main.APPL_PORT_MEMORY_LOCATION, str(os.getpid() if pid is None else pid))
+    pattern = re.compile(re.escape('W{wave}_{name}_'.format(wave=wave, name=name)) + r'[0-9x]*_[a-z0-9]+\.npy')
+    files = [os.path.join(location, el) for el in os.listdir(location) if pattern.fullmatch(el)]
+
+    return np.load(max(files, key=os.path.getmtime), mmap_mode='r')
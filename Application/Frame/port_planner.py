@@ -0,0 +1,152 @@
+import config_main
+from Application.Frame import transferJobPorts
+from Application.Frame.port import SharedPortMemory
+from Utils.log_handler import log_to_console
+
+"""
+Module handles the memory planner of the ports for the APPL block.
+From the order of the jobs the planner finds for every port the job that writes it first and the job that reads it last.
+Ports that are not used in the same time in a wave share the same memory.
+"""
+
+# key of the memory used by each port that shares memory
+port_memory_key = dict()
+
+
+def get_port_lifetimes(jobs: list) -> tuple:
+    """
+    Finds the lifetime of every port in the job list. The lifetime of a port written by several jobs lasts until the last writer.
+    :param jobs: list of Job objects
+    :return: dictionary of port name and (index of first writer, index of last reader or writer), set of ports read before they are
+             written
+    """
+    first_write = dict()
+    last_write = dict()
+    last_read = dict()
+    read_before_write = set()
+
+    for index in range(len(jobs)):
+        for port in jobs[index].get_input_ports():
+            if port not in first_write:
+                read_before_write.add(port)
+            last_read[port] = index
+
+        for port in jobs[index].get_out_ports():
+            if port[0] not in first_write:
+                first_write[port[0]] = index
+            last_write[port[0]] = index
+
+    lifetimes = {port: (start, max(last_write[port], last_read.get(port, start))) for port, start in first_write.items()}
+
+    return lifetimes, read_before_write
+
+
+def get_pinned_ports(read_before_write: set) -> set:
+    """
+    Ports that can't share memory: ports saved or shown after the wave and ports read before they are written in a wave.
+    :param read_before_write: ports read before they are written in the job list
+    :return: set of port names
+    """
+    pinned = set(read_before_write)
+    pinned.update(config_main.APPL_MERGED_PORTS.get(port, port) for port in config_main.APPL_SAVE_PICT_LIST)
+    pinned.update(config_main.APPL_MERGED_PORTS.get(port, port) for port in config_main.APPL_SHOW_LIST)
+
+    return pinned
+
+
+def assign_shared_memory(lifetimes: dict, sizes: dict) -> list:
+    """
+    Splits the ports in groups that are never used in the same time.
+    Ports are taken in the order they are written and each port takes the free group with the closest size.
+    :param lifetimes: dictionary of port name and (index of first writer, index of last reader or writer)
+    :param sizes: dictionary of port name and size in bytes
+    :return: list of groups of port names
+    """
+    groups = []
+    group_size = []
+    # groups in use and the index of the last job that reads them
+    busy_groups = []
+    free_groups = []
+
+    for port in sorted(lifetimes.keys(), key=lambda name: (lifetimes[name][0], -sizes[name])):
+        start, end = lifetimes[port]
+
+        for busy in [el for el in busy_groups if el[0] < start]:
+            busy_groups.remove(busy)
+            free_groups.append(busy[1])
+
+        fitting = [group for group in free_groups if group_size[group] >= sizes[port]]
+        if fitting:
+            group = min(fitting, key=lambda el: group_size[el])
+        elif free_groups:
+            group = max(free_groups, key=lambda el: group_size[el])
+        else:
+            group = len(groups)
+            groups.append([])
+            group_size.append(0)
+
+        if group in free_groups:
+            free_groups.remove(group)
+        groups[group].append(port)
+        group_size[group] = max(group_size[group], sizes[port])
+        busy_groups.append((end, group))
+
+    return groups
+
+
+def plan_port_memory(jobs: list) -> None:
+    """
+    Sets the ports of every wave slot that are not used in the same time to share memory.
+    The planner is not used if ports are memory mapped files or if jobs can read ports from previous waves.
+    :param jobs: list of Job objects
+    :return: None
+    """
+    port_memory_key.clear()
+
+    if config_main.APPL_PORT_ALIASING is False:
+        return
+
+    if config_main.APPL_PORT_MEMORY_LOCATION is not None:
+        log_to_console('PORT ALIASING NOT USED WITH PORT SHARED MEMORY')
+        return
+
+    if config_main.APPL_NR_WAVES > 1:
+        log_to_console('PORT ALIASING NOT USED BECAUSE JOBS CAN USE DATA FROM PREVIOUS WAVES')
+        return
+
+    lifetimes, read_before_write = get_port_lifetimes(jobs)
+    pinned = get_pinned_ports(read_before_write)
+    ports = transferJobPorts.portsDict[0]
+    sizes = {port: ports[port].arr.nbytes for port in lifetimes.keys()}
+    groups = assign_shared_memory({port: lifetime for port, lifetime in lifetimes.items() if port not in pinned}, sizes)
+    groups = [group for group in groups if len(group) > 1]
+
+    for wave in range(transferJobPorts.NR_WAVES):
+        for group in groups:
+            shared = SharedPortMemory()
+            for port in group:
+                transferJobPorts.portsDict[wave][port].set_shared(shared)
+
+    for index in range(len(groups)):
+        for port in groups[index]:
+            port_memory_key[port] = 'SHARED_MEMORY_{}'.format(index)
+
+    transferJobPorts.ALIASED_PORTS = len(groups) > 0
+
+    memory_before = sum(sizes.values())
+    memory_after = memory_before - sum(sizes[port] for group in groups for port in group) + \
+        sum(max(sizes[port] for port in group) for group in groups)
+    log_to_console('PORT ALIASING: {ports} PORTS SHARE {groups} MEMORIES. PORT MEMORY OF A WAVE[bytes]: {before} -> {after}'.format(
+        ports=len(port_memory_key), groups=len(groups), before=memory_before, after=memory_after))
+
+
+def get_port_memory_key(port: str) -> str:
+    """
+    :param port: name of port
+    :return: key of the memory used by the port. Ports with the same key share memory.
+    """
+    return port_memory_key.get(port, port)
+
+
+if __name__ == "__main__":
+    pass
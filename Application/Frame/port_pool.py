@@ -0,0 +1,171 @@
+import threading
+
+import numpy as np
+
+import config_main
+from Utils.log_handler import log_to_console
+
+"""
+Module handles the pool of port arrays for the APPL block.
+Arrays released by ports are kept by shape and type and given again to ports that need the same shape and type.
+"""
+
+# free arrays for each (shape, dtype)
+pool = dict()
+pool_lock = threading.Lock()
+
+# bytes of arrays given to ports
+IN_USE_BYTES = 0
+# bytes of free arrays from pool
+POOL_BYTES = 0
+# maximum bytes of arrays in use and in pool
+PEAK_BYTES = 0
+# bytes of new arrays in current wave
+WAVE_ALLOCATED_BYTES = 0
+# bytes of arrays filled with zero in current wave
+WAVE_ZERO_BYTES = 0
+# bytes of new and zeroed arrays for each finished wave
+waves_allocated_bytes = []
+waves_zero_bytes = []
+# arrays of ports found and not found in the arrays kept for other shapes
+SHAPE_HITS = 0
+SHAPE_MISSES = 0
+
+
+def get_array(shape: tuple, dtype, zero: bool = True) -> np.ndarray:
+    """
+    Gives an array from the pool or a new one if the pool has none for this shape and type
+    :param shape: shape of array
+    :param dtype: type of array
+    :param zero: if the array should be filled with zero
+    :return: array
+    """
+    global IN_USE_BYTES, POOL_BYTES, PEAK_BYTES, WAVE_ALLOCATED_BYTES
+
+    key = (shape, np.dtype(dtype))
+
+    with pool_lock:
+        free_arrays = pool.get(key)
+
+        if free_arrays:
+            arr = free_arrays.pop()
+            POOL_BYTES -= arr.nbytes
+            is_new = False
+        else:
+            arr = None
+            is_new = True
+
+    if is_new is True:
+        arr = np.zeros(shape, dtype=dtype)
+    elif zero is True:
+        # the array is filled outside the lock so other workers are not waiting for it
+        zero_array(arr)
+
+    with pool_lock:
+        if is_new is True:
+            WAVE_ALLOCATED_BYTES += arr.nbytes
+        IN_USE_BYTES += arr.nbytes
+        PEAK_BYTES = max(PEAK_BYTES, IN_USE_BYTES + POOL_BYTES)
+
+    return arr
+
+
+def release_array(arr: np.ndarray) -> None:
+    """
+    Gives back to the pool an array received with get_array.
+    If the pool would become bigger than APPL_PORT_POOL_MAX_BYTES the array is dropped.
+    :param arr: array to release
+    :return: None
+    """
+    global IN_USE_BYTES, POOL_BYTES
+
+    with pool_lock:
+        IN_USE_BYTES -= arr.nbytes
+
+        if POOL_BYTES + arr.nbytes <= config_main.APPL_PORT_POOL_MAX_BYTES:
+            pool.setdefault((arr.shape, arr.dtype), []).append(arr)
+            POOL_BYTES += arr.nbytes
+
+
+def count_shape_array(hit: bool) -> None:
+    """
+    Counts if a port found an array for a new shape in the arrays it kept
+    :param hit: if the array was found
+    :return: None
+    """
+    global SHAPE_HITS, SHAPE_MISSES
+
+    if hit is True:
+        SHAPE_HITS += 1
+    else:
+        SHAPE_MISSES += 1
+
+
+def zero_array(arr: np.ndarray) -> None:
+    """
+    Fills with zero an array of a port
+    :param arr: array
+    :return: None
+    """
+    global WAVE_ZERO_BYTES
+
+    arr.fill(0)
+
+    with pool_lock:
+        WAVE_ZERO_BYTES += arr.nbytes
+
+
+def end_of_wave_memory() -> None:
+    """
+    Saves the bytes allocated and zeroed in the finished wave
+    :return: None
+    """
+    global WAVE_ALLOCATED_BYTES, WAVE_ZERO_BYTES
+
+    waves_allocated_bytes.append(WAVE_ALLOCATED_BYTES)
+    waves_zero_bytes.append(WAVE_ZERO_BYTES)
+    WAVE_ALLOCATED_BYTES = 0
+    WAVE_ZERO_BYTES = 0
+
+
+def clear_pool() -> None:
+    """
+    Drops the free arrays of the pool and the statistics
+    :return: None
+    """
+    global IN_USE_BYTES, POOL_BYTES, PEAK_BYTES, SHAPE_HITS, SHAPE_MISSES
+
+    with pool_lock:
+        pool.clear()
+        IN_USE_BYTES = 0
+        POOL_BYTES = 0
+        PEAK_BYTES = 0
+        SHAPE_HITS = 0
+        SHAPE_MISSES = 0
+        waves_allocated_bytes.clear()
+        waves_zero_bytes.clear()
+
+
+def log_to_console_port_memory() -> None:
+    """
+    Logs to console the memory used by ports.
+    Steady state values are the averages of the waves after the first one.
+    :return: None
+    """
+    steady_allocated = waves_allocated_bytes[1:]
+    steady_zero = waves_zero_bytes[1:]
+
+    log_to_console('PORT MEMORY PEAK[bytes]                        : {}'.format(PEAK_BYTES))
+    log_to_console('PORT MEMORY IN USE[bytes]                      : {}'.format(IN_USE_BYTES))
+    log_to_console('PORT MEMORY IN POOL[bytes]                     : {}'.format(POOL_BYTES))
+    log_to_console('PORT MEMORY FIRST WAVE ALLOCATED[bytes]        : {}'.format(waves_allocated_bytes[0] if waves_allocated_bytes else 0))
+    log_to_console('PORT MEMORY STEADY STATE ALLOCATED[bytes/wave] : {:.1f}'.format(
+        sum(steady_allocated) / len(steady_allocated) if steady_allocated else 0))
+    log_to_console('PORT MEMORY STEADY STATE ZEROED[bytes/wave]    : {:.1f}'.format(
+        sum(steady_zero) / len(steady_zero) if steady_zero else 0))
+    log_to_console('PORT SHAPE CHANGES WITH KEPT ARRAY             : {}'.format(SHAPE_HITS))
+    log_to_console('PORT SHAPE CHANGES WITH NEW ARRAY              : {}'.format(SHAPE_MISSES))
+
+
+if __name__ == "__main__":
+    pass
@@ -1,5 +1,11 @@
+import os
+import threading
+
+import config_main
 from Utils.log_handler import log_to_console
-from Application.Frame.port import Port
+from Application.Frame.port import Port, get_port_memory_location
+from Application.Frame.port_pool import end_of_wave_memory
+from Application.Utils.tracer import trace_begin, trace_end
 
 """
 Module handles the manipulation of transfer ports for the APPL block
@@ -9,6 +15,10 @@ Module handles the manipulation of transfer ports for the APPL block
 portsDict = []
 NR_WAVES = 0
 ACTIVE_WAVE = 0
+# wave slot of the frame processed by the current thread when frames are pipelined
+wave_context = threading.local()
+# if ports share memory after the port memory planner
+ALIASED_PORTS = False
 
 
 def create_ports_dict(nr_waves: int) -> None:
@@ -23,6 +33,25 @@ def create_ports_dict(nr_waves: int) -> None:
         portsDict.append(dict())
 
 
+def get_active_wave() -> int:
+    """
+    Get the wave slot used by the current thread
+    :return: wave slot of the thread if it was set, else the active wave
+    """
+    wave = getattr(wave_context, 'wave', None)
+
+    return ACTIVE_WAVE if wave is None else wave
+
+
+def set_thread_wave(frame: int = None) -> None:
+    """
+    Sets the wave slot used by the current thread to the one of the frame
+    :param frame: frame processed by the thread. None to use the active wave
+    :return: None
+    """
+    wave_context.wave = None if frame is None else frame % NR_WAVES
+
+
 def add_port(name: str, size: int, port_type: str, is_image: bool, wave: int = 0) -> None:
     """
     Add a port in the port dictionary.
@@ -34,7 +63,7 @@ def add_port(name: str, size: int, port_type: str, is_image: bool, wave: int = 0
     :param wave: wave of the port
     :return: None
     """
-    portsDict[wave][name] = Port(name=name, size=size, port_type=port_type, is_image=is_image)
+    portsDict[wave][name] = Port(name=name, size=size, port_type=port_type, is_image=is_image, wave=wave)
 
 
 def reshape_ports(size_array: list) -> None:
@@ -44,9 +73,12 @@ def reshape_ports(size_array: list) -> None:
     :param size_array: list of resolutions of levels.
     :return: None
     """
-    for el in portsDict[ACTIVE_WAVE].keys():
+    begin = trace_begin()
+    wave = get_active_wave()
+
+    for el in portsDict[wave].keys():
         if 'LC' not in el:
-            port_to_change = portsDict[ACTIVE_WAVE][el]
+            port_to_change = portsDict[wave][el]
             if port_to_change.get_is_image() is True:
                 channels = len(port_to_change.arr.shape)
                 level_to_change = int(port_to_change.name[-1])
@@ -57,6 +89,8 @@ def reshape_ports(size_array: list) -> None:
                     port_to_change.reshape_arr(size_new_array=(size_array[level_to_change][0], size_array[level_to_change][1], channels),
                                                type_new_array=port_to_change.arr.dtype)
 
+    trace_end(begin, 'reshape_ports', 'ports')
+
 
 def exist_port(name: str) -> bool:
     """
@@ -64,7 +98,7 @@ def exist_port(name: str) -> bool:
     :param name: port name
     :return: if ports exists
     """
-    return name in portsDict[ACTIVE_WAVE].keys()
+    return name in portsDict[get_active_wave()].keys()
 
 
 def get_port_from_wave(name: str, wave_offset: int = 0) -> Port:
@@ -75,7 +109,7 @@ def get_port_from_wave(name: str, wave_offset: int = 0) -> Port:
     :return: Corresponding port of current wave
     """
     global NR_WAVES
-    return portsDict[(ACTIVE_WAVE - wave_offset) % NR_WAVES].get(name)
+    return portsDict[(get_active_wave() - wave_offset) % NR_WAVES].get(name)
 
 
 def prepare_ports_new_wave(frame: int) -> None:
@@ -85,20 +119,83 @@ def prepare_ports_new_wave(frame: int) -> None:
     """
     global ACTIVE_WAVE, NR_WAVES
 
+    begin = trace_begin()
     ACTIVE_WAVE = frame % NR_WAVES
 
-    for el in portsDict[ACTIVE_WAVE].keys():
-        port_to_change = portsDict[ACTIVE_WAVE][el]
+    reset_ports_of_frame(frame=frame)
+    trace_end(begin, 'prepare_ports_new_wave', 'ports')
+
+
+def reset_ports_of_frame(frame: int) -> None:
+    """
+    Resets the ports from the wave slot of the frame
+    :param frame: frame that will use the slot
+    :return: None
+    """
+    begin = trace_begin()
+
+    for port_to_change in portsDict[frame % NR_WAVES].values():
         port_to_change.self_reset()
 
+    end_of_wave_memory()
+    trace_end(begin, 'reset_ports_of_frame', 'ports', {'reset frame': frame})
+
+
+def claim_ports_of_job(ports: list) -> None:
+    """
+    Prepares the shared memory of the output ports of a job before the job runs
+    :param ports: list of output ports
+    :return: None
+    """
+    if ALIASED_PORTS is True:
+        wave = get_active_wave()
+
+        for port in ports:
+            portsDict[wave][port[0]].claim_shared()
+
+
+def detach_ports_of_job(ports: list) -> None:
+    """
+    Copies the output ports of a job that are views of other arrays after the job runs
+    :param ports: list of output ports
+    :return: None
+    """
+    if ALIASED_PORTS is True:
+        wave = get_active_wave()
+
+        for port in ports:
+            portsDict[wave][port[0]].detach_view()
+
+
+def release_ports() -> None:
+    """
+    Releases the shared memory of all the ports
+    :return: None
+    """
+    global ALIASED_PORTS
+    ALIASED_PORTS = False
+
+    for wave in portsDict:
+        for port in wave.values():
+            port.release()
+
+    if config_main.APPL_PORT_MEMORY_LOCATION is not None and os.path.exists(get_port_memory_location()):
+        try:
+            os.rmdir(get_port_memory_location())
+        except OSError:
+            log_to_console('PORT MEMORY FOLDER NOT EMPTY: ' + get_port_memory_location())
+
+
 def set_invalid_ports_of_job(ports: list) -> None:
     """
     Set's invalid all the ports in the list
     :param ports: list of ports
     :return: None
     """
+    wave = get_active_wave()
+
     for port in ports:
-        portsDict[ACTIVE_WAVE][port[0]].reset_valid_flag()
+        portsDict[wave][port[0]].reset_valid_flag()
 
 
 def debug_ports_job(port_type: str, ports: list) -> None:
@@ -111,12 +208,12 @@ def debug_ports_job(port_type: str, ports: list) -> None:
     # print(ports)
     if port_type == 'input':
         for port in ports:
-            log_to_console("PORT: {port:150s} is in STATE: {state}".format(port=portsDict[ACTIVE_WAVE][port].name,
-                                                                           state=portsDict[ACTIVE_WAVE][port].isValid))
+            log_to_console("PORT: {port:150s} is in STATE: {state}".format(port=portsDict[get_active_wave()][port].name,
+                                                                           state=portsDict[get_active_wave()][port].isValid))
     else:
         for port in ports:
-            log_to_console("PORT: {port:150s} is in STATE: {state}".format(port=portsDict[ACTIVE_WAVE][port[0]].name,
-                                                                           state=portsDict[ACTIVE_WAVE][port[0]].isValid))
+            log_to_console("PORT: {port:150s} is in STATE: {state}".format(port=portsDict[get_active_wave()][port[0]].name,
+                                                                           state=portsDict[get_active_wave()][port[0]].isValid))
 
 
 def log_to_console_exchange_ports() -> None:
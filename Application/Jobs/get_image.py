@@ -1,7 +1,4 @@
 import os
-# noinspection PyPackageRequirements
-import cv2
-import numpy as np
 
 import config_main
 
@@ -9,6 +6,9 @@ from Application.Frame.global_variables import JobInitStateReturn
 from Application.Frame.transferJobPorts import get_port_from_wave, reshape_ports
 from Utils.log_handler import log_to_file, log_to_console, is_error, log_error_to_console
 from Application.Frame.global_variables import global_var_handler
+from Application.Utils.tracer import trace_begin, trace_end
+from Application.Utils.image_prefetch import get_input, get_input_path, read_image, read_txt
+from Application.Utils.video_decoder import read_video_frame
 
 """
 Module handles retrieval image jobs for the APPL block.
@@ -46,17 +46,17 @@ def init_func() -> JobInitStateReturn:
 ############################################################################################################################################
 
 
-def get_image_cv(path: str, port_raw_image: str) -> None:
+def get_image_cv(port_raw_image: str) -> None:
     """
     Get's the picture accordingly to frame and populate the ports with the raw data color.
+    The picture is read by the image prefetch from the input folder.
     :param port_raw_image: Name of port input of raw image
-    :param path: path to picture
     :return: None
     """
     port_image = get_port_from_wave(name=port_raw_image)
 
     try:
-        img = cv2.imread(filename=path)
+        img = get_input(frame=global_var_handler.get_frame(), read_function=read_image)
         height, width = img.shape[:2]
 
         if width != global_var_handler.WIDTH_L0 or height != global_var_handler.HEIGHT_L0:
@@ -74,7 +74,7 @@ def get_image_cv(path: str, port_raw_image: str) -> None:
 
     except BaseException as error:
         is_error()
-        log_error_to_console('RAW PICTURE NOK TO READ: ' + str(path), str(error))
+        log_error_to_console('RAW PICTURE NOK TO READ: ' + str(get_input_path(global_var_handler.get_frame())), str(error))
         port_image.set_invalid()
         pass
 
@@ -97,12 +97,11 @@ def main_func(param_list: list = None) -> bool:
         log_error_to_console("GET FRAME MAIN FUNCTION PARAM NOK", str(len(param_list)))
         return False
     else:
-        get_image_cv(path=os.path.join(config_main.APPL_INPUT_DIR, config_main.APPL_INPUT_IMG_DIR[global_var_handler.FRAME]),
-                     port_raw_image=param_list[PORT_RAW_PICT])
+        get_image_cv(port_raw_image=param_list[PORT_RAW_PICT])
 
-        global_var_handler.PICT_NAME = config_main.APPL_INPUT_IMG_DIR[global_var_handler.FRAME]
+        global_var_handler.PICT_NAME = config_main.APPL_INPUT_IMG_DIR[global_var_handler.get_frame()]
 
-        log_to_file(str(global_var_handler.FRAME))
+        log_to_file(global_var_handler.get_frame())
         log_to_file(global_var_handler.PICT_NAME)
         log_to_file(global_var_handler.STR_L0_SIZE)
 
@@ -126,10 +125,10 @@ def main_func_satellite(param_list: list = None) -> bool:
         return False
     else:
 
-        path = os.path.join(config_main.APPL_INPUT_DIR, config_main.APPL_INPUT_IMG_DIR[global_var_handler.FRAME])
+        path = os.path.join(config_main.APPL_INPUT_DIR, config_main.APPL_INPUT_IMG_DIR[global_var_handler.get_frame()])
         port_image = get_port_from_wave(param_list[PORT_RAW_PICT])
         try:
-            img = cv2.imread(path)
+            img = get_input(frame=global_var_handler.get_frame(), read_function=read_image)
             height, width = img.shape[:2]
 
             if width != global_var_handler.WIDTH_L0 or height != global_var_handler.HEIGHT_L0:
@@ -148,9 +147,9 @@ def main_func_satellite(param_list: list = None) -> bool:
             port_image.set_invalid()
             pass
 
-        global_var_handler.PICT_NAME = config_main.APPL_INPUT_IMG_DIR[global_var_handler.FRAME]
+        global_var_handler.PICT_NAME = config_main.APPL_INPUT_IMG_DIR[global_var_handler.get_frame()]
 
-        log_to_file(str(global_var_handler.FRAME))
+        log_to_file(global_var_handler.get_frame())
         log_to_file(global_var_handler.PICT_NAME)
         log_to_file(global_var_handler.STR_L0_SIZE)
 
@@ -176,10 +175,13 @@ def main_func_video(param_list: list = None) -> bool:
         port_image = get_port_from_wave(name=param_list[PORT_RAW_PICT])
 
         try:
-            # noinspection PyUnresolvedReferences
-            success, port_image.arr[:] = global_var_handler.VIDEO.read()
+            begin = trace_begin()
+            success = read_video_frame(port_image.arr)
+            trace_end(begin, 'read video frame', 'io')
             if success is True:
                 port_image.set_valid()
+            else:
+                raise IOError('no video frame')
         except BaseException as error:
             is_error()
             # noinspection PyUnresolvedReferences
@@ -188,7 +190,7 @@ def main_func_video(param_list: list = None) -> bool:
             pass
 
         # noinspection PyUnresolvedReferences
-        log_to_file(str(global_var_handler.FRAME))
+        log_to_file(global_var_handler.get_frame())
         # noinspection PyUnresolvedReferences
         log_to_file(global_var_handler.STR_L0_SIZE)
 
@@ -214,10 +216,13 @@ def main_func_video_camera(param_list: list = None) -> bool:
         port_image = get_port_from_wave(name=param_list[PORT_RAW_PICT])
 
         try:
-            # noinspection PyUnresolvedReferences
-            success, port_image.arr[:] = global_var_handler.VIDEO.read()
+            begin = trace_begin()
+            success = read_video_frame(port_image.arr)
+            trace_end(begin, 'read video frame', 'io')
             if success is True:
                 port_image.set_valid()
+            else:
+                raise IOError('no video frame')
         except BaseException as error:
             is_error()
             # noinspection PyUnresolvedReferences
@@ -226,7 +231,7 @@ def main_func_video_camera(param_list: list = None) -> bool:
             pass
 
         # noinspection PyUnresolvedReferences
-        log_to_file(str(global_var_handler.FRAME))
+        log_to_file(global_var_handler.get_frame())
         # noinspection PyUnresolvedReferences
         log_to_file(global_var_handler.STR_L0_SIZE)
 
@@ -255,20 +260,11 @@ def main_func_from_txt(param_list: list = None) -> bool:
         log_error_to_console("GET FRAME FROM TXT MAIN FUNCTION PARAM NOK", str(len(param_list)))
         return False
     else:
-        img = open(file=os.path.join(config_main.APPL_INPUT_DIR, config_main.APPL_INPUT_IMG_DIR[global_var_handler.FRAME]),
-                     mode='r').read()
+        tmp = get_input(frame=global_var_handler.get_frame(), read_function=read_txt,
+                        args=(param_list[PORT_LINE_SEPARATOR], param_list[PORT_PX_SEPARATOR]))
 
         port_image = get_port_from_wave(name=param_list[PORT_RAW_PICT])
 
-        tmp = []
-
-        lines = img.split(param_list[PORT_LINE_SEPARATOR])
-        for line in lines[:-1]:
-            t = line.split(param_list[PORT_PX_SEPARATOR])
-            tmp.append(list(map(int, t)))
-
-        tmp = np.array(tmp)
-
         height, width = tmp.shape[:2]
 
         if width != global_var_handler.WIDTH_L0 or height != global_var_handler.HEIGHT_L0:
@@ -284,9 +280,9 @@ def main_func_from_txt(param_list: list = None) -> bool:
         port_image.arr[:] = tmp
         port_image.set_valid()
 
-        global_var_handler.PICT_NAME = config_main.APPL_INPUT_IMG_DIR[global_var_handler.FRAME]
+        global_var_handler.PICT_NAME = config_main.APPL_INPUT_IMG_DIR[global_var_handler.get_frame()]
 
-        log_to_file(str(global_var_handler.FRAME))
+        log_to_file(global_var_handler.get_frame())
         log_to_file(global_var_handler.PICT_NAME)
         log_to_file(global_var_handler.STR_L0_SIZE)
 
@@ -245,7 +245,7 @@ def main_func_sb_from_lines(param_list: list = None) -> bool:
                 json_dict = dict()
                 json_dict["asset"] = dict([
                     ("format", CONFIG.APPl_SAVE_PICT_EXTENSION),
-                    ("name", CONFIG.APPL_INPUT_IMG_DIR[global_var_handler.FRAME]),
+                    ("name", CONFIG.APPL_INPUT_IMG_DIR[global_var_handler.get_frame()]),
                     # {"path": os.path.join(CONFIG.APPL_INPUT_IMG_DIR, CONFIG.APPL_INPUT_IMG_DIR[CONFIG.APPL_NR_WAVES - 1])},
                     ("path", ""),
                     ("size", dict([("width", float(p_out_img.arr.shape[0])), ("height", float(p_out_img.arr.shape[1]))]))])
@@ -276,7 +276,7 @@ def main_func_sb_from_lines(param_list: list = None) -> bool:
                 if not os.path.exists(os.path.join(os.getcwd(), location)):
                     os.makedirs(location)
 
-                file_name = os.path.join(location, CONFIG.APPL_INPUT_IMG_DIR[global_var_handler.FRAME].split('.')[0] + '.json')
+                file_name = os.path.join(location, CONFIG.APPL_INPUT_IMG_DIR[global_var_handler.get_frame()].split('.')[0] + '.json')
                 file = open(file_name, 'w')
                 print(json_dict)
                 data_to_write = json.dumps(json_dict, indent=2)
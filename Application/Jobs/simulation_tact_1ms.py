@@ -1,5 +1,9 @@
 import time
 
+from Application.Frame.global_variables import JobInitStateReturn
+from Application.Frame.transferJobPorts import get_port_from_wave
+from Utils.log_handler import log_to_file, log_error_to_console
+
 # help variables
 VAR = 10000
 CONVERT_TO_MS = 1000
@@ -50,5 +54,54 @@ def simulate_job(ms: float) -> None:
         end_time = (time.time() - initial_time) * CONVERT_TO_MS
 
 
+def init_func() -> JobInitStateReturn:
+    """
+    Init function for the job
+    :return: INIT or NOT_INIT state for the job
+    """
+    log_to_file('Simulated Time[ms]')
+
+    return JobInitStateReturn(True)
+
+
+def main_func(param_list: list = None) -> bool:
+    """
+    Main function for a job that holds the system occupied for a fixed time.
+    Used to test the schedulers and the frame deadline without real processing jobs.
+    :param param_list: Param needed list [time in ms, input port or None, wave of input port, output port or None]
+    :return: True if the job executed OK.
+    """
+    # index of param
+    # noinspection PyPep8Naming
+    PORT_TIME = 0
+    # noinspection PyPep8Naming
+    PORT_IN_POS = 1
+    # noinspection PyPep8Naming
+    PORT_IN_WAVE = 2
+    # noinspection PyPep8Naming
+    PORT_OUT_POS = 3
+
+    # check if param OK
+    if len(param_list) != 4:
+        log_error_to_console("SIMULATION JOB MAIN FUNCTION PARAM NOK", str(len(param_list)))
+        return False
+
+    if param_list[PORT_IN_POS] is not None:
+        port_in = get_port_from_wave(name=param_list[PORT_IN_POS], wave_offset=param_list[PORT_IN_WAVE])
+        if port_in.is_valid() is False:
+            # the KPI row keeps the column of the job
+            log_to_file('')
+            return False
+
+    simulate_job(ms=param_list[PORT_TIME])
+
+    if param_list[PORT_OUT_POS] is not None:
+        get_port_from_wave(name=param_list[PORT_OUT_POS]).set_valid()
+
+    log_to_file(param_list[PORT_TIME])
+
+    return True
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,167 @@
+import threading
+from timeit import default_timer as timer
+
+import config_main
+from Application.Frame.global_variables import global_var_handler
+from Application.Utils.video_decoder import drop_video_frames
+from Utils.log_handler import log_to_console
+
+"""
+Module handles the frame deadline used by the schedulers of the APPL layer.
+When APPL_FRAME_DEADLINE_MS is set every frame has a time budget. Jobs with a priority in APPL_JOB_PRIORITIES are optional.
+Before an optional job starts, the time of the frame so far plus the average times of the job, of the required jobs that did not
+start and of the optional jobs with a higher priority that did not start is compared with the deadline. If the deadline would be
+missed the job is skipped and its output ports are invalid.
+When the jobs run on several workers the remaining time is the longer of the critical path of these jobs and their summed time
+divided by the number of workers.
+After a camera frame that missed the deadline the camera frames that waited meanwhile are dropped.
+"""
+
+# start time of the current frame
+frame_start = 0.0
+deadline_lock = threading.Lock()
+# number of frames in which each job was skipped
+JOBS_SHED = dict()
+# number of frames in which each job finished after the deadline
+JOBS_LATE = dict()
+FRAMES = 0
+FRAMES_LATE = 0
+
+
+def is_deadline_active() -> bool:
+    """
+    :return: if the frames have a deadline
+    """
+    return config_main.APPL_FRAME_DEADLINE_MS is not None
+
+
+def get_frame_time() -> float:
+    """
+    :return: time since the start of the frame in milliseconds
+    """
+    return (timer() - frame_start) * 1000
+
+
+def start_frame_deadline() -> None:
+    """
+    Starts the time budget of a frame
+    :return: None
+    """
+    global frame_start
+
+    frame_start = timer()
+
+
+def get_critical_path_time(jobs: list, remaining: set, dependents: list) -> float:
+    """
+    :param jobs: list of Job objects
+    :param remaining: positions of the jobs that are counted
+    :param dependents: list of dependent jobs for each job
+    :return: average time of the longest chain of counted jobs
+    """
+    path_time = dict()
+
+    # dependents of a job are after it in the job list
+    for index in sorted(remaining, reverse=True):
+        path_time[index] = jobs[index].get_average_time() + max([path_time[el] for el in dependents[index] if el in path_time],
+                                                                default=0.0)
+
+    return max(path_time.values(), default=0.0)
+
+
+def is_job_shed(jobs: list, index: int, waiting, dependents: list = None, workers: int = 1) -> bool:
+    """
+    Decides if an optional job is skipped because the frame would miss the deadline.
+    Jobs are skipped only after they ran once, so their time and logged values are known.
+    :param jobs: list of Job objects
+    :param index: position of job in list
+    :param waiting: positions of the jobs of the frame that did not start
+    :param dependents: list of dependent jobs for each job, None if the jobs run one after another
+    :param workers: number of threads that run the jobs
+    :return: True if the job is skipped
+    """
+    job = jobs[index]
+
+    if not is_deadline_active() or job.can_skip() is False:
+        return False
+
+    priority = job.get_priority()
+    remaining = {index}
+
+    for other in waiting:
+        other_priority = jobs[other].get_priority()
+        if other_priority is None or other_priority > priority:
+            remaining.add(other)
+
+    remaining_time = sum([jobs[el].get_average_time() for el in remaining])
+
+    if dependents is not None and workers > 1:
+        remaining_time = max(remaining_time / workers, get_critical_path_time(jobs=jobs, remaining=remaining, dependents=dependents))
+
+    if get_frame_time() + remaining_time <= config_main.APPL_FRAME_DEADLINE_MS:
+        return False
+
+    with deadline_lock:
+        JOBS_SHED[job.__name__] = JOBS_SHED.get(job.__name__, 0) + 1
+
+    return True
+
+
+def end_job_deadline(job) -> None:
+    """
+    Counts the job if it finished after the deadline of the frame
+    :param job: Job object that finished
+    :return: None
+    """
+    if is_deadline_active() and get_frame_time() > config_main.APPL_FRAME_DEADLINE_MS:
+        with deadline_lock:
+            JOBS_LATE[job.__name__] = JOBS_LATE.get(job.__name__, 0) + 1
+
+
+def end_frame_deadline() -> None:
+    """
+    Counts the frame if it missed the deadline. For camera input the frames that waited for more than a deadline are dropped.
+    :return: None
+    """
+    global FRAMES, FRAMES_LATE
+
+    if not is_deadline_active():
+        return
+
+    frame_time = get_frame_time()
+    FRAMES += 1
+
+    if frame_time > config_main.APPL_FRAME_DEADLINE_MS:
+        FRAMES_LATE += 1
+        log_to_console('FRAME {frame} MISSED DEADLINE: {time:.3f}[ms]'.format(frame=global_var_handler.get_frame(), time=frame_time))
+
+        if config_main.APPL_INPUT == config_main.CAMERA_INPUT:
+            drop_video_frames(int(frame_time // config_main.APPL_FRAME_DEADLINE_MS))
+
+
+def log_to_console_frame_deadline(jobs: list) -> None:
+    """
+    Logs the frames that missed the deadline and for every job the frames in which it was skipped or finished late
+    :param jobs: list of Job objects
+    :return: None
+    """
+    global FRAMES, FRAMES_LATE
+
+    if not is_deadline_active():
+        return
+
+    log_to_console('FRAME DEADLINE[ms]: {deadline} FRAMES: {frames} MISSED: {late}'.format(
+        deadline=config_main.APPL_FRAME_DEADLINE_MS, frames=FRAMES, late=FRAMES_LATE))
+
+    for job in jobs:
+        log_to_console('JOB : {job:150s} PRIORITY: {priority} SKIPPED: {shed:6d} FINISHED AFTER DEADLINE: {late:6d}'.format(
+            job=job.__name__, priority=job.get_priority(), shed=JOBS_SHED.get(job.__name__, 0), late=JOBS_LATE.get(job.__name__, 0)))
+
+    JOBS_SHED.clear()
+    JOBS_LATE.clear()
+    FRAMES = 0
+    FRAMES_LATE = 0
+
+
+if __name__ == "__main__":
+    pass
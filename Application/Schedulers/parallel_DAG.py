@@ -0,0 +1,186 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from Application.Frame.port_planner import get_port_memory_key
+from Application.Schedulers.frame_deadline import is_deadline_active, is_job_shed, end_job_deadline
+from Utils.log_handler import log_to_file, log_end_of_wave, log_to_console, start_log_capture, stop_log_capture, is_error
+
+"""
+Module handles the DAG parallel scheduler used by APPL layer for execution.
+Jobs are linked by the ports they read and write and the jobs that are ready are run on a thread pool.
+"""
+
+# list of jobs that wait for each job
+job_dependents = []
+# number of jobs each job is waiting for
+job_nr_dependencies = []
+# pool of threads that runs the jobs
+executor = None
+# number of threads of the pool
+nr_workers = 1
+
+
+def build_job_graph(jobs: list) -> tuple:
+    """
+    Creates the dependency graph of the jobs from the ports they read and write.
+    Jobs that use the same port keep the order from the job list(read after write, write after read, write after write).
+    Jobs without input ports(image retrieval) are barriers because they can reshape all the ports.
+    Ports that share memory are treated as the same port.
+    :param jobs: list of Job objects
+    :return: list of dependent jobs for each job, number of dependencies for each job
+    """
+    last_writer = dict()
+    readers = dict()
+    dependencies = [set() for _ in range(len(jobs))]
+    last_source = None
+
+    for index in range(len(jobs)):
+        input_ports = jobs[index].get_input_ports()
+
+        if input_ports is None or len(input_ports) == 0:
+            dependencies[index].update(range(index))
+            last_source = index
+        else:
+            if last_source is not None:
+                dependencies[index].add(last_source)
+
+            for port in [get_port_memory_key(el) for el in input_ports]:
+                if port in last_writer:
+                    dependencies[index].add(last_writer[port])
+                readers.setdefault(port, []).append(index)
+
+        for port in [get_port_memory_key(el[0]) for el in jobs[index].get_out_ports()]:
+            if port in last_writer:
+                dependencies[index].add(last_writer[port])
+            dependencies[index].update(readers.get(port, []))
+            last_writer[port] = index
+            readers[port] = []
+
+        dependencies[index].discard(index)
+
+    dependents = [[] for _ in range(len(jobs))]
+    for index in range(len(jobs)):
+        for dependency in dependencies[index]:
+            dependents[dependency].append(index)
+
+    return dependents, [len(el) for el in dependencies]
+
+
+def init_dag(jobs: list, workers: int) -> None:
+    """
+    Creates the dependency graph and the thread pool for the scheduler
+    :param jobs: list of Job objects
+    :param workers: number of threads to use
+    :return: None
+    """
+    global job_dependents, job_nr_dependencies, executor, nr_workers
+
+    job_dependents, job_nr_dependencies = build_job_graph(jobs)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    nr_workers = workers
+
+    log_to_console('DAG SCHEDULER STARTED WITH {workers} WORKERS FOR {jobs} JOBS WITH {edges} DEPENDENCIES'.format(
+        workers=workers, jobs=len(jobs), edges=sum(job_nr_dependencies)))
+
+
+def run_job(job, index: int, done: queue.Queue, shed: bool = False, invalid_inputs: bool = False) -> None:
+    """
+    Runs a job on a worker thread and signals the scheduler when finished.
+    :param job: Job object
+    :param index: position of job in list
+    :param done: queue where the scheduler waits for finished jobs
+    :param shed: if the job is skipped to keep the deadline of the frame
+    :param invalid_inputs: if the job is skipped because of invalid input ports
+    :return: None
+    """
+    start_log_capture()
+    try:
+        if invalid_inputs is True:
+            job.skip(invalid_inputs=True)
+        elif shed is True:
+            job.skip()
+        else:
+            job.run()
+            end_job_deadline(job)
+        done.put((index, stop_log_capture(), None))
+    except BaseException as error:
+        done.put((index, stop_log_capture(), error))
+
+
+def run_dag(jobs: list) -> None:
+    """
+    DAG scheduler. Runs every job when all the jobs it depends on have finished.
+    Jobs with invalid input ports are skipped by the scheduler thread without the thread pool, so their outputs are invalid and
+    the jobs that use them are skipped too.
+    The wave log data is written in the order of the job list so the KPI file is the same as with the round robin scheduler.
+    :param jobs: list of Job objects
+    :return: None
+    """
+    done = queue.Queue()
+    nr_dependencies = list(job_nr_dependencies)
+    wave_log = [None] * len(jobs)
+    error = None
+    running = 0
+    # jobs that did not start, used for the deadline of the frame
+    waiting = set(range(len(jobs))) if is_deadline_active() else set()
+
+    def submit(job_index: int) -> None:
+        """
+        Gives a ready job to the thread pool
+        :param job_index: position of job in list
+        :return: None
+        """
+        waiting.discard(job_index)
+        if jobs[job_index].has_invalid_inputs():
+            run_job(jobs[job_index], job_index, done, invalid_inputs=True)
+        else:
+            executor.submit(run_job, jobs[job_index], job_index, done,
+                            is_job_shed(jobs=jobs, index=job_index, waiting=waiting, dependents=job_dependents, workers=nr_workers))
+
+    for index in range(len(jobs)):
+        if nr_dependencies[index] == 0:
+            submit(index)
+            running += 1
+
+    while running:
+        index, log, job_error = done.get()
+        running -= 1
+        wave_log[index] = log
+
+        if job_error is not None:
+            error = job_error
+
+        if error is None:
+            for dependent in job_dependents[index]:
+                nr_dependencies[dependent] -= 1
+                if nr_dependencies[dependent] == 0:
+                    submit(dependent)
+                    running += 1
+
+    if error is not None:
+        raise error
+
+    for index in range(len(jobs)):
+        log, error_flag = wave_log[index]
+        for text in log:
+            log_to_file(text)
+        if error_flag is True:
+            is_error()
+        log_to_file(jobs[index].get_time())
+    log_end_of_wave()
+
+
+def terminate_dag() -> None:
+    """
+    Stops the thread pool of the scheduler
+    :return: None
+    """
+    global executor
+
+    if executor is not None:
+        executor.shutdown(wait=True)
+        executor = None
+
+
+if __name__ == "__main__":
+    pass
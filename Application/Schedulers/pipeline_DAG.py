@@ -0,0 +1,196 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from Application.Frame.global_variables import global_var_handler
+from Application.Frame.port_planner import get_port_memory_key
+from Application.Frame.transferJobPorts import set_thread_wave, reset_ports_of_frame
+from Application.Schedulers.parallel_DAG import build_job_graph
+from Utils.log_handler import log_to_file, log_end_of_wave, log_to_console, start_log_capture, stop_log_capture, is_error
+
+"""
+Module handles the pipelined DAG scheduler used by APPL layer for execution.
+Several frames are processed in the same time, every frame in its own wave slot.
+A job of a frame waits for the jobs it depends on from the same frame and, from the previous frame, for itself and for the jobs
+that write its input ports(jobs can read ports of previous waves).
+"""
+
+
+class PipelineFrame:
+    """
+    Class that describes the state of a frame that is processed by the pipeline
+    """
+
+    def __init__(self, nr_dependencies: list) -> None:
+        """
+        Constructor of class
+        :param nr_dependencies: number of jobs each job is waiting for inside the frame
+        """
+        self.nr_dependencies = list(nr_dependencies)
+        self.finished = [False] * len(nr_dependencies)
+        self.wave_log = [None] * len(nr_dependencies)
+        self.jobs_left = len(nr_dependencies)
+
+
+def set_frame_context(frame: int = None) -> None:
+    """
+    Sets the frame and the wave slot used by the current thread
+    :param frame: frame processed by the thread. None to use the global values
+    :return: None
+    """
+    global_var_handler.set_thread_frame(frame)
+    set_thread_wave(frame)
+
+
+def run_job(job, frame: int, index: int, done: queue.Queue) -> None:
+    """
+    Runs a job of a frame on a worker thread and signals the scheduler when finished. Jobs with invalid input ports are skipped.
+    The time of the job is saved now because the next frame can run the job before the frame is logged.
+    :param job: Job object
+    :param frame: frame for which the job runs
+    :param index: position of job in list
+    :param done: queue where the scheduler waits for finished jobs
+    :return: None
+    """
+    set_frame_context(frame)
+    start_log_capture()
+    try:
+        if job.has_invalid_inputs():
+            job.skip(invalid_inputs=True)
+        else:
+            job.run()
+        done.put((frame, index, stop_log_capture(), job.get_time(), None))
+    except BaseException as error:
+        done.put((frame, index, stop_log_capture(), job.get_time(), error))
+
+
+def log_frame(jobs: list, frame: PipelineFrame) -> None:
+    """
+    Writes the wave log data of a frame in the order of the job list
+    :param jobs: list of Job objects
+    :param frame: finished frame
+    :return: None
+    """
+    for index in range(len(jobs)):
+        (log, error_flag), time = frame.wave_log[index]
+        for text in log:
+            log_to_file(text)
+        if error_flag is True:
+            is_error()
+        log_to_file(time)
+    log_end_of_wave()
+
+
+def build_previous_frame_graph(jobs: list) -> list:
+    """
+    Creates the links between consecutive frames. A job of a frame waits for itself and for all the jobs that write its input
+    ports in the previous frame, because the input ports can be read from the previous wave.
+    Waiting for the previous frame is enough because every job of that frame waited for itself in the frame before it.
+    Ports that share memory are treated as the same port.
+    :param jobs: list of Job objects
+    :return: list of jobs of the next frame that wait for each job
+    """
+    writers = dict()
+    for index in range(len(jobs)):
+        for port in [get_port_memory_key(el[0]) for el in jobs[index].get_out_ports()]:
+            writers.setdefault(port, set()).add(index)
+
+    previous_dependents = [{index} for index in range(len(jobs))]
+    for index in range(len(jobs)):
+        input_ports = jobs[index].get_input_ports()
+        if input_ports is None:
+            continue
+        for port in [get_port_memory_key(el) for el in input_ports]:
+            for writer in writers.get(port, []):
+                previous_dependents[writer].add(index)
+
+    return [sorted(el) for el in previous_dependents]
+
+
+def run_pipeline(jobs: list, depth: int, workers: int, end_of_frame) -> None:
+    """
+    Pipelined scheduler. Runs the frames from FRAME to NR_PICTURES with maximum depth frames in the same time.
+    Frames are finished in order. After a frame is finished the end_of_frame function is called for it with the frame context set.
+    :param jobs: list of Job objects
+    :param depth: number of frames processed in the same time
+    :param workers: number of threads to use
+    :param end_of_frame: function called with the frame number after each frame is finished
+    :return: None
+    """
+    dependents, nr_dependencies = build_job_graph(jobs)
+    previous_dependents = build_previous_frame_graph(jobs)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    done = queue.Queue()
+    frames = dict()
+    # noinspection PyUnresolvedReferences
+    next_frame = oldest_frame = global_var_handler.FRAME
+    error = None
+    running = 0
+
+    log_to_console('PIPELINE SCHEDULER STARTED WITH {workers} WORKERS AND {depth} FRAMES IN FLIGHT'.format(workers=workers, depth=depth))
+
+    while True:
+        # start new frames while the pipeline is not full
+        # noinspection PyUnresolvedReferences
+        while error is None and next_frame < global_var_handler.NR_PICTURES and next_frame - oldest_frame < depth:
+            reset_ports_of_frame(frame=next_frame)
+            new_frame = PipelineFrame(nr_dependencies)
+            previous_frame = frames.get(next_frame - 1)
+            frames[next_frame] = new_frame
+
+            if previous_frame is not None:
+                for index in range(len(jobs)):
+                    if previous_frame.finished[index] is False:
+                        for dependent in previous_dependents[index]:
+                            new_frame.nr_dependencies[dependent] += 1
+
+            for index in range(len(jobs)):
+                if new_frame.nr_dependencies[index] == 0:
+                    executor.submit(run_job, jobs[index], next_frame, index, done)
+                    running += 1
+
+            next_frame += 1
+
+        if running == 0:
+            break
+
+        frame_nr, index, log, time, job_error = done.get()
+        running -= 1
+        frame = frames[frame_nr]
+        frame.finished[index] = True
+        frame.wave_log[index] = (log, time)
+        frame.jobs_left -= 1
+
+        if job_error is not None:
+            error = job_error
+
+        if error is None:
+            for dependent in dependents[index]:
+                frame.nr_dependencies[dependent] -= 1
+                if frame.nr_dependencies[dependent] == 0:
+                    executor.submit(run_job, jobs[dependent], frame_nr, dependent, done)
+                    running += 1
+
+            next_frame_state = frames.get(frame_nr + 1)
+            if next_frame_state is not None:
+                for dependent in previous_dependents[index]:
+                    next_frame_state.nr_dependencies[dependent] -= 1
+                    if next_frame_state.nr_dependencies[dependent] == 0:
+                        executor.submit(run_job, jobs[dependent], frame_nr + 1, dependent, done)
+                        running += 1
+
+            # finish frames in order
+            while oldest_frame in frames and frames[oldest_frame].jobs_left == 0:
+                set_frame_context(oldest_frame)
+                log_frame(jobs, frames.pop(oldest_frame))
+                end_of_frame(oldest_frame)
+                oldest_frame += 1
+
+    set_frame_context()
+    executor.shutdown(wait=True)
+
+    if error is not None:
+        raise error
+
+
+if __name__ == "__main__":
+    pass
@@ -1,4 +1,5 @@
 from Utils.log_handler import log_to_file, log_end_of_wave
+from Application.Schedulers.frame_deadline import is_job_shed, end_job_deadline
 
 """
 Module handles the Round Robin scheduler used by APPL layer for execution
@@ -7,13 +8,21 @@ Module handles the Round Robin scheduler used by APPL layer for execution
 
 def run_rr(jobs: list) -> None:
     """
-    Simple round robin scheduler
+    Simple round robin scheduler. Jobs with invalid input ports are skipped, so their outputs are invalid and the jobs that use
+    them are skipped too.
     :param jobs: list of Job objects
     :return: None
     """
-    for job in jobs:
-        job.run()
-        log_to_file(str(job.get_time()))
+    for index in range(len(jobs)):
+        job = jobs[index]
+        if job.has_invalid_inputs():
+            job.skip(invalid_inputs=True)
+        elif is_job_shed(jobs=jobs, index=index, waiting=range(index + 1, len(jobs))):
+            job.skip()
+        else:
+            job.run()
+            end_job_deadline(job)
+        log_to_file(job.get_time())
     log_end_of_wave()
 
 
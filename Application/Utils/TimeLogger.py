@@ -1,8 +1,16 @@
 from timeit import default_timer as timer
+import json
 import sys
+import time
+
+import numpy as np
+
+import config_main
 
 """
 Module handles the time object for the APPL block
+The cpu time of a job timer is the cpu time of the thread that runs the job, so the work done by other threads, like the internal
+threads of OpenCV, is not counted. The phase timers use the cpu time of the whole process.
 """
 
 
@@ -13,9 +21,10 @@ class Timer:
     """
     CONVERT_TO_MS = 1000
 
-    def __init__(self) -> object:
+    def __init__(self, process_cpu: bool = False) -> object:
         """
         Constructor of Timer class
+        :param process_cpu: if the cpu time of the process is measured instead of the cpu time of the thread that runs the cycle
         """
         self.__average_time_sum__: float = 0.0
         self.__average_time_count__: float = 0.0
@@ -23,6 +32,18 @@ class Timer:
         self.__current_time__: float = 0.0
         self.__cycle_start__: float = 0.0
         self.__cycle_end__: float = 0.0
+        # cpu time of the process or of the thread that runs the cycle
+        self.__process_cpu__: bool = process_cpu
+        self.__cpu_time_sum__: float = 0.0
+        self.__current_cpu_time__: float = 0.0
+        self.__cycle_cpu_start__: float = 0.0
+        self.__cycle_cpu_end__: float = 0.0
+        self.__min_time__: float = float('inf')
+        self.__max_time__: float = 0.0
+        # ring buffers with the last APPL_TIMER_SAMPLES cycles in seconds, they grow up to that size
+        self.__time_samples__ = np.zeros(0, dtype=np.float32)
+        self.__cpu_samples__ = np.zeros(0, dtype=np.float32)
+        self.__sample_position__: int = 0
 
     def start_cycle_timer(self) -> None:
         """
@@ -30,6 +51,7 @@ class Timer:
         :return: None
         """
         self.__cycle_start__ = timer()
+        self.__cycle_cpu_start__ = time.process_time() if self.__process_cpu__ is True else time.thread_time()
 
     def end_cycle_timer(self) -> None:
         """
@@ -37,6 +59,7 @@ class Timer:
         :return: None
         """
         self.__cycle_end__ = timer()
+        self.__cycle_cpu_end__ = time.process_time() if self.__process_cpu__ is True else time.thread_time()
 
     def cycle_updater(self) -> None:
         """
@@ -49,9 +72,88 @@ class Timer:
         else:
             self.__current_time__ = self.__cycle_end__ - self.__cycle_start__
 
+        self.__current_cpu_time__ = self.__cycle_cpu_end__ - self.__cycle_cpu_start__
+
         self.__average_time_count__ += 1
         self.__average_time_sum__ += self.__current_time__
         self.__average_time__ = self.__average_time_sum__ / self.__average_time_count__
+        self.__cpu_time_sum__ += self.__current_cpu_time__
+        self.__min_time__ = min(self.__min_time__, self.__current_time__)
+        self.__max_time__ = max(self.__max_time__, self.__current_time__)
+        self.add_sample(self.__current_time__, self.__current_cpu_time__)
+
+    def add_sample(self, time_sample: float, cpu_sample: float) -> None:
+        """
+        Adds a cycle in the ring buffers. If the buffers are full the oldest cycle is replaced.
+        :param time_sample: wall time of cycle in seconds
+        :param cpu_sample: cpu time of cycle in seconds
+        :return: None
+        """
+        if self.__sample_position__ >= len(self.__time_samples__):
+            size = min(config_main.APPL_TIMER_SAMPLES, max(64, 2 * len(self.__time_samples__)))
+            self.__time_samples__ = np.concatenate((self.__time_samples__, np.zeros(size - len(self.__time_samples__), np.float32)))
+            self.__cpu_samples__ = np.concatenate((self.__cpu_samples__, np.zeros(size - len(self.__cpu_samples__), np.float32)))
+
+        self.__time_samples__[self.__sample_position__] = time_sample
+        self.__cpu_samples__[self.__sample_position__] = cpu_sample
+        self.__sample_position__ = (self.__sample_position__ + 1) % config_main.APPL_TIMER_SAMPLES
+
+    def get_samples(self) -> tuple:
+        """
+        :return: array of wall times and array of cpu times of the cycles in ring buffers, in seconds
+        """
+        nr_samples = int(min(self.__average_time_count__, len(self.__time_samples__)))
+
+        return self.__time_samples__[:nr_samples], self.__cpu_samples__[:nr_samples]
+
+    def merge(self, other) -> None:
+        """
+        Adds the cycles measured by other timer, for example from a worker process
+        :param other: Timer object
+        :return: None
+        """
+        time_samples, cpu_samples = self.get_samples()
+        other_time_samples, other_cpu_samples = other.get_samples()
+
+        self.__average_time_count__ += other.__average_time_count__
+        self.__average_time_sum__ += other.__average_time_sum__
+        self.__cpu_time_sum__ += other.__cpu_time_sum__
+        self.__min_time__ = min(self.__min_time__, other.__min_time__)
+        self.__max_time__ = max(self.__max_time__, other.__max_time__)
+
+        if self.__average_time_count__ != 0:
+            self.__average_time__ = self.__average_time_sum__ / self.__average_time_count__
+
+        self.__time_samples__ = np.concatenate((time_samples, other_time_samples))[-config_main.APPL_TIMER_SAMPLES:]
+        self.__cpu_samples__ = np.concatenate((cpu_samples, other_cpu_samples))[-config_main.APPL_TIMER_SAMPLES:]
+        self.__sample_position__ = len(self.__time_samples__) % config_main.APPL_TIMER_SAMPLES
+
+    def get_statistics(self) -> dict:
+        """
+        Percentiles are computed from the cycles in the ring buffers.
+        :return: dictionary with the statistics of the cycles in milliseconds
+        """
+        time_samples, cpu_samples = self.get_samples()
+
+        if len(time_samples) == 0:
+            time_percentiles = cpu_percentiles = [0.0, 0.0, 0.0]
+        else:
+            time_percentiles = np.percentile(time_samples, [50, 95, 99]) * self.CONVERT_TO_MS
+            cpu_percentiles = np.percentile(cpu_samples, [50, 95, 99]) * self.CONVERT_TO_MS
+
+        count = self.__average_time_count__
+
+        return {'count': int(count),
+                'average[ms]': self.get_average_time(),
+                'min[ms]': self.__min_time__ * self.CONVERT_TO_MS if count else 0.0,
+                'max[ms]': self.__max_time__ * self.CONVERT_TO_MS,
+                'p50[ms]': float(time_percentiles[0]),
+                'p95[ms]': float(time_percentiles[1]),
+                'p99[ms]': float(time_percentiles[2]),
+                'cpu average[ms]': self.__cpu_time_sum__ / count * self.CONVERT_TO_MS if count else 0.0,
+                'cpu p50[ms]': float(cpu_percentiles[0]),
+                'cpu p95[ms]': float(cpu_percentiles[1]),
+                'cpu p99[ms]': float(cpu_percentiles[2])}
 
     def get_current_time(self) -> float:
         """
@@ -70,3 +172,17 @@ class Timer:
         :return: The value in milliseconds of cycle average
         """
         return self.__average_time__
+
+
+def save_time_statistics(phases: dict, jobs: list) -> None:
+    """
+    Saves the time statistics of the phases and of the jobs in the LOG_TIME_FILE json file
+    :param phases: dictionary of phase name and Timer object
+    :param jobs: list of tuples of job name and Timer object
+    :return: None
+    """
+    data = {'phases': {name: phase_timer.get_statistics() for name, phase_timer in phases.items()},
+            'jobs': [dict(name=name, **job_timer.get_statistics()) for name, job_timer in jobs]}
+
+    with open(config_main.LOG_TIME_FILE, 'w') as file:
+        json.dump(data, file, indent=2)
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+import config_main
+from Application.Frame.global_variables import global_var_handler
+from Application.Frame.transferJobPorts import portsDict, prepare_ports_new_wave
+from Application.Utils.image_writer import wait_image_writer
+from Application.Utils.video_decoder import seek_video
+from Utils.log_handler import log_to_console, log_error_to_console, get_kpi_table, set_kpi_table
+
+"""
+Module handles the checkpoints of the APPL block.
+With APPL_CHECKPOINT_FRAMES the state of the run is saved every n frames: the next frame, the KPI rows, the timers of the frames
+and of the jobs and the ports of the previous waves used by jobs with wave offset. The saved images of the frames are written
+before the checkpoint.
+With APPL_CHECKPOINT_RESUME a run with the same jobs and configuration continues from its checkpoint. The checkpoint is deleted
+when the run ends. Data that jobs keep outside of ports is not in the checkpoint.
+"""
+
+# version of the checkpoint files, checkpoints of other versions are not used
+CHECKPOINT_VERSION = 2
+# location of the checkpoint of the current run, None if the run has no checkpoints
+checkpoint_file = None
+
+
+def get_run_key() -> str:
+    """
+    :return: hash of the content of the job list file and of the settings of config_main, without the checkpoint settings
+    """
+    settings = {key: value for key, value in vars(config_main).items() if key.isupper() and key != 'APPL_INPUT_JOB_LIST' and
+                not key.startswith('APPL_CHECKPOINT') and isinstance(value, (bool, int, float, str, list, tuple, dict, type(None)))}
+    key = hashlib.blake2b(json.dumps(settings, sort_keys=True, default=str).encode(), digest_size=16)
+
+    try:
+        with open(config_main.APPL_INPUT_JOB_LIST, 'rb') as file:
+            key.update(file.read())
+    except OSError:
+        pass
+
+    return key.hexdigest()
+
+
+def init_checkpoint() -> None:
+    """
+    Sets the checkpoint of the run. Must be called before the configuration is changed by the setup of the run.
+    :return: None
+    """
+    global checkpoint_file
+
+    checkpoint_file = None
+
+    if config_main.APPL_CHECKPOINT_FRAMES == 0 and config_main.APPL_CHECKPOINT_RESUME is False:
+        return
+
+    checkpoint_file = os.path.join(config_main.APPL_CHECKPOINT_LOCATION, 'checkpoint_' + get_run_key() + '.pkl')
+
+    if config_main.APPL_INPUT == config_main.CAMERA_INPUT:
+        stop_checkpoint('CAMERA FRAMES CAN NOT BE READ AGAIN')
+
+
+def stop_checkpoint(reason: str) -> None:
+    """
+    No checkpoints are used by the run
+    :param reason: why the run has no checkpoints
+    :return: None
+    """
+    global checkpoint_file
+
+    if checkpoint_file is not None:
+        log_to_console('CHECKPOINTS NOT USED: ' + reason)
+        checkpoint_file = None
+
+
+def save_checkpoint(jobs: list, timer_wave, timer_post_processing) -> None:
+    """
+    Saves the state of the run every APPL_CHECKPOINT_FRAMES frames. Called after a frame ended and the ports were prepared for
+    the next frame.
+    :param jobs: list of jobs
+    :param timer_wave: timer for the jobs of a frame
+    :param timer_post_processing: timer for showing and saving the ports of a frame
+    :return: None
+    """
+    # noinspection PyUnresolvedReferences
+    frame = global_var_handler.FRAME
+
+    # noinspection PyUnresolvedReferences
+    if checkpoint_file is None or config_main.APPL_CHECKPOINT_FRAMES == 0 or frame % config_main.APPL_CHECKPOINT_FRAMES != 0 or \
+            frame >= global_var_handler.NR_PICTURES:
+        return
+
+    wait_image_writer()
+
+    ports = []
+    if config_main.APPL_NR_WAVES > 1:
+        ports = [{name: np.asarray(port.arr) for name, port in wave.items() if port.is_valid()} for wave in portsDict]
+
+    data = {'version': CHECKPOINT_VERSION,
+            'frame': frame,
+            'kpi table': get_kpi_table(),
+            'wave': timer_wave,
+            'post processing': timer_post_processing,
+            'jobs': [(job.__name__, job.__timer__, getattr(job, '__state__', None), job.__nr_logged__, job.__nr_skipped__) for job in jobs],
+            'ports': ports}
+
+    try:
+        os.makedirs(config_main.APPL_CHECKPOINT_LOCATION, exist_ok=True)
+        with open(checkpoint_file + '.tmp', 'wb') as file:
+            pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(checkpoint_file + '.tmp', checkpoint_file)
+    except BaseException as error:
+        log_error_to_console('CHECKPOINT NOT SAVED: {}'.format(checkpoint_file), str(error))
+
+
+def resume_checkpoint(jobs: list, timer_wave, timer_post_processing) -> bool:
+    """
+    With APPL_CHECKPOINT_RESUME the run continues from the frame after its checkpoint. Without checkpoint the run starts from the
+    first frame.
+    :param jobs: list of jobs, initialized
+    :param timer_wave: timer for the jobs of a frame
+    :param timer_post_processing: timer for showing and saving the ports of a frame
+    :return: if the run continues from a checkpoint
+    """
+    if checkpoint_file is None or config_main.APPL_CHECKPOINT_RESUME is False:
+        return False
+
+    try:
+        with open(checkpoint_file, 'rb') as file:
+            data = pickle.load(file)
+    except FileNotFoundError:
+        log_to_console('NO CHECKPOINT FOR THIS RUN. RUN STARTS FROM FIRST FRAME')
+        return False
+    except BaseException as error:
+        log_error_to_console('CHECKPOINT NOT READ: {}'.format(checkpoint_file), str(error))
+        return False
+
+    if data.get('version') != CHECKPOINT_VERSION or [el[0] for el in data['jobs']] != [job.__name__ for job in jobs]:
+        log_error_to_console('CHECKPOINT NOT USED: {}'.format(checkpoint_file), 'other version or jobs')
+        return False
+
+    global_var_handler.FRAME = data['frame']
+    set_kpi_table(data['kpi table'])
+    timer_wave.__dict__.update(data['wave'].__dict__)
+    timer_post_processing.__dict__.update(data['post processing'].__dict__)
+
+    for job, (name, job_timer, state, nr_logged, nr_skipped) in zip(jobs, data['jobs']):
+        job.__timer__ = job_timer
+        job.__nr_logged__ = nr_logged
+        job.__nr_skipped__ = nr_skipped
+        if state is not None:
+            job.__state__ = state
+
+    prepare_ports_new_wave(frame=global_var_handler.FRAME)
+    for wave in range(min(len(data['ports']), len(portsDict))):
+        for name, arr in data['ports'][wave].items():
+            port = portsDict[wave].get(name)
+            if port is None:
+                continue
+            if port.arr.shape != arr.shape or port.arr.dtype != arr.dtype:
+                port.reshape_arr(size_new_array=arr.shape, type_new_array=arr.dtype)
+            port.arr[...] = arr
+            port.set_valid()
+
+    if config_main.APPL_INPUT == config_main.VIDEO_INPUT:
+        seek_video(config_main.APPL_VIDEO_START_FRAME + global_var_handler.FRAME * config_main.APPL_VIDEO_FRAME_STEP)
+
+    log_to_console('RUN CONTINUES FROM CHECKPOINT AT FRAME {}'.format(global_var_handler.FRAME))
+
+    return True
+
+
+def remove_checkpoint() -> None:
+    """
+    Deletes the checkpoint of a run that ended
+    :return: None
+    """
+    global checkpoint_file
+
+    if checkpoint_file is not None and os.path.isfile(checkpoint_file):
+        os.remove(checkpoint_file)
+
+    checkpoint_file = None
+
+
+if __name__ == "__main__":
+    pass
@@ -7,6 +7,7 @@ import config_main
 
 from Application.Frame.global_variables import global_var_handler
 from Application.Frame.transferJobPorts import get_port_from_wave
+from Application.Utils.image_writer import create_folder, save_image
 from Utils.log_handler import log_error_to_console
 
 """
@@ -32,7 +33,7 @@ def show_pictures() -> None:
     """
     if config_main.APPL_SHOW_PICT:
         for port_name in config_main.APPL_SHOW_LIST:
-            port = get_port_from_wave(port_name)
+            port = get_port_from_wave(config_main.APPL_MERGED_PORTS.get(port_name, port_name))
             try:
                 img = port.arr.copy()
                 if ROTATE:
@@ -51,7 +52,8 @@ def show_pictures() -> None:
 
 def save_pict_to_file() -> None:
     """
-    Saves ports to file
+    Saves ports to file. The images are written by the image writer threads.
+    Ports of deleted duplicated jobs are saved from the port that replaces them, in the folder with the requested name.
     :return: None
     """
     location = config_main.APPL_SAVE_LOCATION
@@ -61,24 +63,23 @@ def save_pict_to_file() -> None:
     if config_main.APPL_SAVE_PICT:
         for img in config_main.APPL_SAVE_PICT_LIST:
             img_location = os.path.join(location, img)
-            port = get_port_from_wave(img)
-            if not os.path.exists(img_location):
-                os.makedirs(img_location)
+            port = get_port_from_wave(config_main.APPL_MERGED_PORTS.get(img, img))
             try:
+                create_folder(img_location)
                 if port.is_valid() is True:
                     extension = config_main.APPl_SAVE_PICT_EXTENSION
                     if name is None:
                         # noinspection PyUnresolvedReferences
                         if config_main.APPL_SAVE_JOB_NAME:
-                            cv2.imwrite(img_location + '/' + '{:08d}'.format(global_var_handler.FRAME) + '_' + port.get_name() + extension, port.arr)
+                            save_image(img_location + '/' + '{:08d}'.format(global_var_handler.get_frame()) + '_' + img + extension, port.arr, img)
                         else:
-                            cv2.imwrite(img_location + '/' + '{:08d}'.format(global_var_handler.FRAME) + extension, port.arr)
+                            save_image(img_location + '/' + '{:08d}'.format(global_var_handler.get_frame()) + extension, port.arr, img)
                     else:
                         name = name.split('.')[0] + extension
                         if config_main.APPL_SAVE_JOB_NAME:
-                            cv2.imwrite(img_location + '/' + port.get_name() + '_' + name, port.arr)
+                            save_image(img_location + '/' + img + '_' + name, port.arr, img)
                         else:
-                            cv2.imwrite(img_location + '/' + name, port.arr)
+                            save_image(img_location + '/' + name, port.arr, img)
             except BaseException as error:
                 log_error_to_console('SAVE PICTURE ' + str(img), str(error))
                 pass
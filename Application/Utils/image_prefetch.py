@@ -0,0 +1,137 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# noinspection PyPackageRequirements
+import cv2
+import numpy as np
+
+import config_main
+from Application.Frame.global_variables import global_var_handler
+from Application.Utils.tracer import trace_begin, trace_end
+
+"""
+Module handles the prefetch of input images for the APPL block.
+When APPL_PREFETCH_FRAMES is not 0 the images of the next frames are read and decoded by background threads while the jobs of
+the current frame run. The retrieval jobs take the images in the order of the frames.
+"""
+
+# threads that read the images
+executor = None
+# images that are read for (frame, file, read function, parameters of read function)
+pending_frames = dict()
+prefetch_lock = threading.Lock()
+
+
+def get_input_path(frame: int) -> str:
+    """
+    :param frame: frame number
+    :return: location of the input file of the frame
+    """
+    return os.path.join(config_main.APPL_INPUT_DIR, config_main.APPL_INPUT_IMG_DIR[frame])
+
+
+def read_image(path: str) -> np.ndarray:
+    """
+    Reads and decodes an image
+    :param path: location of image
+    :return: image, None if it can't be read
+    """
+    begin = trace_begin()
+    img = cv2.imread(filename=path)
+    trace_end(begin, 'read image', 'io', {'file': path})
+
+    return img
+
+
+def read_txt(path: str, line_separator: str, px_separator: str) -> np.ndarray:
+    """
+    Reads an image coded in a txt file
+    :param path: location of txt file
+    :param line_separator: separator of lines
+    :param px_separator: separator of pixels
+    :return: image
+    """
+    begin = trace_begin()
+    with open(file=path, mode='r') as file:
+        img = file.read()
+    trace_end(begin, 'read image', 'io', {'file': path})
+
+    tmp = []
+    for line in img.split(line_separator)[:-1]:
+        tmp.append(list(map(int, line.split(px_separator))))
+
+    return np.array(tmp)
+
+
+def read_frame(frame: int, read_function, args: tuple):
+    """
+    Reads the input of a frame in a prefetch thread
+    :param frame: frame number
+    :param read_function: function that reads the file
+    :param args: other parameters of the read function
+    :return: return of read function
+    """
+    global_var_handler.set_thread_frame(frame)
+
+    try:
+        return read_function(get_input_path(frame), *args)
+    finally:
+        global_var_handler.set_thread_frame(None)
+
+
+def get_input(frame: int, read_function, args: tuple = ()):
+    """
+    Gives the input of a frame and starts reading the inputs of the next APPL_PREFETCH_FRAMES frames.
+    Without prefetch the input is read now.
+    :param frame: frame number
+    :param read_function: function that reads the file, read_image or read_txt
+    :param args: other parameters of the read function
+    :return: return of read function. Errors of the read function are raised here.
+    """
+    global executor
+
+    if config_main.APPL_PREFETCH_FRAMES == 0:
+        return read_function(get_input_path(frame), *args)
+
+    # noinspection PyUnresolvedReferences
+    last_frame = max(frame, min(frame + config_main.APPL_PREFETCH_FRAMES, global_var_handler.NR_PICTURES - 1,
+                                len(config_main.APPL_INPUT_IMG_DIR) - 1))
+
+    with prefetch_lock:
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=config_main.APPL_PREFETCH_THREADS, thread_name_prefix='image prefetch')
+
+        # frames that are not needed anymore
+        for key in [key for key in pending_frames.keys() if key[0] < frame]:
+            pending_frames.pop(key).cancel()
+
+        for next_frame in range(frame, last_frame + 1):
+            key = (next_frame, config_main.APPL_INPUT_IMG_DIR[next_frame], read_function, args)
+            if key not in pending_frames:
+                pending_frames[key] = executor.submit(read_frame, next_frame, read_function, args)
+
+        future = pending_frames.pop((frame, config_main.APPL_INPUT_IMG_DIR[frame], read_function, args))
+
+    return future.result()
+
+
+def stop_prefetch() -> None:
+    """
+    Drops the frames that are read and stops the prefetch threads
+    :return: None
+    """
+    global executor
+
+    with prefetch_lock:
+        for future in pending_frames.values():
+            future.cancel()
+        pending_frames.clear()
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+            executor = None
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,168 @@
+import struct
+
+"""
+Module handles the probing of image sizes for the APPL block.
+The width, height and channels of PNG, JPEG, BMP and TIFF files are read from the headers of the files without decoding the images.
+For JPEG files the EXIF orientation is used because images are rotated when they are read.
+"""
+
+# bytes read from the start of PNG, BMP and TIFF files
+HEADER_BYTES = 64
+# channels for PNG color types
+PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+# JPEG start of frame markers
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# TIFF tags
+TIFF_WIDTH = 256
+TIFF_HEIGHT = 257
+TIFF_SAMPLES = 277
+TIFF_ORIENTATION = 274
+
+
+def get_ifd_tags(data: bytes, byte_order: str, offset: int) -> dict:
+    """
+    Reads the SHORT and LONG tags of a TIFF image file directory
+    :param data: data that contains the image file directory
+    :param byte_order: < for little endian, > for big endian
+    :param offset: position of image file directory in data
+    :return: dictionary of tag and value
+    """
+    tags = dict()
+    nr_entries = struct.unpack_from(byte_order + 'H', data, offset)[0]
+
+    for entry in range(nr_entries):
+        position = offset + 2 + entry * 12
+        tag, tag_type, count = struct.unpack_from(byte_order + 'HHI', data, position)
+        if tag_type == 3:
+            tags[tag] = struct.unpack_from(byte_order + 'H', data, position + 8)[0]
+        elif tag_type == 4:
+            tags[tag] = struct.unpack_from(byte_order + 'I', data, position + 8)[0]
+
+    return tags
+
+
+def get_tiff_tags(data: bytes, start: int = 0) -> dict:
+    """
+    Reads the SHORT and LONG tags of the first image file directory of TIFF data
+    :param data: TIFF data
+    :param start: position of TIFF header in data
+    :return: dictionary of tag and value
+    """
+    byte_order = {b'II': '<', b'MM': '>'}.get(data[start:start + 2])
+    if byte_order is None:
+        return dict()
+
+    return get_ifd_tags(data, byte_order, start + struct.unpack_from(byte_order + 'I', data, start + 4)[0])
+
+
+def probe_png(file) -> tuple:
+    """
+    :param file: binary file
+    :return: width, height, channels
+    """
+    data = file.read(26)
+    if data[12:16] != b'IHDR':
+        return None
+    width, height = struct.unpack('>II', data[16:24])
+
+    return width, height, PNG_CHANNELS.get(data[25], 3)
+
+
+def probe_jpeg(file) -> tuple:
+    """
+    :param file: binary file
+    :return: width, height, channels
+    """
+    orientation = 1
+    file.read(2)
+
+    while True:
+        byte = file.read(1)
+        while byte and byte != b'\xff':
+            byte = file.read(1)
+        while byte == b'\xff':
+            byte = file.read(1)
+        if not byte:
+            return None
+
+        marker = byte[0]
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker in (0xD9, 0xDA):
+            return None
+
+        length = struct.unpack('>H', file.read(2))[0]
+        segment = file.read(length - 2)
+
+        if marker in JPEG_SOF_MARKERS:
+            height, width, channels = struct.unpack_from('>HHB', segment, 1)
+            # orientations 5 to 8 are rotated by 90 degrees
+            if orientation >= 5:
+                width, height = height, width
+            return width, height, channels
+
+        if marker == 0xE1 and segment[:6] == b'Exif\x00\x00':
+            try:
+                orientation = get_tiff_tags(segment, 6).get(TIFF_ORIENTATION, 1)
+            except struct.error:
+                orientation = 1
+
+
+def probe_bmp(file) -> tuple:
+    """
+    :param file: binary file
+    :return: width, height, channels
+    """
+    data = file.read(HEADER_BYTES)
+    header_size = struct.unpack_from('<I', data, 14)[0]
+
+    if header_size == 12:
+        width, height, bits = struct.unpack_from('<HH2xH', data, 18)
+    else:
+        width, height, bits = struct.unpack_from('<ii2xH', data, 18)
+
+    return width, abs(height), {32: 4, 24: 3, 16: 3}.get(bits, 1)
+
+
+def probe_tiff(file) -> tuple:
+    """
+    :param file: binary file
+    :return: width, height, channels
+    """
+    header = file.read(8)
+    byte_order = '<' if header[:2] == b'II' else '>'
+    file.seek(struct.unpack_from(byte_order + 'I', header, 4)[0])
+    data = file.read(2)
+    data += file.read(12 * struct.unpack_from(byte_order + 'H', data)[0])
+    tags = get_ifd_tags(data, byte_order, 0)
+
+    if TIFF_WIDTH not in tags or TIFF_HEIGHT not in tags:
+        return None
+
+    return tags[TIFF_WIDTH], tags[TIFF_HEIGHT], tags.get(TIFF_SAMPLES, 1)
+
+
+def probe_image(path: str) -> tuple:
+    """
+    Reads the size of an image from the header of the file
+    :param path: location of image
+    :return: width, height, channels. None if the format is not known or the header is not OK.
+    """
+    probes = ((b'\x89PNG\r\n\x1a\n', probe_png), (b'\xff\xd8', probe_jpeg), (b'BM', probe_bmp), (b'II*\x00', probe_tiff),
+              (b'MM\x00*', probe_tiff))
+
+    try:
+        with open(path, 'rb') as file:
+            signature = file.read(8)
+            for start, probe in probes:
+                if signature.startswith(start):
+                    file.seek(0)
+                    return probe(file)
+    except (OSError, struct.error):
+        return None
+
+    return None
+
+
+if __name__ == "__main__":
+    pass
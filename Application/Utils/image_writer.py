@@ -0,0 +1,217 @@
+import os
+import queue
+import threading
+
+# noinspection PyPackageRequirements
+import cv2
+import numpy as np
+
+import config_main
+from Application.Frame.global_variables import global_var_handler
+from Application.Utils.tracer import trace_begin, trace_end
+from Utils.log_handler import log_to_console, log_error_to_console
+from Utils.array_store import ArrayStore, remove_array_store
+
+"""
+Module handles the writer of saved ports for the APPL block.
+The arrays of the ports are copied and written to files by APPL_SAVE_THREADS threads while the next frames run.
+When APPL_SAVE_QUEUE_SIZE images wait to be written the frame waits for the writer.
+If APPL_SAVE_ARRAY_STORE is True the arrays are appended to an array store in the folder of the port instead of image files.
+The stores of the saved ports are removed at the start of a run, except when the run continues from a checkpoint.
+"""
+
+# images waiting to be written as (file, array, port name, frame), None to stop a thread
+write_queue = None
+writer_threads = []
+# folders that exist
+created_folders = set()
+# array stores of the folders of saved ports
+array_stores = dict()
+# name of the writer of the array stores, every worker process has his own files
+store_writer = ''
+writer_lock = threading.Lock()
+IMAGES_WRITTEN = 0
+WRITE_ERRORS = 0
+
+
+def create_folder(location: str) -> None:
+    """
+    Creates a folder the first time an image is saved in it
+    :param location: folder
+    :return: None
+    """
+    if location not in created_folders:
+        os.makedirs(location, exist_ok=True)
+        created_folders.add(location)
+
+
+def get_array_store(location: str) -> ArrayStore:
+    """
+    :param location: folder of port
+    :return: array store of the folder
+    """
+    with writer_lock:
+        store = array_stores.get(location)
+        if store is None:
+            store = ArrayStore(location=location, chunk_bytes=config_main.APPL_SAVE_STORE_CHUNK_BYTES, writer=store_writer)
+            array_stores[location] = store
+
+    return store
+
+
+def clear_array_stores() -> None:
+    """
+    Removes the array stores of the saved ports written by previous runs
+    :return: None
+    """
+    if config_main.APPL_SAVE_PICT is False or config_main.APPL_SAVE_ARRAY_STORE is False:
+        return
+
+    for port in config_main.APPL_SAVE_PICT_LIST:
+        location = os.path.join(config_main.APPL_SAVE_LOCATION, port)
+        try:
+            remove_array_store(location)
+        except BaseException as error:
+            log_error_to_console('ARRAY STORE NOK TO REMOVE: ' + location, str(error))
+
+
+def set_store_writer(name: str) -> None:
+    """
+    :param name: name of the writer of the array stores of this process
+    :return: None
+    """
+    global store_writer
+
+    store_writer = name
+
+
+def write_image(file: str, arr: np.ndarray, port: str, frame: int) -> None:
+    """
+    Writes an image and reports the errors
+    :param file: location of image. For array stores the name of the file without extension is the key of the array
+    :param arr: image
+    :param port: name of port
+    :param frame: frame of image
+    :return: None
+    """
+    global IMAGES_WRITTEN, WRITE_ERRORS
+
+    begin = trace_begin()
+    params = []
+    if config_main.APPL_SAVE_PNG_COMPRESSION is not None and file.lower().endswith('.png'):
+        params = [cv2.IMWRITE_PNG_COMPRESSION, config_main.APPL_SAVE_PNG_COMPRESSION]
+
+    try:
+        if config_main.APPL_SAVE_ARRAY_STORE is True:
+            get_array_store(os.path.dirname(file)).append(key=os.path.splitext(os.path.basename(file))[0], arr=arr)
+        elif cv2.imwrite(file, arr, params) is False:
+            raise IOError('image not written: ' + file)
+        with writer_lock:
+            IMAGES_WRITTEN += 1
+    except BaseException as error:
+        with writer_lock:
+            WRITE_ERRORS += 1
+        log_error_to_console('SAVE PICTURE ' + str(port), str(error))
+
+    trace_end(begin, 'save image', 'io', {'port': port, 'image frame': frame})
+
+
+def run_image_writer() -> None:
+    """
+    Writer thread. Writes the images from the queue until it gets None.
+    :return: None
+    """
+    while True:
+        task = write_queue.get()
+        try:
+            if task is None:
+                return
+            write_image(*task)
+        finally:
+            write_queue.task_done()
+
+
+def save_image(file: str, arr: np.ndarray, port: str) -> None:
+    """
+    Saves a copy of an array to a file. If APPL_SAVE_THREADS is 0 the image is written now.
+    :param file: location of image
+    :param arr: array of port
+    :param port: name of port
+    :return: None
+    """
+    global write_queue
+
+    if config_main.APPL_SAVE_THREADS == 0:
+        write_image(file, arr, port, global_var_handler.get_frame())
+        return
+
+    with writer_lock:
+        if not writer_threads:
+            write_queue = queue.Queue(maxsize=config_main.APPL_SAVE_QUEUE_SIZE)
+            for index in range(config_main.APPL_SAVE_THREADS):
+                writer_threads.append(threading.Thread(target=run_image_writer, name='image writer_{}'.format(index), daemon=True))
+                writer_threads[-1].start()
+
+    write_queue.put((file, np.array(arr, copy=True), port, global_var_handler.get_frame()))
+
+
+def wait_image_writer() -> None:
+    """
+    Waits for the images in the queue to be written and writes the buffered data of the array stores
+    :return: None
+    """
+    if writer_threads:
+        write_queue.join()
+
+    with writer_lock:
+        stores = list(array_stores.values())
+
+    for store in stores:
+        store.flush()
+
+
+def stop_image_writer() -> None:
+    """
+    Waits for all images to be written and stops the writer threads
+    :return: None
+    """
+    global IMAGES_WRITTEN, WRITE_ERRORS
+
+    with writer_lock:
+        threads = list(writer_threads)
+        writer_threads.clear()
+
+    for _ in threads:
+        write_queue.put(None)
+    for thread in threads:
+        thread.join()
+
+    for store in array_stores.values():
+        store.close()
+    array_stores.clear()
+
+    if IMAGES_WRITTEN != 0 or WRITE_ERRORS != 0:
+        log_to_console('IMAGES SAVED: {written} ERRORS: {errors}'.format(written=IMAGES_WRITTEN, errors=WRITE_ERRORS))
+
+    created_folders.clear()
+    IMAGES_WRITTEN = 0
+    WRITE_ERRORS = 0
+
+
+def reset_image_writer() -> None:
+    """
+    The writer threads are not copied in a forked process
+    :return: None
+    """
+    global writer_lock
+
+    writer_threads.clear()
+    writer_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_image_writer)
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,318 @@
+import collections
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+import config_main
+from Application.Frame.transferJobPorts import get_port_from_wave
+from Utils.log_handler import log_to_console, log_error_to_console, log_to_file, is_error, start_log_capture, stop_log_capture
+
+"""
+Module handles the cache of job outputs that is kept between application runs.
+The output ports of a job for a frame are saved in a npz file with the name given by the key of the job.
+The key of a job is made of the source code of the job module and of the project modules it imports, the main function, the init and
+main function parameters, APPL_JOB_CACHE_VERSION and the keys of the input ports. The key of the ports of image retrieval jobs is the
+hash of the data so keys depend on the source frame.
+"""
+
+# files in cache and their size, the least recently used first
+cache_index = collections.OrderedDict()
+cache_lock = threading.Lock()
+# keys of the main functions
+function_keys = dict()
+# if the cache is used in current run
+CACHE_ACTIVE = False
+CACHE_BYTES = 0
+HITS = 0
+MISSES = 0
+EVICTIONS = 0
+
+
+def init_job_cache() -> None:
+    """
+    Reads the files that are in the cache folder. The cache is not used if jobs can use data from previous waves.
+    :return: None
+    """
+    global CACHE_ACTIVE, CACHE_BYTES, HITS, MISSES, EVICTIONS
+
+    cache_index.clear()
+    CACHE_ACTIVE = False
+    CACHE_BYTES = HITS = MISSES = EVICTIONS = 0
+
+    if config_main.APPL_JOB_CACHE_LOCATION is None:
+        return
+
+    if config_main.APPL_NR_WAVES > 1:
+        log_to_console('JOB CACHE NOT USED BECAUSE JOBS CAN USE DATA FROM PREVIOUS WAVES')
+        return
+
+    location = config_main.APPL_JOB_CACHE_LOCATION
+    if not os.path.exists(location):
+        os.makedirs(location, exist_ok=True)
+
+    files = [el for el in os.scandir(location) if el.name.endswith('.npz')]
+    for file in sorted(files, key=lambda el: el.stat().st_mtime):
+        cache_index[file.name[:-len('.npz')]] = file.stat().st_size
+        CACHE_BYTES += file.stat().st_size
+
+    CACHE_ACTIVE = True
+    evict_outputs()
+
+    log_to_console('JOB CACHE: {files} OUTPUTS WITH {size} BYTES IN {location}'.format(files=len(cache_index), size=CACHE_BYTES,
+                                                                                      location=location))
+
+
+def get_source_files(function) -> list:
+    """
+    Source files the outputs of a main function depend on: the module of the function and the modules of the project that are
+    imported by it, directly or through the functions and classes it imports.
+    :param function: main function of job
+    :return: sorted list of source files
+    """
+    project = os.path.dirname(os.path.abspath(config_main.__file__))
+    modules = {inspect.getmodule(function)}
+
+    for value in list(getattr(function, '__globals__', {}).values()):
+        if inspect.ismodule(value):
+            modules.add(value)
+        elif inspect.isfunction(value) or inspect.isclass(value):
+            modules.add(sys.modules.get(value.__module__))
+
+    files = set()
+    for module in modules:
+        try:
+            file = os.path.abspath(inspect.getsourcefile(module))
+        except TypeError:
+            continue
+        if file.startswith(project + os.sep):
+            files.add(file)
+
+    return sorted(files)
+
+
+def get_function_key(function) -> str:
+    """
+    Key of a main function. The source code of the module and of the project modules it imports is used so the outputs are computed
+    again if the job or a helper it uses is changed.
+    :param function: main function of job
+    :return: key of function
+    """
+    key = function_keys.get(function)
+
+    if key is None:
+        source = hashlib.blake2b(digest_size=16)
+        for file_name in get_source_files(function):
+            try:
+                with open(file_name, 'rb') as file:
+                    source.update(file.read())
+            except OSError:
+                pass
+        key = function.__module__ + '.' + function.__qualname__ + ':' + source.hexdigest()
+        function_keys[function] = key
+
+    return key
+
+
+def get_data_key(port) -> str:
+    """
+    :param port: Port object
+    :return: key made from the data of the port
+    """
+    data_hash = hashlib.blake2b(digest_size=16)
+    data_hash.update(str((port.arr.shape, port.arr.dtype.str)).encode())
+    data_hash.update(np.ascontiguousarray(port.arr).data)
+
+    return data_hash.hexdigest()
+
+
+def get_file(key: str) -> str:
+    """
+    :param key: key of job
+    :return: location of the file of the job outputs
+    """
+    return os.path.join(config_main.APPL_JOB_CACHE_LOCATION, key + '.npz')
+
+
+def load_outputs(key: str, output_ports: list):
+    """
+    Puts the cached data in the output ports
+    :param key: key of job
+    :param output_ports: list of Port objects
+    :return: None if the key is not in cache, else list of data logged by the job, if an error was set, return of main function
+    """
+    global HITS, MISSES
+
+    with cache_lock:
+        if key not in cache_index:
+            MISSES += 1
+            return None
+        cache_index.move_to_end(key)
+        HITS += 1
+
+    try:
+        with np.load(get_file(key), allow_pickle=False) as data:
+            valid = data['valid']
+            for index in range(len(output_ports)):
+                if valid[index]:
+                    port = output_ports[index]
+                    arr = data['port_{}'.format(index)]
+                    if port.arr.shape == arr.shape and port.arr.dtype == arr.dtype:
+                        port.arr[...] = arr
+                    else:
+                        port.arr = arr
+                    port.set_valid()
+            result = False if bool(data['dropped']) is True else True
+            outputs = list(data['log']), bool(data['error']), result
+        os.utime(get_file(key))
+    except BaseException as error:
+        log_error_to_console('JOB CACHE NOK TO LOAD: ' + key, str(error))
+        for port in output_ports:
+            port.set_invalid()
+        remove_output(key)
+        with cache_lock:
+            HITS -= 1
+            MISSES += 1
+        return None
+
+    return outputs
+
+
+def save_outputs(key: str, output_ports: list, log: list, error: bool, result) -> None:
+    """
+    Saves the output ports of a job in the cache
+    :param key: key of job
+    :param output_ports: list of Port objects
+    :param log: data logged by the job
+    :param error: if the job set an error
+    :param result: return of main function
+    :return: None
+    """
+    global CACHE_BYTES
+
+    data = {'port_{}'.format(index): output_ports[index].arr for index in range(len(output_ports)) if output_ports[index].is_valid()}
+    temporary_file = get_file(key) + '.{}_{}.tmp'.format(os.getpid(), threading.get_ident())
+
+    try:
+        with open(temporary_file, 'wb') as file:
+            np.savez(file, valid=np.array([port.is_valid() for port in output_ports], dtype=bool), log=np.array(log, dtype=str),
+                     error=np.array(error), dropped=np.array(result is False), **data)
+        os.replace(temporary_file, get_file(key))
+    except BaseException as error:
+        log_error_to_console('JOB CACHE NOK TO SAVE: ' + key, str(error))
+        return
+
+    with cache_lock:
+        CACHE_BYTES += os.path.getsize(get_file(key)) - cache_index.pop(key, 0)
+        cache_index[key] = os.path.getsize(get_file(key))
+
+    evict_outputs()
+
+
+def remove_output(key: str) -> None:
+    """
+    Deletes the outputs of a job from the cache
+    :param key: key of job
+    :return: None
+    """
+    global CACHE_BYTES
+
+    with cache_lock:
+        CACHE_BYTES -= cache_index.pop(key, 0)
+
+    try:
+        os.remove(get_file(key))
+    except OSError:
+        pass
+
+
+def evict_outputs() -> None:
+    """
+    Deletes the least recently used outputs while the cache is bigger than APPL_JOB_CACHE_MAX_BYTES
+    :return: None
+    """
+    global CACHE_BYTES, EVICTIONS
+
+    with cache_lock:
+        while CACHE_BYTES > config_main.APPL_JOB_CACHE_MAX_BYTES and cache_index:
+            key, size = cache_index.popitem(last=False)
+            CACHE_BYTES -= size
+            EVICTIONS += 1
+            try:
+                os.remove(get_file(key))
+            except OSError:
+                pass
+
+
+def run_job_cached(job):
+    """
+    Runs the main function of a job or loads the outputs of the job from the cache.
+    Image retrieval jobs and jobs without output ports always run.
+    :param job: Job object
+    :return: return of main function
+    """
+    main_function = job.__main_function__
+
+    if CACHE_ACTIVE is False:
+        return main_function(job.__main_func_param__)
+
+    output_ports = [get_port_from_wave(port[0]) for port in job.get_out_ports()]
+    input_ports = [get_port_from_wave(port) for port in job.get_input_ports()]
+
+    if len(output_ports) == 0:
+        return main_function(job.__main_func_param__)
+
+    if len(input_ports) == 0:
+        result = main_function(job.__main_func_param__)
+        for port in output_ports:
+            port.cache_key = get_data_key(port) if port.is_valid() else None
+        return result
+
+    if None in input_ports or None in [port.cache_key for port in input_ports]:
+        return main_function(job.__main_func_param__)
+
+    key = hashlib.blake2b(json.dumps([config_main.APPL_JOB_CACHE_VERSION, get_function_key(main_function), job.__init_func_param__,
+                                      job.__main_func_param__, [port.cache_key for port in input_ports]], default=str).encode(),
+                          digest_size=16).hexdigest()
+    outputs = load_outputs(key, output_ports)
+
+    if outputs is None:
+        start_log_capture()
+        try:
+            result = main_function(job.__main_func_param__)
+        finally:
+            log, error = stop_log_capture()
+        save_outputs(key, output_ports, log, error, result)
+    else:
+        log, error, result = outputs
+
+    for text in log:
+        log_to_file(text)
+    if error is True:
+        is_error()
+
+    for index in range(len(output_ports)):
+        output_ports[index].cache_key = key + '_' + str(index)
+
+    return result
+
+
+def log_to_console_job_cache() -> None:
+    """
+    Logs to console the statistics of the job cache
+    :return: None
+    """
+    if CACHE_ACTIVE is True:
+        log_to_console('JOB CACHE HITS        : {}'.format(HITS))
+        log_to_console('JOB CACHE MISSES      : {}'.format(MISSES))
+        log_to_console('JOB CACHE HIT RATE[%] : {:.2f}'.format(100 * HITS / max(1, HITS + MISSES)))
+        log_to_console('JOB CACHE EVICTIONS   : {}'.format(EVICTIONS))
+        log_to_console('JOB CACHE SIZE[bytes] : {}'.format(CACHE_BYTES))
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,271 @@
+import ast
+import collections
+import glob
+import importlib
+import os
+import pickle
+import re
+
+from Application.Frame.global_variables import global_var_handler
+from Application.Frame.port import PORT_TYPES
+from Utils.log_handler import log_to_console, log_error_to_console
+
+"""
+Module handles the job plan of the APPL block.
+The functions of the jobs are found through an explicit table of job packages and the port sizes and types are resolved without eval.
+The whole plan is checked before the first frame: missing modules and functions, unknown port sizes and types, ports created by
+several jobs with other sizes or types and input ports that no job creates. Jobs with errors are not in the plan and neither are
+the jobs that use their ports.
+The sorted job list of the json file can be kept in a binary plan file that is read again by the next runs with the same jobs
+and configuration.
+"""
+
+# job packages from the json file and the python packages where the job modules are
+JOB_PACKAGES = {'Jobs': 'Application.Jobs'}
+# job modules that were imported, by package and module name
+job_modules = dict()
+
+# description of a port created by a job. Same positions as the tuples of the port list of the json file
+PortSpec = collections.namedtuple('PortSpec', ['name', 'size', 'port_type', 'is_image'])
+# description of a job. Same positions as FIELD_POSITION in parseJsonFile module
+JobSpec = collections.namedtuple('JobSpec', ['name', 'input_ports', 'init_function', 'main_function', 'output_ports', 'init_func_param',
+                                             'main_func_param', 'max_wave'])
+
+IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+# version of the plan files, plan files of other versions are not used
+PLAN_VERSION = 3
+
+
+def register_job_package(name: str, package: str) -> None:
+    """
+    Adds a package with job modules to the table of job packages
+    :param name: name of package used in the json file
+    :param package: python package where the job modules are
+    :return: None
+    """
+    JOB_PACKAGES[name] = package
+
+
+def get_job_function(package: str, module: str, function: str):
+    """
+    :param package: name of job package from json file
+    :param module: name of job module
+    :param function: name of function
+    :return: function from the job module
+    """
+    if package not in JOB_PACKAGES:
+        raise LookupError('unknown job package: {}'.format(package))
+
+    for name in (module, function):
+        if not isinstance(name, str) or IDENTIFIER.match(name) is None:
+            raise LookupError('not a python name: {}'.format(name))
+
+    key = (package, module)
+    if key not in job_modules:
+        job_modules[key] = importlib.import_module(JOB_PACKAGES[package] + '.' + module)
+
+    value = getattr(job_modules[key], function, None)
+    if not callable(value):
+        raise LookupError('function {} not in job module {}'.format(function, module))
+
+    return value
+
+
+def get_port_size(value):
+    """
+    Resolves the size of a port from the json file: number, name of size of pyramid level or text of tuple
+    :param value: size from json file
+    :return: int or tuple of ints
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+
+    if isinstance(value, (list, tuple)):
+        size = tuple(value)
+    elif isinstance(value, str) and value.isdigit():
+        return int(value)
+    elif isinstance(value, str) and 'SIZE' in value:
+        if IDENTIFIER.match(value) is None or not hasattr(global_var_handler, value):
+            raise LookupError('unknown port size: {}'.format(value))
+        return getattr(global_var_handler, value)
+    else:
+        try:
+            size = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            raise LookupError('unknown port size: {}'.format(value))
+
+    if isinstance(size, int) and not isinstance(size, bool):
+        return size
+    if isinstance(size, tuple) and all(isinstance(el, int) and not isinstance(el, bool) for el in size):
+        return size
+
+    raise LookupError('unknown port size: {}'.format(value))
+
+
+def get_parameters(values: list) -> list:
+    """
+    :param values: parameters from json file
+    :return: list of parameters, None if there are none
+    """
+    if values is None:
+        return None
+
+    return [el['param'] for el in values]
+
+
+def write_plan_file(file: str, plan: dict) -> None:
+    """
+    Writes a plan file. The file is written under another name and renamed so a run never reads a partial file.
+    :param file: location of plan file
+    :param plan: job list of the json file, ports and configuration of the plan
+    :return: None
+    """
+    with open(file + '.tmp', 'wb') as output:
+        pickle.dump(dict(plan, version=PLAN_VERSION), output, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.replace(file + '.tmp', file)
+
+
+def remove_plan_files(pattern: str, keep: str) -> None:
+    """
+    Removes the plan files of job lists that are not used anymore
+    :param pattern: glob pattern of the plan files
+    :param keep: location of the plan file that is kept
+    :return: None
+    """
+    for file in glob.glob(pattern):
+        if os.path.abspath(file) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(file)
+        except OSError as error:
+            log_error_to_console('JOB PLAN FILE NOT REMOVED: {}'.format(file), str(error))
+
+
+def read_plan_file(file: str) -> dict:
+    """
+    :param file: location of plan file
+    :return: plan written by write_plan_file, None if the file doesn't exist, can't be read or has another version
+    """
+    try:
+        with open(file, 'rb') as data:
+            plan = pickle.load(data)
+    except FileNotFoundError:
+        return None
+    except BaseException as error:
+        log_error_to_console('JOB PLAN FILE NOT READ: {}'.format(file), str(error))
+        return None
+
+    if not isinstance(plan, dict) or plan.get('version') != PLAN_VERSION:
+        return None
+
+    return plan
+
+
+class JobPlan:
+    """
+    Class that holds the checked jobs of the application
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor of job plan. Jobs are added with add_job and checked with validate.
+        """
+        self.jobs = []
+        # name of job -> list of errors
+        self.errors = collections.OrderedDict()
+        # name of port -> (size, type, name of job) of the first job that creates it
+        self.ports = dict()
+
+    def add_error(self, job: str, error: str) -> None:
+        """
+        :param job: name of job
+        :param error: description of error
+        :return: None
+        """
+        errors = self.errors.setdefault(job, [])
+        if error not in errors:
+            errors.append(error)
+
+    def add_job(self, element: dict) -> None:
+        """
+        Resolves the functions and ports of a job from the json file and adds it to the plan
+        :param element: job from json file
+        :return: None
+        """
+        name = element.get('name')
+        functions = []
+
+        for field in ('init function', 'main function'):
+            try:
+                functions.append(get_job_function(element.get('package'), element.get('module'), element.get(field)))
+            except (LookupError, ImportError) as error:
+                self.add_error(name, str(error))
+                functions.append(None)
+
+        output_ports = []
+        for port in element.get('output ports') or []:
+            try:
+                size = get_port_size(port['port size'])
+            except LookupError as error:
+                self.add_error(name, str(error))
+                continue
+
+            if port['port type'] not in PORT_TYPES:
+                self.add_error(name, 'unknown type {} of port {}'.format(port['port type'], port['port name']))
+                continue
+
+            output_ports.append(PortSpec(port['port name'], size, port['port type'], port['is image']))
+
+        input_ports = [el['port name'] for el in element['input ports']] if element.get('input ports') is not None else None
+
+        self.jobs.append(JobSpec(name, input_ports, functions[0], functions[1], output_ports if element.get('output ports') is not None
+                                 else None, get_parameters(element.get('init function parameters')),
+                                 get_parameters(element.get('main function parameters')), element.get('max wave', 0)))
+
+    def validate(self) -> None:
+        """
+        Checks the ports of the jobs and removes from the plan the jobs with errors.
+        The check is repeated until no job is removed, so the jobs that use the ports of removed jobs are removed too.
+        :return: None
+        """
+        nr_jobs = len(self.jobs)
+        nr_errors = None
+
+        while nr_errors != len(self.errors):
+            nr_errors = len(self.errors)
+            # name of port -> name of removed job that creates it
+            removed_ports = dict()
+            for job in self.jobs:
+                if job.name in self.errors:
+                    removed_ports.update({port.name: job.name for port in job.output_ports or []})
+
+            self.jobs = [job for job in self.jobs if job.name not in self.errors]
+            self.ports = dict()
+
+            for job in self.jobs:
+                for port in job.output_ports or []:
+                    size, port_type, creator = self.ports.setdefault(port.name, (port.size, port.port_type, job.name))
+                    if size != port.size or PORT_TYPES[port_type] != PORT_TYPES[port.port_type]:
+                        self.add_error(job.name, 'port {} is created by job {} with size {} and type {}, here with size {} and type {}'.format(
+                            port.name, creator, size, port_type, port.size, port.port_type))
+
+            for job in self.jobs:
+                for port in job.input_ports or []:
+                    if port in self.ports:
+                        continue
+                    if port in removed_ports:
+                        self.add_error(job.name, 'input port {} is created by job {} that is removed'.format(port, removed_ports[port]))
+                    else:
+                        self.add_error(job.name, 'input port {} is not created by any job'.format(port))
+
+        for job, errors in self.errors.items():
+            for error in errors:
+                log_error_to_console('JOB PLAN NOK: {}'.format(job), error)
+
+        log_to_console('JOB PLAN: {jobs} JOBS CHECKED, {errors} JOBS WITH ERRORS REMOVED'.format(
+            jobs=nr_jobs, errors=len(self.errors)))
+
+
+if __name__ == "__main__":
+    pass
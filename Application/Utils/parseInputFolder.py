@@ -1,3 +1,5 @@
+import hashlib
+import json
 import os
 # noinspection PyPackageRequirements
 import cv2
@@ -6,6 +8,7 @@ import config_main
 
 from Utils.log_handler import log_to_console, log_error_to_console
 from Application.Frame.global_variables import global_var_handler
+from Application.Utils.image_probe import probe_image
 
 """
 Module handles the input folder functionalities for the APPL block
@@ -39,7 +42,11 @@ def get_video_capture() -> None:
     :return: None
     """
     global_var_handler.VIDEO = cv2.VideoCapture(config_main.APPL_INPUT_VIDEO)
-    global_var_handler.NR_PICTURES = int(cv2.VideoCapture.get(global_var_handler.VIDEO, cv2.CAP_PROP_FRAME_COUNT))
+    nr_frames = int(cv2.VideoCapture.get(global_var_handler.VIDEO, cv2.CAP_PROP_FRAME_COUNT))
+    if config_main.APPL_VIDEO_START_FRAME != 0:
+        global_var_handler.VIDEO.set(cv2.CAP_PROP_POS_FRAMES, config_main.APPL_VIDEO_START_FRAME)
+    # frames that are processed from the start frame with the frame step
+    global_var_handler.NR_PICTURES = max(0, -(-(nr_frames - config_main.APPL_VIDEO_START_FRAME) // config_main.APPL_VIDEO_FRAME_STEP))
     global_var_handler.WIDTH_L0 = int(cv2.VideoCapture.get(global_var_handler.VIDEO, cv2.CAP_PROP_FRAME_WIDTH))
     global_var_handler.HEIGHT_L0 = int(cv2.VideoCapture.get(global_var_handler.VIDEO, cv2.CAP_PROP_FRAME_HEIGHT))
     global_var_handler.recalculate_pyramid_level_values()
@@ -78,6 +85,89 @@ def clear_input_img_dir():
     config_main.APPL_INPUT_IMG_DIR.clear()
 
 
+def get_manifest_file(directory: str) -> str:
+    """
+    The manifest files are kept in APPL_INPUT_MANIFEST_LOCATION so the input folders are not changed.
+    :param directory: input directory
+    :return: location of the manifest file of the directory
+    """
+    directory = os.path.normpath(os.path.abspath(directory))
+    key = hashlib.blake2b(directory.encode(), digest_size=8).hexdigest()
+
+    return os.path.join(config_main.APPL_INPUT_MANIFEST_LOCATION, os.path.basename(directory) + '_' + key + '.manifest.json')
+
+
+def get_image_manifest(directory: str) -> dict:
+    """
+    Gives the size and the state of every file in the directory.
+    The sizes are read from the headers of the images only for the files that changed since the manifest file was written.
+    :param directory: input directory
+    :return: dictionary of file path relative to directory and dictionary with mtime, size, width, height and channels.
+             width, height and channels are None if the format of the file is not known.
+    """
+    manifest_file = get_manifest_file(directory)
+    old_files = dict()
+    files = dict()
+
+    if config_main.APPL_INPUT_MANIFEST is True and os.path.exists(manifest_file):
+        try:
+            with open(manifest_file, 'r') as file:
+                old_files = json.load(file)['files']
+        except BaseException as error:
+            log_error_to_console('INPUT MANIFEST NOK TO READ: ' + manifest_file, str(error))
+
+    for dir_name, dir_names, file_names in os.walk(directory):
+        for filename in file_names:
+            path = os.path.join(dir_name, filename)
+            name = os.path.relpath(path, directory)
+            stat = os.stat(path)
+            entry = old_files.get(name)
+
+            if entry is None or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                size = probe_image(path)
+                width, height, channels = size if size is not None else (None, None, None)
+                entry = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'width': width, 'height': height, 'channels': channels}
+
+            files[name] = entry
+
+    if config_main.APPL_INPUT_MANIFEST is True and files != old_files:
+        try:
+            os.makedirs(config_main.APPL_INPUT_MANIFEST_LOCATION, exist_ok=True)
+            temporary_file = manifest_file + '.{}.tmp'.format(os.getpid())
+            with open(temporary_file, 'w') as file:
+                json.dump({'directory': os.path.normpath(directory), 'files': files}, file)
+            os.replace(temporary_file, manifest_file)
+        except BaseException as error:
+            log_error_to_console('INPUT MANIFEST NOK TO SAVE: ' + manifest_file, str(error))
+
+    return files
+
+
+def get_image_size(directory: str, image: str, manifest: dict = None) -> tuple:
+    """
+    Gives the size of an image from the manifest or, without manifest, from the header of the image.
+    Images with formats that are not known are decoded.
+    :param directory: input directory
+    :param image: name of image
+    :param manifest: manifest of directory. None to read only this image
+    :return: height, width. None if the image can't be read
+    """
+    if manifest is not None:
+        entry = manifest.get(image)
+        if entry is not None and entry['width'] is not None:
+            return entry['height'], entry['width']
+    else:
+        size = probe_image(os.path.join(directory, image))
+        if size is not None:
+            return size[1], size[0]
+
+    img = cv2.imread(os.path.join(directory, image))
+    if img is None:
+        return None
+
+    return img.shape[:2]
+
+
 def find_big_picture() -> None:
     """
     Searches the biggest picture from the input file
@@ -85,10 +175,12 @@ def find_big_picture() -> None:
     :return: None
     """
     global MAX_IMAGE_WIDTH, MAX_IMAGE_HEIGHT
+    directory = os.path.join(os.getcwd(), config_main.APPL_INPUT_DIR)
+    manifest = get_image_manifest(directory)
+
     for image in config_main.APPL_INPUT_IMG_DIR:
         try:
-            img = cv2.imread(os.path.join(os.getcwd(), config_main.APPL_INPUT_DIR, image))
-            height, width = img.shape[:2]
+            height, width = get_image_size(directory, image, manifest)
 
             if MAX_IMAGE_HEIGHT < height:
                 MAX_IMAGE_HEIGHT = height
@@ -110,9 +202,10 @@ def get_picture_size_and_number(is_txt=False) -> None:
 
     if len(config_main.APPL_INPUT_IMG_DIR) != 0:
         if is_txt is False:
-            img = cv2.imread(os.path.join(os.getcwd(), config_main.APPL_INPUT_DIR, config_main.APPL_INPUT_IMG_DIR[0]))
-            if img is not None:
-                height, width = img.shape[:2]
+            directory = os.path.join(os.getcwd(), config_main.APPL_INPUT_DIR)
+            size = get_image_size(directory, config_main.APPL_INPUT_IMG_DIR[0])
+            if size is not None:
+                height, width = size
                 global_var_handler.WIDTH_L0 = width
                 global_var_handler.HEIGHT_L0 = height
                 global_var_handler.recalculate_pyramid_level_values()
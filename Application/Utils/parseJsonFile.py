@@ -1,10 +1,6 @@
 import json
-# Do not delete used indirectly
-# noinspection PyUnresolvedReferences
-import os
-# noinspection PyUnresolvedReferences
-import Application.Jobs
-from Application.Frame.global_variables import global_var_handler
+
+from Application.Utils.job_plan import JobPlan, read_plan_file
 from Utils.log_handler import log_error_to_console
 
 """
@@ -13,8 +9,6 @@ Module handles the json file parsing for the APPL block
 
 json_fields = []
 
-check_port_size = lambda value: int(value) if value.isdigit() is True else global_var_handler.get_size_equivalence(value)
-
 
 class FIELD_POSITION:
     """
@@ -27,55 +21,17 @@ class FIELD_POSITION:
     OUTPUT_PORTS = 4
     MAIN_FUNC_PARAM = 6
     INIT_FUNC_PARAM = 5
-    NR_FIELDS = 7
-
-
-def convert_json_to_job(element: dict) -> list:
-    """
-    Converts information from json file regarding a job to param necessary to construct a job
-    :param element: job from json file
-    :return: list of job details for constructor
-    """
-    job_entry = list()
-
-    # get job name
-    job_entry.append(element['name'])
-    # get jobs input ports
-    if element['input ports'] is not None:
-        job_entry.append([elm['port name'] for elm in element['input ports']])
-    else:
-        job_entry.append(None)
-    # get init function
-    job_entry.append(eval('Application.' + element['package'] + '.' + element['module'] + '.' + element['init function']))
-    # get main function
-    job_entry.append(eval('Application.' + element['package'] + '.' + element['module'] + '.' + element['main function']))
-    # get output ports
-    if element['output ports'] is not None:
-        job_entry.append(
-            [(elm['port name'], check_port_size(elm['port size']), elm['port type'], elm['is image']) for elm in element['output ports']])
-    else:
-        job_entry.append(None)
-    # get init func param
-    if element['init function parameters'] is not None:
-        job_entry.append([(elm['param']) for elm in element['init function parameters']])
-    else:
-        job_entry.append(None)
-    # get main func param
-    if element['main function parameters'] is not None:
-        job_entry.append([(elm['param']) for elm in element['main function parameters']])
-    else:
-        job_entry.append(None)
-
-    return job_entry
+    MAX_WAVE = 7
+    NR_FIELDS = 8
 
 
 def get_json_data(file: str) -> list:
     """
     Retrieving data from configuration json file
     :param file: json file
-    :return: a list of jobs
+    :return: a list of checked jobs, see JobSpec in job_plan module
     """
-    job_list = []
+    plan = JobPlan()
 
     try:
         data = json.load(open(file))
@@ -89,23 +45,47 @@ def get_json_data(file: str) -> list:
         # create list of jobs
         for element in data:
             if element['active'] is not False:
-                job_list.append(tuple(convert_json_to_job(element)))
+                plan.add_job(element)
 
         json_fields.clear()
+        plan.validate()
     except BaseException as error:
         log_error_to_console("JSON JOB CONFIG FIELDS NOK: ", str(error))
-        pass
+        return []
+
+    return plan.jobs
+
+
+def get_plan_file_data(file: str) -> list:
+    """
+    Retrieving the job list from a plan file written by create_config_file
+    :param file: plan file
+    :return: a list of checked jobs, see JobSpec in job_plan module
+    """
+    data = read_plan_file(file)
+
+    if data is None:
+        log_error_to_console('JOB PLAN FILE NOK: ', str(file))
+        return []
+
+    plan = JobPlan()
+    for element in data['jobs']:
+        if element['active'] is not False:
+            plan.add_job(element)
+    plan.validate()
 
-    return job_list
+    return plan.jobs
 
 
 def get_jobs(json_file: str = None) -> list:
     """
     Get's the json file and parses it.
-    :param json_file: location of json file
+    :param json_file: location of json file or plan file
     :return: list of jobs information for constructing them
     """
     try:
+        if json_file.endswith('.plan'):
+            return get_plan_file_data(file=json_file)
         # noinspection PyTypeChecker
         return get_json_data(file=json_file)
     except BaseException as error:
@@ -0,0 +1,116 @@
+import collections
+import itertools
+import json
+import os
+import threading
+from time import perf_counter
+
+import config_main
+
+"""
+Module handles the tracer of the APPL block.
+Events are kept in a ring buffer in memory and are saved at the end of the run as Chrome Trace Event json that can be opened with
+Perfetto or about:tracing.
+"""
+
+# finished events, the oldest are dropped when the buffer is full
+events = collections.deque(maxlen=1)
+# number of events recorded in the run
+event_counter = itertools.count()
+# function that gives the frame processed by the current thread
+frame_getter = None
+# if events are recorded
+TRACE_ACTIVE = False
+
+
+def init_tracer(get_frame) -> None:
+    """
+    Clears the events and starts the tracer if APPL_TRACE_FILE is set
+    :param get_frame: function that gives the frame processed by the current thread
+    :return: None
+    """
+    global events, event_counter, frame_getter, TRACE_ACTIVE
+
+    events = collections.deque(maxlen=config_main.APPL_TRACE_BUFFER_EVENTS)
+    event_counter = itertools.count()
+    frame_getter = get_frame
+    TRACE_ACTIVE = config_main.APPL_TRACE_FILE is not None
+
+
+def trace_begin():
+    """
+    :return: start time of an event, None if the tracer is not active
+    """
+    if TRACE_ACTIVE is True:
+        return perf_counter()
+
+    return None
+
+
+def trace_end(begin, name: str, category: str, args: dict = None) -> None:
+    """
+    Records an event that started at begin and ends now
+    :param begin: value from trace_begin
+    :param name: name of event
+    :param category: category of event
+    :param args: extra data of event
+    :return: None
+    """
+    if begin is not None:
+        end = perf_counter()
+        thread = threading.current_thread()
+        events.append((name, category, begin, end - begin, os.getpid(), thread.ident, thread.name, frame_getter(), args))
+        next(event_counter)
+
+
+def get_trace_events() -> list:
+    """
+    :return: list of events in Chrome Trace Event format. Wave is the port slot used by the frame.
+    """
+    nr_waves = config_main.APPL_NR_WAVES + config_main.APPL_PIPELINE_DEPTH - 1
+    trace_events = []
+    threads = dict()
+
+    for name, category, begin, duration, pid, tid, thread_name, frame, args in list(events):
+        event_args = {'frame': frame, 'wave': frame % nr_waves}
+        if args is not None:
+            event_args.update(args)
+        trace_events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': begin * 1e6, 'dur': duration * 1e6, 'pid': pid,
+                             'tid': tid, 'args': event_args})
+        threads[(pid, tid)] = thread_name
+
+    for (pid, tid), thread_name in threads.items():
+        trace_events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread_name}})
+
+    return trace_events
+
+
+def save_trace(file: str = None, other_files: list = ()) -> None:
+    """
+    Saves the recorded events in a json file
+    :param file: location of file. None for APPL_TRACE_FILE
+    :param other_files: trace files of worker processes that are added to the file and deleted
+    :return: None
+    """
+    if TRACE_ACTIVE is False:
+        return
+
+    if file is None:
+        file = config_main.APPL_TRACE_FILE
+
+    trace_events = get_trace_events()
+    dropped_events = next(event_counter) - len(events)
+
+    for other_file in other_files:
+        with open(other_file, 'r') as trace_file:
+            other_trace = json.load(trace_file)
+        trace_events.extend(other_trace['traceEvents'])
+        dropped_events += other_trace['otherData']['dropped events']
+        os.remove(other_file)
+
+    with open(file, 'w') as trace_file:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms', 'otherData': {'dropped events': dropped_events}}, trace_file)
+
+
+if __name__ == "__main__":
+    pass
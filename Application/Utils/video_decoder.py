@@ -0,0 +1,289 @@
+import collections
+import threading
+
+# noinspection PyPackageRequirements
+import cv2
+import numpy as np
+
+import config_main
+from Application.Frame.global_variables import global_var_handler
+from Application.Utils.tracer import trace_begin, trace_end
+from Utils.log_handler import log_to_console
+
+"""
+Module handles the decoding of video and camera frames for the APPL block.
+When APPL_VIDEO_RING_SIZE is not 0 the frames are decoded by a thread into a ring of preallocated arrays while the jobs of the
+current frame run. The retrieval jobs take the decoded frames in order.
+If the ring is full the thread waits for a free array or, with APPL_VIDEO_DROP_FRAMES, drops the oldest decoded frame.
+By default frames are dropped only for camera input.
+With APPL_VIDEO_FRAME_STEP every n-th frame is decoded, the frames between are grabbed without decoding.
+"""
+
+# preallocated arrays of the ring
+ring = []
+# arrays of the ring with decoded frames as (index of array, success), oldest first
+decoded_slots = collections.deque()
+# arrays of the ring that can be decoded into
+free_slots = collections.deque()
+decoder_condition = threading.Condition()
+decoder_thread = None
+DECODER_RUNNING = False
+# frame of the video where the decoder continues, None to continue with the next frame
+SEEK_FRAME = None
+# number of seeks, frames decoded before a seek are dropped
+SEEK_COUNT = 0
+FRAMES_DECODED = 0
+FRAMES_DROPPED = 0
+FRAMES_SKIPPED = 0
+FRAMES_TAKEN = 0
+QUEUE_DEPTH_SUM = 0
+QUEUE_DEPTH_MAX = 0
+
+
+def is_drop_frames() -> bool:
+    """
+    :return: if the decoder drops the oldest decoded frame when the ring is full
+    """
+    if config_main.APPL_VIDEO_DROP_FRAMES is None:
+        return config_main.APPL_INPUT == config_main.CAMERA_INPUT
+
+    return config_main.APPL_VIDEO_DROP_FRAMES
+
+
+def decode_frame(img: np.ndarray) -> tuple:
+    """
+    Decodes the next frame of the video and grabs the frames skipped by APPL_VIDEO_FRAME_STEP
+    :param img: array where the frame is decoded
+    :return: success, decoded frame. The frame is a new array if the size of the frame is not the size of img
+    """
+    global FRAMES_DECODED, FRAMES_SKIPPED
+
+    begin = trace_begin()
+    # noinspection PyUnresolvedReferences
+    success, img = global_var_handler.VIDEO.read(img)
+
+    for _ in range(config_main.APPL_VIDEO_FRAME_STEP - 1):
+        # noinspection PyUnresolvedReferences
+        global_var_handler.VIDEO.grab()
+        FRAMES_SKIPPED += 1
+
+    if success is True:
+        FRAMES_DECODED += 1
+    trace_end(begin, 'decode video frame', 'io', {'queue depth': len(decoded_slots)})
+
+    return success, img
+
+
+def run_video_decoder() -> None:
+    """
+    Decoder thread. Decodes frames into the free arrays of the ring until the decoder is stopped or the video ends.
+    If decoding fails the decoder stops so the jobs waiting for a frame do not wait forever.
+    :return: None
+    """
+    global SEEK_FRAME, FRAMES_DROPPED, DECODER_RUNNING
+
+    drop_frames = is_drop_frames()
+
+    try:
+        while True:
+            with decoder_condition:
+                while DECODER_RUNNING is True and len(free_slots) == 0 and (drop_frames is False or len(decoded_slots) == 0):
+                    decoder_condition.wait()
+
+                if DECODER_RUNNING is False:
+                    return
+
+                if SEEK_FRAME is not None:
+                    # noinspection PyUnresolvedReferences
+                    global_var_handler.VIDEO.set(cv2.CAP_PROP_POS_FRAMES, SEEK_FRAME)
+                    SEEK_FRAME = None
+
+                if len(free_slots) != 0:
+                    slot = free_slots.popleft()
+                else:
+                    slot, success = decoded_slots.popleft()
+                    if success is True:
+                        FRAMES_DROPPED += 1
+                seek_count = SEEK_COUNT
+
+            success, img = decode_frame(ring[slot])
+
+            with decoder_condition:
+                if seek_count != SEEK_COUNT:
+                    free_slots.append(slot)
+                    continue
+
+                if success is True:
+                    ring[slot] = img
+                decoded_slots.append((slot, success))
+                if success is False and config_main.APPL_INPUT == config_main.VIDEO_INPUT:
+                    # end of video
+                    DECODER_RUNNING = False
+                decoder_condition.notify_all()
+    finally:
+        with decoder_condition:
+            DECODER_RUNNING = False
+            decoder_condition.notify_all()
+
+
+def start_video_decoder() -> None:
+    """
+    Allocates the ring and starts the decoder thread
+    :return: None
+    """
+    # noinspection PyUnresolvedReferences
+    shape = (global_var_handler.HEIGHT_L0, global_var_handler.WIDTH_L0, 3)
+    ring[:] = [np.zeros(shape, dtype=np.uint8) for _ in range(config_main.APPL_VIDEO_RING_SIZE)]
+    decoded_slots.clear()
+    free_slots.clear()
+    free_slots.extend(range(config_main.APPL_VIDEO_RING_SIZE))
+
+    start_decoder_thread()
+
+
+def start_decoder_thread() -> None:
+    """
+    Starts the decoder thread on the allocated ring
+    :return: None
+    """
+    global decoder_thread, DECODER_RUNNING
+
+    DECODER_RUNNING = True
+    decoder_thread = threading.Thread(target=run_video_decoder, name='video decoder', daemon=True)
+    decoder_thread.start()
+
+
+def read_video_frame(arr: np.ndarray) -> bool:
+    """
+    Gives the next frame of the video or camera. Without decoder thread the frame is decoded now.
+    :param arr: array where the frame is copied
+    :return: if there was a frame
+    """
+    global FRAMES_TAKEN, QUEUE_DEPTH_SUM, QUEUE_DEPTH_MAX
+
+    if config_main.APPL_VIDEO_RING_SIZE == 0:
+        success, img = decode_frame(arr)
+        if success is True and img is not arr:
+            arr[:] = img
+        return success
+
+    with decoder_condition:
+        if decoder_thread is None:
+            start_video_decoder()
+
+        while len(decoded_slots) == 0 and DECODER_RUNNING is True:
+            decoder_condition.wait()
+
+        if len(decoded_slots) == 0:
+            return False
+
+        FRAMES_TAKEN += 1
+        QUEUE_DEPTH_SUM += len(decoded_slots)
+        QUEUE_DEPTH_MAX = max(QUEUE_DEPTH_MAX, len(decoded_slots))
+        slot, success = decoded_slots.popleft()
+
+    try:
+        if success is True:
+            arr[:] = ring[slot]
+    finally:
+        with decoder_condition:
+            free_slots.append(slot)
+            decoder_condition.notify_all()
+
+    return success
+
+
+def drop_video_frames(count: int) -> None:
+    """
+    Drops the oldest frames that wait to be taken, the newest frame is kept. Without decoder thread the next frames are grabbed.
+    Used when a frame took so long that the camera frames that waited are stale.
+    :param count: maximum number of frames to drop
+    :return: None
+    """
+    global FRAMES_DROPPED
+
+    if decoder_thread is None:
+        for _ in range(count):
+            # noinspection PyUnresolvedReferences
+            if global_var_handler.VIDEO.grab() is True:
+                FRAMES_DROPPED += 1
+        return
+
+    with decoder_condition:
+        while count > 0 and len(decoded_slots) > 1:
+            slot, success = decoded_slots.popleft()
+            free_slots.append(slot)
+            if success is True:
+                FRAMES_DROPPED += 1
+            count -= 1
+        decoder_condition.notify_all()
+
+
+def seek_video(frame: int) -> None:
+    """
+    Continues the video from a frame. The frames that are decoded and not taken are dropped.
+    :param frame: frame of the video
+    :return: None
+    """
+    global SEEK_FRAME, SEEK_COUNT
+
+    if decoder_thread is None:
+        # noinspection PyUnresolvedReferences
+        global_var_handler.VIDEO.set(cv2.CAP_PROP_POS_FRAMES, frame)
+        return
+
+    with decoder_condition:
+        SEEK_FRAME = frame
+        SEEK_COUNT += 1
+        while len(decoded_slots) != 0:
+            free_slots.append(decoded_slots.popleft()[0])
+        video_ended = DECODER_RUNNING is False
+        decoder_condition.notify_all()
+
+    if video_ended is True:
+        decoder_thread.join()
+        start_decoder_thread()
+
+
+def get_video_metrics() -> dict:
+    """
+    :return: number of frames decoded, dropped because the ring was full or they were stale, skipped by APPL_VIDEO_FRAME_STEP, average and maximum
+             number of decoded frames waiting when a frame was taken
+    """
+    return {'decoded': FRAMES_DECODED, 'dropped': FRAMES_DROPPED, 'skipped': FRAMES_SKIPPED,
+            'average queue depth': QUEUE_DEPTH_SUM / FRAMES_TAKEN if FRAMES_TAKEN != 0 else 0.0, 'max queue depth': QUEUE_DEPTH_MAX}
+
+
+def stop_video_decoder() -> None:
+    """
+    Stops the decoder thread and logs the metrics of the decoder.
+    The state of the decoder is reset even if the run ended with an exception, so the next run starts a new decoder.
+    :return: None
+    """
+    global decoder_thread, DECODER_RUNNING, SEEK_FRAME
+    global FRAMES_DECODED, FRAMES_DROPPED, FRAMES_SKIPPED, FRAMES_TAKEN, QUEUE_DEPTH_SUM, QUEUE_DEPTH_MAX
+
+    try:
+        with decoder_condition:
+            DECODER_RUNNING = False
+            decoder_condition.notify_all()
+
+        if decoder_thread is not None:
+            decoder_thread.join()
+
+        metrics = get_video_metrics()
+        if metrics['decoded'] != 0:
+            log_to_console('VIDEO FRAMES DECODED: {decoded} DROPPED: {dropped} SKIPPED: {skipped}'.format(**metrics))
+            log_to_console('VIDEO DECODED FRAMES WAITING AVERAGE: {average:.2f} MAX: {max}'.format(
+                average=metrics['average queue depth'], max=metrics['max queue depth']))
+    finally:
+        decoder_thread = None
+        ring.clear()
+        decoded_slots.clear()
+        free_slots.clear()
+        SEEK_FRAME = None
+        FRAMES_DECODED = FRAMES_DROPPED = FRAMES_SKIPPED = FRAMES_TAKEN = QUEUE_DEPTH_SUM = QUEUE_DEPTH_MAX = 0
+
+
+if __name__ == "__main__":
+    pass
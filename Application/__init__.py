@@ -8,6 +8,23 @@ from Application.Config.service_job_create import set_input_image_from_txt_folde
 from Application.Config.service_job_create import set_output_image_folder
 from Application.Config.service_job_create import set_input_video
 from Application.Config.service_job_create import set_number_waves
+from Application.Config.service_job_create import set_number_workers
+from Application.Config.service_job_create import set_pipeline_depth
+from Application.Config.service_job_create import set_number_processes
+from Application.Config.service_job_create import set_port_shared_memory
+from Application.Config.service_job_create import set_port_aliasing
+from Application.Config.service_job_create import set_port_zero_on_reset
+from Application.Config.service_job_create import set_dead_job_elimination
+from Application.Config.service_job_create import set_job_cache
+from Application.Config.service_job_create import set_trace
+from Application.Config.service_job_create import set_logging
+from Application.Config.service_job_create import set_image_prefetch
+from Application.Config.service_job_create import set_video_decoder
+from Application.Config.service_job_create import set_frame_deadline
+from Application.Config.service_job_create import set_image_writer
+from Application.Config.service_job_create import set_save_array_store
+from Application.Config.service_job_create import set_plan_cache
+from Application.Config.service_job_create import set_checkpoint
 from Application.Config.service_job_create import set_input_camera_video
 from Application.Config.service_job_create import configure_save_pictures
 from Application.Config.service_job_create import configure_show_pictures
@@ -25,6 +42,7 @@ from Application.Config.job_create import do_get_image_from_txt_job
 from Application.Config.job_create import do_get_satellite_image_job
 from Application.Config.job_create import do_get_video_job
 from Application.Config.job_create import do_get_video_capture_job
+from Application.Config.job_create import do_tact_simulation_job
 ############################################################################################################################################
 # Pyramid level processing jobs
 ############################################################################################################################################
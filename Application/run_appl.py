@@ -1,34 +1,208 @@
+import multiprocessing
+import os
+
 import config_main
 
 from Application.Schedulers.simple_RR import run_rr
-from Application.Frame.transferJobPorts import prepare_ports_new_wave, log_to_console_exchange_ports
-from Utils.log_handler import log_to_console, log_setup_info_to_console
-from Application.Utils.TimeLogger import Timer
+from Application.Schedulers.parallel_DAG import init_dag, run_dag, terminate_dag
+from Application.Schedulers.pipeline_DAG import run_pipeline
+from Application.Schedulers.frame_deadline import start_frame_deadline, end_frame_deadline, log_to_console_frame_deadline
+from Application.Frame.transferJobPorts import prepare_ports_new_wave, log_to_console_exchange_ports, create_ports_dict, portsDict
+from Utils.log_handler import log_to_console, log_setup_info_to_console, redirect_log_files, flush_files, add_kpi_tables, close_files, \
+    end_kpi_table
+from Application.Utils.TimeLogger import Timer, save_time_statistics
+from Application.Utils.tracer import init_tracer, save_trace
+from Application.Utils.image_prefetch import stop_prefetch
+from Application.Utils.image_writer import stop_image_writer, set_store_writer, clear_array_stores
+from Application.Utils.video_decoder import stop_video_decoder
 from Application.Utils.parseInputFolder import get_picture_size_and_number, get_video_capture, get_camera_capture, release_video, \
     clear_input_img_dir
 from Application.Utils.parseJsonFile import get_jobs
+from Application.Utils.checkpoint import init_checkpoint, stop_checkpoint, save_checkpoint, resume_checkpoint, remove_checkpoint
 from Application.Utils.image_handler import show_pictures, save_pict_to_file
-from Application.Frame.job_handler import job_creation, init_jobs, log_to_console_avg_time, terminate_jobs
+from Application.Frame.port_pool import log_to_console_port_memory, clear_pool
+from Application.Frame.port_planner import plan_port_memory
+from Application.Utils.job_cache import init_job_cache, log_to_console_job_cache
+from Application.Frame.job_handler import job_creation, init_jobs, log_to_console_avg_time, terminate_jobs, remove_dead_jobs, \
+    log_to_console_job_time, log_to_console_skipped_jobs
 from Application.Frame.global_variables import global_var_handler
 from Application.Jobs.get_image import get_used_size_values
 
 
+def run_frames(job_list: list, timer_wave: Timer, timer_post_processing: Timer) -> None:
+    """
+    Runs the jobs for the frames from FRAME to NR_PICTURES one frame after another
+    :param job_list: list of jobs
+    :param timer_wave: timer for the jobs of a frame
+    :param timer_post_processing: timer for showing and saving the ports of a frame
+    :return: None
+    """
+    # noinspection PyUnresolvedReferences,PyUnresolvedReferences
+    while global_var_handler.FRAME < global_var_handler.NR_PICTURES:
+        timer_wave.start_cycle_timer()
+        # noinspection PyUnresolvedReferences
+        log_to_console('FRAME {}'.format(global_var_handler.FRAME))
+        start_frame_deadline()
+        if config_main.APPL_NR_WORKERS > 1:
+            run_dag(jobs=job_list)
+        else:
+            run_rr(jobs=job_list)
+        end_frame_deadline()
+        timer_wave.end_cycle_timer()
+        timer_wave.cycle_updater()
+        timer_post_processing.start_cycle_timer()
+        show_pictures()
+        save_pict_to_file()
+        timer_post_processing.end_cycle_timer()
+        timer_post_processing.cycle_updater()
+        # noinspection PyUnresolvedReferences
+        global_var_handler.FRAME += 1
+        # noinspection PyUnresolvedReferences
+        prepare_ports_new_wave(frame=global_var_handler.FRAME)
+        save_checkpoint(jobs=job_list, timer_wave=timer_wave, timer_post_processing=timer_post_processing)
+
+
+def get_worker_file(file: str, worker: int) -> str:
+    """
+    :param file: location of log file of main process
+    :param worker: index of worker process
+    :return: location of the log file of the worker process
+    """
+    name, extension = os.path.splitext(file)
+
+    return name + '_worker_' + str(worker) + extension
+
+
+def run_frame_shard(worker: int, config_values: dict, first_frame: int, last_frame: int) -> dict:
+    """
+    Runs in a worker process the jobs for a consecutive part of the frames of the image folder input.
+    The worker writes his own KPI and console log files and reports at the end the ports and the port memory of his process.
+    :param worker: index of worker process
+    :param config_values: configuration of the main process
+    :param first_frame: first frame to process
+    :param last_frame: frame where to stop, it is not processed
+    :return: timing data of the worker
+    """
+    for key, value in config_values.items():
+        setattr(config_main, key, value)
+
+    redirect_log_files(kpi_file=get_worker_file(config_main.LOG_KPI_FILE, worker),
+                       log_file=get_worker_file(config_main.LOG_FILE, worker))
+
+    timer_init = Timer(process_cpu=True)
+    timer_wave = Timer(process_cpu=True)
+    timer_post_processing = Timer(process_cpu=True)
+
+    global_var_handler()
+    init_tracer(get_frame=global_var_handler.get_frame)
+    set_store_writer('_worker_{}'.format(worker))
+    clear_input_img_dir()
+    get_picture_size_and_number()
+    global_var_handler.FRAME = first_frame
+    global_var_handler.NR_PICTURES = last_frame
+
+    if len(portsDict) == 0:
+        create_ports_dict(config_main.APPL_NR_WAVES + config_main.APPL_PIPELINE_DEPTH - 1)
+
+    job_list = job_creation(job_description=remove_dead_jobs(get_jobs(json_file=config_main.APPL_INPUT_JOB_LIST)))
+    plan_port_memory(jobs=job_list)
+    timer_init.start_cycle_timer()
+    init_job_cache()
+    init_jobs(list_jobs=job_list)
+    if config_main.APPL_NR_WORKERS > 1:
+        init_dag(jobs=job_list, workers=config_main.APPL_NR_WORKERS)
+    timer_init.end_cycle_timer()
+    timer_init.cycle_updater()
+    try:
+        run_frames(job_list=job_list, timer_wave=timer_wave, timer_post_processing=timer_post_processing)
+    finally:
+        stop_image_writer()
+    terminate_dag()
+    stop_prefetch()
+    terminate_jobs(job_list)
+    log_to_console_job_cache()
+    log_to_console_frame_deadline(job_list)
+    log_to_console_skipped_jobs(job_list)
+    if config_main.APPL_TRACE_FILE is not None:
+        save_trace(file=get_worker_file(config_main.APPL_TRACE_FILE, worker))
+    log_to_console_exchange_ports()
+    log_to_console_port_memory()
+    clear_pool()
+    close_files()
+
+    return {'jobs': [(job.__name__, job.__timer__) for job in job_list],
+            'init': timer_init,
+            'wave': timer_wave,
+            'post processing': timer_post_processing,
+            'sizes': get_used_size_values()}
+
+
+def run_application_sharded(timer_application: Timer, timer_init: Timer, timer_wave: Timer, timer_post_processing: Timer) -> list:
+    """
+    Splits the frames of the image folder input between worker processes.
+    The KPI files of the workers are merged in the KPI file in the order of the frames.
+    :param timer_application: timer for the run of all frames
+    :param timer_init: timer for the job init of the workers
+    :param timer_wave: timer for the jobs of a frame
+    :param timer_post_processing: timer for showing and saving the ports of a frame
+    :return: list of job names and job timers with the cycles of all workers
+    """
+    # noinspection PyUnresolvedReferences
+    nr_frames = global_var_handler.NR_PICTURES
+    nr_processes = max(1, min(config_main.APPL_NR_PROCESSES, nr_frames))
+    config_values = {key: value for key, value in vars(config_main).items()
+                     if key.isupper() and isinstance(value, (bool, int, float, str, list, tuple, dict, type(None)))}
+    shards = [(worker, config_values, nr_frames * worker // nr_processes, nr_frames * (worker + 1) // nr_processes)
+              for worker in range(nr_processes)]
+
+    log_setup_info_to_console("JOB RUN STEP ON {} PROCESSES".format(nr_processes))
+    clear_array_stores()
+    flush_files()
+    timer_application.start_cycle_timer()
+    with multiprocessing.Pool(processes=nr_processes) as pool:
+        results = pool.starmap(run_frame_shard, shards)
+    timer_application.end_cycle_timer()
+    timer_application.cycle_updater()
+    log_setup_info_to_console("TERMINATE STEP")
+
+    add_kpi_tables(kpi_files=[get_worker_file(config_main.LOG_KPI_FILE, worker) for worker in range(nr_processes)])
+
+    if config_main.APPL_TRACE_FILE is not None:
+        save_trace(other_files=[get_worker_file(config_main.APPL_TRACE_FILE, worker) for worker in range(nr_processes)])
+
+    job_timers = [(name, Timer()) for name, _ in results[0]['jobs']]
+    used_sizes = set()
+    for result in results:
+        timer_init.merge(result['init'])
+        timer_wave.merge(result['wave'])
+        timer_post_processing.merge(result['post processing'])
+        used_sizes.update(result['sizes'])
+        for index in range(len(job_timers)):
+            job_timers[index][1].merge(result['jobs'][index][1])
+
+    log_to_console("IMAGE SIZE USED IN APPLICATION: {}".format(used_sizes))
+
+    return job_timers
+
+
 def run_application():
     """
     Main function of system
     :return: None
     """
     # initialize timers
-    timer_setup = Timer()
-    timer_init = Timer()
-    timer_application = Timer()
-    timer_wave = Timer()
-    timer_post_processing = Timer()
+    timer_setup = Timer(process_cpu=True)
+    timer_init = Timer(process_cpu=True)
+    timer_application = Timer(process_cpu=True)
+    timer_wave = Timer(process_cpu=True)
+    timer_post_processing = Timer(process_cpu=True)
 
     if config_main.APPL_INPUT is not None:
         log_setup_info_to_console("SETUP STEP")
         timer_setup.start_cycle_timer()
+        init_checkpoint()
         global_var_handler()
+        init_tracer(get_frame=global_var_handler.get_frame)
 
         if config_main.APPL_INPUT == config_main.IMAGE_INPUT:
             get_picture_size_and_number()
@@ -39,23 +213,70 @@ def run_application():
         elif config_main.APPL_INPUT == config_main.CAMERA_INPUT:
             get_camera_capture()
 
+        if config_main.APPL_NR_PROCESSES > 1 and config_main.APPL_INPUT == config_main.IMAGE_INPUT:
+            if config_main.APPL_NR_WAVES == 1:
+                stop_checkpoint('FRAMES RUN IN {} PROCESSES'.format(config_main.APPL_NR_PROCESSES))
+                timer_setup.end_cycle_timer()
+                timer_setup.cycle_updater()
+                job_timers = run_application_sharded(timer_application=timer_application, timer_init=timer_init, timer_wave=timer_wave,
+                                                     timer_post_processing=timer_post_processing)
+                clear_input_img_dir()
+
+                log_setup_info_to_console("PHASE SETUP AVERAGE TIME[s]            : {time:10.10f}".format(
+                    time=timer_setup.__average_time_sum__))
+                log_setup_info_to_console(
+                    "PHASE INIT AVERAGE TIME[s]             : {time:10.10f}".format(time=timer_init.get_average_time_seconds()))
+                log_setup_info_to_console(
+                    "PHASE WAVE AVERAGE TIME[s]             : {time:10.10f}".format(time=timer_wave.get_average_time_seconds()))
+                log_setup_info_to_console(
+                    "PHASE POST PROCESSING AVERAGE TIME[s]  : {time:10.10f}".format(time=timer_post_processing.get_average_time_seconds()))
+                log_setup_info_to_console(
+                    "PHASE RUN AVERAGE TIME[s]              : {time:10.10f}".format(time=timer_application.__average_time_sum__))
+
+                log_to_console("Average time of jobs:")
+                for name, job_timer in job_timers:
+                    log_to_console_job_time(name=name, job_timer=job_timer)
+                save_time_statistics(phases={'setup': timer_setup, 'init': timer_init, 'wave': timer_wave,
+                                             'post processing': timer_post_processing, 'run': timer_application}, jobs=job_timers)
+                # the next run of the application starts a new KPI table
+                end_kpi_table()
+                return
+            else:
+                log_to_console('JOBS USE DATA FROM PREVIOUS WAVES. FRAMES WILL RUN IN ONE PROCESS')
+
         log_setup_info_to_console("JOB CREATION STEP")
-        job_list = job_creation(job_description=get_jobs(json_file=config_main.APPL_INPUT_JOB_LIST))
+        job_list = job_creation(job_description=remove_dead_jobs(get_jobs(json_file=config_main.APPL_INPUT_JOB_LIST)))
+        plan_port_memory(jobs=job_list)
         timer_setup.end_cycle_timer()
         timer_setup.cycle_updater()
         log_setup_info_to_console("JOB INIT STEP")
         timer_init.start_cycle_timer()
+        init_job_cache()
         init_jobs(list_jobs=job_list)
+        is_pipelined = config_main.APPL_PIPELINE_DEPTH > 1 and config_main.APPL_INPUT in [config_main.VIDEO_INPUT,
+                                                                                          config_main.CAMERA_INPUT]
+        if config_main.APPL_PIPELINE_DEPTH > 1 and not is_pipelined:
+            log_to_console('PIPELINE SCHEDULER WORKS ONLY FOR VIDEO AND CAMERA INPUT. FRAMES WILL RUN ONE AFTER ANOTHER')
+        if is_pipelined and config_main.APPL_FRAME_DEADLINE_MS is not None:
+            log_to_console('FRAME DEADLINE WORKS ONLY WITHOUT PIPELINE SCHEDULER. JOBS WILL NOT BE SKIPPED')
+        if is_pipelined:
+            stop_checkpoint('FRAMES RUN BY PIPELINE SCHEDULER')
+        if config_main.APPL_NR_WORKERS > 1 and not is_pipelined:
+            init_dag(jobs=job_list, workers=config_main.APPL_NR_WORKERS)
+        if resume_checkpoint(jobs=job_list, timer_wave=timer_wave, timer_post_processing=timer_post_processing) is False:
+            clear_array_stores()
         timer_init.end_cycle_timer()
         timer_init.cycle_updater()
         log_setup_info_to_console("JOB RUN STEP")
         timer_application.start_cycle_timer()
-        # noinspection PyUnresolvedReferences,PyUnresolvedReferences
-        while global_var_handler.FRAME < global_var_handler.NR_PICTURES:
-            timer_wave.start_cycle_timer()
-            # noinspection PyUnresolvedReferences
-            log_to_console('FRAME {}'.format(global_var_handler.FRAME))
-            run_rr(jobs=job_list)
+
+        def end_of_pipelined_frame(frame: int) -> None:
+            """
+            Post processing of a frame finished by the pipeline scheduler.
+            The wave time is the time between two finished frames.
+            :param frame: finished frame
+            :return: None
+            """
             timer_wave.end_cycle_timer()
             timer_wave.cycle_updater()
             timer_post_processing.start_cycle_timer()
@@ -63,13 +284,26 @@ def run_application():
             save_pict_to_file()
             timer_post_processing.end_cycle_timer()
             timer_post_processing.cycle_updater()
-            # noinspection PyUnresolvedReferences
-            global_var_handler.FRAME += 1
-            # noinspection PyUnresolvedReferences
-            prepare_ports_new_wave(frame=global_var_handler.FRAME)
+            global_var_handler.FRAME = frame + 1
+            timer_wave.start_cycle_timer()
+
+        try:
+            if is_pipelined:
+                timer_wave.start_cycle_timer()
+                run_pipeline(jobs=job_list, depth=config_main.APPL_PIPELINE_DEPTH,
+                             workers=max(config_main.APPL_NR_WORKERS, config_main.APPL_PIPELINE_DEPTH), end_of_frame=end_of_pipelined_frame)
+            run_frames(job_list=job_list, timer_wave=timer_wave, timer_post_processing=timer_post_processing)
+        finally:
+            # a job that failed must not leave the decoder thread running for the next run
+            stop_video_decoder()
+            # the queued images are written and the write errors reported also when a job failed
+            stop_image_writer()
         timer_application.end_cycle_timer()
         timer_application.cycle_updater()
         log_setup_info_to_console("TERMINATE STEP")
+        terminate_dag()
+        stop_prefetch()
+        remove_checkpoint()
         terminate_jobs(job_list)
 
         log_to_console("IMAGE SIZE USED IN APPLICATION: {}".format(get_used_size_values()))
@@ -89,7 +323,18 @@ def run_application():
             "PHASE RUN AVERAGE TIME[s]              : {time:10.10f}".format(time=timer_application.__average_time_sum__))
 
         log_to_console_avg_time(job_list)
+        log_to_console_frame_deadline(job_list)
+        log_to_console_skipped_jobs(job_list)
+        save_time_statistics(phases={'setup': timer_setup, 'init': timer_init, 'wave': timer_wave,
+                                     'post processing': timer_post_processing, 'run': timer_application},
+                             jobs=[(job.__name__, job.__timer__) for job in job_list])
+        save_trace()
         log_to_console_exchange_ports()
+        log_to_console_port_memory()
+        log_to_console_job_cache()
+        clear_pool()
+        # the next run of the application starts a new KPI table
+        end_kpi_table()
     else:
         log_setup_info_to_console('NO INPUT FOR APPLICATION')
 
@@ -6,7 +6,7 @@ import numpy as np
 
 import config_main
 from Utils.log_handler import log_setup_info_to_console, log_error_to_console, log_benchmark_info_to_console
-from Benchmarking.Util.image_parsing import find_img_extension
+from Benchmarking.Util.image_parsing import find_img_extension, read_saved_image
 
 """
 Intersection over union (IoU) calculation for evaluating an image segmentation model
@@ -136,7 +136,7 @@ def run_CM_benchmark_IoU(class_list_name: list, unknown_class, is_rgb_gt=False,
                 else:
                     path_img_al = os.path.join(config_main.BENCHMARK_INPUT_LOCATION, set_image, file + img_extension)
                 img_gt = cv2.imread(path_img_gt, cv2.IMREAD_GRAYSCALE)
-                img_al = cv2.imread(path_img_al, cv2.IMREAD_GRAYSCALE)
+                img_al = read_saved_image(path_img_al, cv2.IMREAD_GRAYSCALE)
                 try:
                     if is_rgb_gt:
                         new_gt = np.zeros(img_gt.shape)
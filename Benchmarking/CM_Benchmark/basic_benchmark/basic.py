@@ -2,6 +2,9 @@ import os
 # noinspection PyPackageRequirements
 import cv2
 
+import config_main
+from Benchmarking.Util.image_parsing import get_array_store, read_saved_image
+
 
 def calc_acc(fn: float, fp: float, tp: float, tn: float) -> float:
     """
@@ -50,9 +53,14 @@ def calc_f1_score(fn: float, fp: float, tp: float) -> float:
 def get_files_in_folder(folder):
     """
     Updates the global variable images_in_directory with all the frames inside.
+    The images of a folder with an array store are the keys of the store.
     :param folder: source directory for the input pictures
     :return: None
     """
+    store = get_array_store(folder)
+    if store is not None:
+        return [key + config_main.APPl_SAVE_PICT_EXTENSION for key in store.keys()]
+
     list_of_files = []
     for dir_name, dir_names, file_names in os.walk(folder):
         # array that stores all names
@@ -92,7 +100,7 @@ def matrix_reunion(img1, img2):
 
 
 def calculate_kpi(image, gt):
-    img = cv2.imread(image)
+    img = read_saved_image(image)
     img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     img_gt = cv2.imread(gt)
     if len(img_gt.shape) == 3:
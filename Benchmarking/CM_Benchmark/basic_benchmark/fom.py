@@ -5,7 +5,7 @@ import numpy as np
 from scipy.ndimage import distance_transform_edt
 
 import config_main
-from Benchmarking.Util.image_parsing import find_img_extension
+from Benchmarking.Util.image_parsing import find_img_extension, read_saved_image
 from Utils.log_handler import log_setup_info_to_console, log_benchmark_info_to_console, log_error_to_console
 
 
@@ -79,7 +79,7 @@ def run_CM_benchmark_FOM():
                 else:
                     path_img_al = os.path.join(config_main.BENCHMARK_INPUT_LOCATION, set, file + img_extension)
                 img_gt = cv2.imread(path_img_gt)
-                img_al = cv2.imread(path_img_al)
+                img_al = read_saved_image(path_img_al)
                 try:
                     val = fom_calc(cv2.cvtColor(img_gt, cv2.COLOR_BGR2GRAY), cv2.cvtColor(img_al, cv2.COLOR_BGR2GRAY))
                     avg_fom += val
@@ -6,7 +6,7 @@ import numpy as np
 
 import config_main
 from Utils.log_handler import log_setup_info_to_console, log_error_to_console, log_benchmark_info_to_console
-from Benchmarking.Util.image_parsing import find_img_extension
+from Benchmarking.Util.image_parsing import find_img_extension, read_saved_image
 
 
 def psnr_calc(img, img_gt):
@@ -71,7 +71,7 @@ def run_CM_benchmark_PSNR():
                     path_img_al = os.path.join(config_main.BENCHMARK_INPUT_LOCATION, set, file + img_extension)
 
                 img_gt = cv2.imread(path_img_gt)
-                img_al = cv2.imread(path_img_al)
+                img_al = read_saved_image(path_img_al)
 
                 try:
                     val = psnr_calc(img_al, img_gt)
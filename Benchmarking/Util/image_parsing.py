@@ -1,5 +1,14 @@
 import os
 
+# noinspection PyPackageRequirements
+import cv2
+import numpy as np
+
+from Utils.array_store import ArrayStore, get_store_state
+
+# array stores of the folders that were read and the state of their index files when they were read
+array_stores = dict()
+
 
 def find_img_extension(path):
     extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.raw']
@@ -11,5 +20,71 @@ def find_img_extension(path):
         return extensions[0]
 
 
+def get_array_store(location):
+    """
+    Gives the array store of a folder. The store is read again if its index files changed since it was read.
+    :param location: folder
+    :return: ArrayStore object, None if the folder has no store
+    """
+    state = get_store_state(location)
+    cached = array_stores.get(location)
+
+    if cached is None or cached[0] != state:
+        cached = (state, ArrayStore(location) if state else None)
+        array_stores[location] = cached
+
+    return cached[1]
+
+
+def read_from_array_store(path):
+    """
+    Reads an image saved in the array store of the folder of the image
+    :param path: location of image file, the name without extension is the key in the store
+    :return: image converted as it would be saved in an image file, None if the folder has no store or the store has no image
+    """
+    store = get_array_store(os.path.dirname(path))
+
+    if store is None:
+        return None
+
+    img = store.read(os.path.splitext(os.path.basename(path))[0])
+
+    if img is None:
+        return None
+    if img.dtype not in (np.uint8, np.uint16):
+        return np.clip(np.rint(img), 0, 255).astype(np.uint8)
+
+    return np.array(img)
+
+
+def read_saved_image(path, flags=cv2.IMREAD_COLOR):
+    """
+    Reads an image saved by the APPL block from the array store of the folder or, if there is none, from the image file
+    :param path: location of image file
+    :param flags: cv2.IMREAD_COLOR or cv2.IMREAD_GRAYSCALE
+    :return: image, None if it can't be read
+    """
+    img = read_from_array_store(path)
+
+    if img is None:
+        return cv2.imread(path, flags)
+
+    if img.dtype == np.uint16:
+        img = (img >> 8).astype(np.uint8)
+
+    if flags == cv2.IMREAD_GRAYSCALE:
+        if len(img.shape) == 3 and img.shape[2] == 4:
+            img = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+        elif len(img.shape) == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    elif flags == cv2.IMREAD_COLOR:
+        if len(img.shape) == 2 or img.shape[2] == 1:
+            img = cv2.cvtColor(img, cv2.COLOR_GRAY2BGR)
+        elif img.shape[2] == 4:
+            img = cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+
+    return img
+
+
 if __name__ == "__main__":
     pass
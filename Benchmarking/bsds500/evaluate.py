@@ -12,6 +12,10 @@ from skimage.color import rgb2grey
 from skimage.io import imread
 from skimage.util import img_as_float
 
+# the predictions saved in array stores by the APPL block are read with the helpers of the framework
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from Benchmarking.Util.image_parsing import read_from_array_store
+
 parser = argparse.ArgumentParser(description='Test output')
 parser.add_argument('bsds_path', type=str,
                     help='the root path of the BSDS-500 dataset')
@@ -64,7 +68,13 @@ def load_gt_boundaries(sample_name):
 
 def load_pred(sample_name):
     sample_path = os.path.join(pred_path, '{}{}'.format(sample_name, suffix_ext))
-    pred = rgb2grey(img_as_float(imread(sample_path)))
+    pred = read_from_array_store(sample_path)
+    if pred is None:
+        pred = imread(sample_path)
+    elif len(pred.shape) == 3:
+        # the arrays of the store are BGR like the images of the APPL block
+        pred = pred[:, :, 2::-1]
+    pred = rgb2grey(img_as_float(pred))
     bnds = ds.boundaries(sample_name)
     tgt_shape = bnds[0].shape
     pred = pred[:tgt_shape[0], :tgt_shape[1]]
@@ -13,6 +13,7 @@ from Benchmarking.bsds500.bsds.bsds_dataset import BSDSDataset
 from Benchmarking.bsds500.bsds import evaluate_boundaries
 from skimage.util import img_as_float
 from skimage.io import imread
+from Benchmarking.Util.image_parsing import read_from_array_store
 from Utils.log_handler import log_error_to_console, log_benchmark_info_to_console, log_setup_info_to_console
 
 
@@ -23,7 +24,13 @@ def load_gt_boundaries(sample_name):
 
 def load_pred(sample_name, set_name):
     pred_path = os.path.join(config_main.BENCHMARK_INPUT_LOCATION, set_name, '{}.png'.format(sample_name))
-    return img_as_float(imread(pred_path))
+    pred = read_from_array_store(pred_path)
+    if pred is None:
+        return img_as_float(imread(pred_path))
+    # the arrays of the store are BGR like the images of the APPL block
+    if len(pred.shape) == 3:
+        pred = pred[:, :, 2::-1]
+    return img_as_float(pred)
 
 
 def run_verify_boundry(thinning, max_distance_px):
@@ -0,0 +1,173 @@
+import glob
+import json
+import os
+import threading
+
+import numpy as np
+
+"""
+Module handles the array stores of the EECVF.
+An array store is a folder with append only chunk files that hold the raw data of the arrays and index files with one json line
+for every array: key, chunk file, offset, shape and type. If a key is appended again the last array is used.
+Every writer of a store, for example every worker process, has his own index and chunk files. The APPL block removes the store of
+a folder at the start of a run, so the writers of a store never write the same key.
+Arrays are read as memory maps of the chunk files, without copying.
+"""
+
+
+def get_index_file(location: str, writer: str = '') -> str:
+    """
+    :param location: folder of store
+    :param writer: name of writer
+    :return: location of index file of writer
+    """
+    return os.path.join(location, 'index' + writer + '.jsonl')
+
+
+def get_chunk_file(writer: str, chunk: int) -> str:
+    """
+    :param writer: name of writer
+    :param chunk: number of chunk
+    :return: name of chunk file
+    """
+    return 'chunk' + writer + '_{:05d}.bin'.format(chunk)
+
+
+def get_store_state(location: str) -> tuple:
+    """
+    :param location: folder
+    :return: index files of the store in the folder with their size and time of change. Changes when the store is written.
+    """
+    state = []
+
+    for index_file in sorted(glob.glob(get_index_file(glob.escape(location), '*'))):
+        try:
+            stat = os.stat(index_file)
+        except OSError:
+            continue
+        state.append((index_file, stat.st_size, stat.st_mtime_ns))
+
+    return tuple(state)
+
+
+def remove_array_store(location: str) -> None:
+    """
+    Deletes the index and chunk files of the store in the folder
+    :param location: folder
+    :return: None
+    """
+    for file in glob.glob(get_index_file(glob.escape(location), '*')) + glob.glob(os.path.join(glob.escape(location), 'chunk*.bin')):
+        os.remove(file)
+
+
+class ArrayStore:
+    """
+    Class that describes an array store
+    """
+
+    def __init__(self, location: str, chunk_bytes: int = 1 << 28, writer: str = '') -> None:
+        """
+        Constructor of array store. Reads the index files of the store if the folder holds one.
+        :param location: folder of store
+        :param chunk_bytes: size of chunk file after which a new chunk is started
+        :param writer: name of writer used for the files that are appended
+        """
+        self.location = location
+        self.chunk_bytes = chunk_bytes
+        self.writer = writer
+        # key -> (chunk file, offset, shape, dtype)
+        self.index = dict()
+        self.chunk = 0
+        self.index_file = None
+        self.chunk_file = None
+        self.lock = threading.Lock()
+
+        for index_file in sorted(glob.glob(get_index_file(glob.escape(location), '*'))):
+            with open(index_file, 'r') as file:
+                for line in file:
+                    if line.endswith('\n'):
+                        entry = json.loads(line)
+                        self.index[entry['key']] = (entry['chunk'], entry['offset'], tuple(entry['shape']), entry['dtype'])
+
+        while os.path.isfile(os.path.join(location, get_chunk_file(writer, self.chunk + 1))):
+            self.chunk += 1
+
+    def append(self, key: str, arr: np.ndarray) -> None:
+        """
+        Adds an array at the end of the store
+        :param key: key of array
+        :param arr: array
+        :return: None
+        """
+        arr = np.ascontiguousarray(arr)
+
+        with self.lock:
+            if self.index_file is None:
+                os.makedirs(self.location, exist_ok=True)
+                self.index_file = open(get_index_file(self.location, self.writer), 'a')
+                self.chunk_file = open(os.path.join(self.location, get_chunk_file(self.writer, self.chunk)), 'ab')
+
+            offset = self.chunk_file.tell()
+            if offset != 0 and offset + arr.nbytes > self.chunk_bytes:
+                self.chunk_file.close()
+                self.chunk += 1
+                self.chunk_file = open(os.path.join(self.location, get_chunk_file(self.writer, self.chunk)), 'ab')
+                offset = 0
+
+            self.chunk_file.write(arr.data)
+            chunk = get_chunk_file(self.writer, self.chunk)
+            self.index_file.write(json.dumps({'key': key, 'chunk': chunk, 'offset': offset, 'shape': arr.shape,
+                                              'dtype': arr.dtype.str}) + '\n')
+            self.index[key] = (chunk, offset, arr.shape, arr.dtype.str)
+
+    def keys(self) -> list:
+        """
+        :return: keys of the arrays in the store
+        """
+        return list(self.index.keys())
+
+    def read(self, key: str) -> np.ndarray:
+        """
+        :param key: key of array
+        :return: read only array, None if the key is not in the store
+        """
+        entry = self.index.get(key)
+
+        if entry is None:
+            return None
+
+        chunk, offset, shape, dtype = entry
+        with self.lock:
+            if self.chunk_file is not None and chunk == get_chunk_file(self.writer, self.chunk):
+                self.chunk_file.flush()
+        if int(np.prod(shape)) == 0:
+            return np.zeros(shape, dtype=dtype)
+
+        return np.memmap(os.path.join(self.location, chunk), dtype=dtype, mode='r', offset=offset, shape=shape)
+
+    def flush(self) -> None:
+        """
+        Writes the buffered data of the files of the store. The chunk file is written first so the index has no array that is not
+        in the chunk files.
+        :return: None
+        """
+        with self.lock:
+            if self.index_file is not None:
+                self.chunk_file.flush()
+                self.index_file.flush()
+
+    def close(self) -> None:
+        """
+        Writes the buffered data and closes the files of the store
+        :return: None
+        """
+        with self.lock:
+            if self.index_file is not None:
+                self.chunk_file.close()
+                self.index_file.close()
+                self.chunk_file = None
+                self.index_file = None
+
+
+if __name__ == "__main__":
+    pass
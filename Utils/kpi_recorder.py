@@ -0,0 +1,183 @@
+import os
+
+import numpy as np
+
+"""
+Module handles the KPI tables of the EECVF.
+The values logged every frame are kept in typed columns, one column for every name in the header row of the table.
+Tables are written in bulk as csv rows and saved as npz files with one array for every column.
+"""
+
+# first number of rows of the columns, the columns double when they are full
+START_ROWS = 1024
+
+
+def get_column_type(value):
+    """
+    :param value: first value of a column
+    :return: numpy type used for the column
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return object
+    if isinstance(value, (int, np.integer)):
+        return np.int64
+    if isinstance(value, (float, np.floating)):
+        return np.float64
+
+    return object
+
+
+def get_kpi_table_file(kpi_file: str, table_number: int) -> str:
+    """
+    :param kpi_file: location of the csv file with the KPI tables
+    :param table_number: number of table in csv file, starting from 1
+    :return: location of the npz file of the table
+    """
+    name, _ = os.path.splitext(kpi_file)
+
+    if table_number == 1:
+        return name + '.npz'
+
+    return name + '_' + str(table_number) + '.npz'
+
+
+class KpiTable:
+    """
+    Class that holds the values of a KPI table in columns
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor of KPI table. The first row added is the header.
+        """
+        self.names = None
+        self.header_error = False
+        self.columns = []
+        self.error = np.zeros(START_ROWS, dtype=bool)
+        self.nr_rows = 0
+        # rows that were already given as csv text
+        self.csv_rows = 0
+
+    def add_row(self, values: list, error: bool) -> None:
+        """
+        Adds a row to the table. The first row is the header of the table.
+        :param values: list of values logged in the frame
+        :param error: if the frame had an error
+        :return: None
+        """
+        if self.names is None:
+            self.names = [str(value) for value in values]
+            self.header_error = error
+            self.columns = [None] * len(self.names)
+            return
+
+        if self.nr_rows == len(self.error):
+            self.error = np.concatenate((self.error, np.zeros(len(self.error), dtype=bool)))
+            for index in range(len(self.columns)):
+                if self.columns[index] is not None:
+                    self.columns[index] = np.concatenate((self.columns[index], np.empty(len(self.columns[index]),
+                                                                                         dtype=self.columns[index].dtype)))
+
+        while len(self.columns) < len(values):
+            self.columns.append(None)
+            self.names.append('')
+
+        for index in range(len(self.columns)):
+            value = values[index] if index < len(values) else None
+            column = self.columns[index]
+
+            if column is None:
+                column = np.empty(len(self.error), dtype=get_column_type(value))
+                if self.nr_rows > 0:
+                    column = column.astype(object)
+                    column[:self.nr_rows] = None
+                self.columns[index] = column
+            elif column.dtype != object and get_column_type(value) != column.dtype:
+                column = column.astype(object)
+                self.columns[index] = column
+
+            column[self.nr_rows] = value
+
+        self.error[self.nr_rows] = error
+        self.nr_rows += 1
+
+    def get_csv_text(self) -> str:
+        """
+        Gives the rows that were not given before as csv text. The first text of the table starts with the header.
+        :return: csv rows, each ending with new line
+        """
+        if self.names is None:
+            return ''
+
+        rows = []
+        start = self.csv_rows
+
+        if start == 0:
+            rows.append(','.join(self.names + [str(self.header_error)]) + '\n')
+
+        if start < self.nr_rows:
+            columns = []
+            for column in self.columns:
+                values = column[start:self.nr_rows].tolist()
+                if column.dtype == object:
+                    columns.append(['' if value is None else str(value) for value in values])
+                else:
+                    columns.append(list(map(repr, values)))
+            columns.append(list(map(str, self.error[start:self.nr_rows].tolist())))
+            rows.extend([','.join(row) + '\n' for row in zip(*columns)])
+
+        self.csv_rows = self.nr_rows
+
+        return ''.join(rows)
+
+    def add_table(self, file: str) -> None:
+        """
+        Adds the rows of a table saved with save to this table. The header is taken if this table has none.
+        :param file: location of npz file
+        :return: None
+        """
+        names, columns, error, header_error = load_kpi_table(file)
+
+        if self.names is None:
+            self.add_row(names, header_error)
+
+        for row in range(len(error)):
+            self.add_row([column[row] for column in columns], bool(error[row]))
+
+    def save(self, file: str) -> None:
+        """
+        Saves the table in a npz file
+        :param file: location of npz file
+        :return: None
+        """
+        if self.names is None:
+            return
+
+        data = dict()
+        for index in range(len(self.columns)):
+            column = self.columns[index][:self.nr_rows] if self.columns[index] is not None else np.empty(0, dtype=object)
+            if column.dtype == object:
+                column = np.array(['' if value is None else str(value) for value in column.tolist()], dtype=str)
+            data['column_{}'.format(index)] = column
+
+        np.savez(file, names=np.array(self.names, dtype=str), error=self.error[:self.nr_rows], header_error=np.array(self.header_error),
+                 **data)
+
+
+def load_kpi_table(file: str) -> tuple:
+    """
+    Loads a table saved with KpiTable.save
+    :param file: location of npz file
+    :return: list of column names, list of column arrays, array of error flags, error flag of header
+    """
+    with np.load(file, allow_pickle=False) as data:
+        names = data['names'].tolist()
+        columns = [data['column_{}'.format(index)] for index in range(len(names))]
+        error = data['error']
+        header_error = bool(data['header_error'])
+
+    return names, columns, error, header_error
+
+
+if __name__ == "__main__":
+    pass
@@ -1,25 +1,238 @@
+import atexit
+import multiprocessing
 import os
+import queue
+import re
+import sys
+import threading
 import config_main
+from Utils.kpi_recorder import KpiTable, get_kpi_table_file
 
 """
 Module handles the logging for the EECVF
+Console and file writes are done by a writer thread that takes the texts from a queue and writes them in batches.
+Texts with a level smaller than LOG_LEVEL are dropped before they are formatted.
+The KPI values are kept in a KpiTable and written to the KPI file in chunks of LOG_KPI_CHUNK_ROWS rows.
 """
 
+# levels of log texts
+LOG_LEVEL_DEBUG = 10
+LOG_LEVEL_INFO = 20
+LOG_LEVEL_ERROR = 40
+
 # if we run from Application folder
 if 'Application' in os.getcwd():
     config_main.LOG_KPI_FILE = '../' + config_main.LOG_KPI_FILE
     config_main.LOG_FILE = '../' + config_main.LOG_FILE
+    config_main.LOG_TIME_FILE = '../' + config_main.LOG_TIME_FILE
 
 if not os.path.exists(config_main.LOG_KPI_FILE.split('/')[0]):
     os.makedirs('Logs')
 
-file_KPI = open(file=config_main.LOG_KPI_FILE, mode='w')
-file_log = open(file=config_main.LOG_FILE, mode='w')
 
-# global variable to hold the log information
-WAVE_LOG = ''
+def remove_kpi_tables(kpi_file: str) -> None:
+    """
+    Deletes the npz files of the KPI tables of a previous run
+    :param kpi_file: location of KPI file
+    :return: None
+    """
+    name = os.path.basename(os.path.splitext(kpi_file)[0])
+    folder = os.path.dirname(kpi_file)
+
+    for file in os.listdir(folder if folder else '.'):
+        if re.fullmatch(re.escape(name) + r'(_\d+)?\.npz', file):
+            os.remove(os.path.join(folder, file))
+
+
+# worker processes get their own files with redirect_log_files so they don't truncate the files of the main process
+if multiprocessing.current_process().name == 'MainProcess':
+    file_KPI = open(file=config_main.LOG_KPI_FILE, mode='w')
+    file_log = open(file=config_main.LOG_FILE, mode='w')
+    remove_kpi_tables(config_main.LOG_KPI_FILE)
+else:
+    file_KPI = None
+    file_log = None
+
+# values logged in the current wave
+wave_values = []
+# KPI table of the current application run and the number of the table in the KPI file
+kpi_table = KpiTable()
+KPI_TABLE_NUMBER = 1
 # global flag if error in wave
 ERROR = False
+# per thread buffer used by parallel schedulers to keep the order of wave log data
+capture_log = threading.local()
+# texts waiting for the writer thread as (is KPI text, text, print on console)
+log_queue = queue.Queue()
+log_writer = None
+log_writer_lock = threading.Lock()
+
+
+def write_log_batch(batch: list) -> None:
+    """
+    Writes a batch of texts in the log files and on console
+    :param batch: list of (is KPI text, text, print on console)
+    :return: None
+    """
+    kpi_text = ''.join([text for is_kpi, text, console in batch if is_kpi is True])
+    log_text = ''.join([text for is_kpi, text, console in batch if is_kpi is False])
+    console_text = ''.join([text for is_kpi, text, console in batch if console is True])
+
+    for file, text in ((file_KPI, kpi_text), (file_log, log_text)):
+        if text and file is not None and not getattr(file, 'closed', False):
+            file.write(text)
+
+    if console_text:
+        sys.stdout.write(console_text)
+
+
+def run_log_writer() -> None:
+    """
+    Writer thread. Takes up to LOG_BATCH_SIZE texts from the queue and writes them together.
+    Files and console are flushed when the queue is empty.
+    :return: None
+    """
+    while True:
+        batch = [log_queue.get()]
+        while len(batch) < config_main.LOG_BATCH_SIZE:
+            try:
+                batch.append(log_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        try:
+            write_log_batch(batch)
+            if log_queue.empty():
+                for file in (file_KPI, file_log, sys.stdout):
+                    if file is not None and not getattr(file, 'closed', False):
+                        file.flush()
+        except BaseException as error:
+            sys.stderr.write('LOG WRITER ERROR: {}\n'.format(error))
+        finally:
+            for _ in batch:
+                log_queue.task_done()
+
+
+def start_log_writer() -> None:
+    """
+    Starts the writer thread if it is not running
+    :return: None
+    """
+    global log_writer
+
+    with log_writer_lock:
+        if log_writer is None or not log_writer.is_alive():
+            log_writer = threading.Thread(target=run_log_writer, name='log writer', daemon=True)
+            log_writer.start()
+
+
+def reset_log_writer() -> None:
+    """
+    The writer thread and the queue are not copied in a forked process so new ones are created
+    :return: None
+    """
+    global log_queue, log_writer, log_writer_lock
+
+    log_queue = queue.Queue()
+    log_writer = None
+    log_writer_lock = threading.Lock()
+
+
+def wait_log_writer() -> None:
+    """
+    Waits until the writer thread wrote all the texts from the queue
+    :return: None
+    """
+    if log_writer is not None:
+        log_queue.join()
+
+
+def write_log(text: str, is_kpi: bool = False, console: bool = True) -> None:
+    """
+    Sends a text to the writer thread or writes it if LOG_ASYNC is False
+    :param text: text with new line
+    :param is_kpi: if the text goes to the KPI file
+    :param console: if the text is printed on console
+    :return: None
+    """
+    if config_main.LOG_ASYNC is True:
+        if log_writer is None:
+            start_log_writer()
+        log_queue.put((is_kpi, text, console))
+    else:
+        write_log_batch([(is_kpi, text, console)])
+
+
+def set_log_level(level: int) -> None:
+    """
+    Changes the level of the texts that are logged at runtime
+    :param level: LOG_LEVEL_DEBUG, LOG_LEVEL_INFO or LOG_LEVEL_ERROR
+    :return: None
+    """
+    config_main.LOG_LEVEL = level
+
+
+def is_log_level_enabled(level: int) -> bool:
+    """
+    :param level: level of text
+    :return: if texts of this level are logged
+    """
+    return level >= config_main.LOG_LEVEL
+
+
+def end_kpi_table() -> None:
+    """
+    Writes the rows of the KPI table that are not in the KPI file, saves the table in a npz file and starts a new table
+    :return: None
+    """
+    global kpi_table, KPI_TABLE_NUMBER
+
+    if kpi_table.names is None:
+        return
+
+    write_log(kpi_table.get_csv_text(), is_kpi=True, console=False)
+    kpi_table.save(get_kpi_table_file(config_main.LOG_KPI_FILE, KPI_TABLE_NUMBER))
+    kpi_table = KpiTable()
+    KPI_TABLE_NUMBER += 1
+
+
+def get_kpi_table() -> KpiTable:
+    """
+    :return: KPI table of the current application run
+    """
+    return kpi_table
+
+
+def set_kpi_table(table: KpiTable) -> None:
+    """
+    Replaces the KPI table of the current application run with a table of a checkpoint. All the rows of the table are written
+    again in the KPI file.
+    :param table: KPI table
+    :return: None
+    """
+    global kpi_table
+
+    kpi_table = table
+    kpi_table.csv_rows = 0
+
+
+def add_kpi_tables(kpi_files: list) -> None:
+    """
+    Adds the rows of the KPI tables of worker processes to the KPI table and deletes their files
+    :param kpi_files: location of the KPI files of the workers
+    :return: None
+    """
+    for kpi_file in kpi_files:
+        table_file = get_kpi_table_file(kpi_file, 1)
+        kpi_table.add_table(table_file)
+        os.remove(table_file)
+        os.remove(kpi_file)
+
+
+atexit.register(wait_log_writer)
+atexit.register(end_kpi_table)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_log_writer)
 
 
 def reopen_files():
@@ -27,28 +240,111 @@ def reopen_files():
     global file_log
     # delete any custom ports
     config_main.PYRAMID_LEVEL.delete_levels_add_runtime()
+    # the KPI table of the last run is ended before the files are opened again
+    end_kpi_table()
     # reopen files for debug
+    wait_log_writer()
     file_KPI = open(file=config_main.LOG_KPI_FILE, mode='a')
     file_log = open(file=config_main.LOG_FILE, mode='a')
 
 
+def redirect_log_files(kpi_file: str, log_file: str) -> None:
+    """
+    Closes the current log files and opens new ones. Used by worker processes.
+    :param kpi_file: location of new KPI file
+    :param log_file: location of new console log file
+    :return: None
+    """
+    global file_KPI, file_log, KPI_TABLE_NUMBER
+
+    end_kpi_table()
+    wait_log_writer()
+    if file_KPI is not None:
+        file_KPI.close()
+    if file_log is not None:
+        file_log.close()
+
+    config_main.LOG_KPI_FILE = kpi_file
+    config_main.LOG_FILE = log_file
+    file_KPI = open(file=kpi_file, mode='w')
+    file_log = open(file=log_file, mode='w')
+    remove_kpi_tables(kpi_file)
+    KPI_TABLE_NUMBER = 1
+
+
+def flush_files() -> None:
+    """
+    Writes the texts waiting for the writer thread and the buffered data of the log files
+    :return: None
+    """
+    write_log(kpi_table.get_csv_text(), is_kpi=True, console=False)
+    wait_log_writer()
+    sys.stdout.flush()
+    file_KPI.flush()
+    file_log.flush()
+
+
+def log_rows_to_file(rows: list) -> None:
+    """
+    Writes complete rows in the KPI file. Used to merge the KPI files of worker processes.
+    :param rows: list of rows, each ending with new line
+    :return: None
+    """
+    write_log(''.join(rows), is_kpi=True, console=False)
+
+
 def is_error() -> None:
     """
     Set's a error in the log file so you can see that the specific wave had an error
     :return: None
     """
     global ERROR
-    ERROR = True
 
+    if getattr(capture_log, 'buffer', None) is not None:
+        capture_log.error = True
+    else:
+        ERROR = True
+
+
+def start_log_capture() -> None:
+    """
+    Redirects the wave log data of the current thread to a buffer.
+    Used by parallel schedulers so the wave log data can be written in job order.
+    Captures can be nested, stop_log_capture restores the previous one.
+    :return: None
+    """
+    if getattr(capture_log, 'previous', None) is None:
+        capture_log.previous = []
+
+    capture_log.previous.append((getattr(capture_log, 'buffer', None), getattr(capture_log, 'error', False)))
+    capture_log.buffer = []
+    capture_log.error = False
 
-def log_to_file(text: str) -> None:
+
+def stop_log_capture() -> tuple:
+    """
+    Stops the redirection of the wave log data of the current thread
+    :return: list of data logged since start_log_capture, if an error was set
+    """
+    buffer = capture_log.buffer
+    error = capture_log.error
+    capture_log.buffer, capture_log.error = capture_log.previous.pop()
+
+    return buffer, error
+
+
+def log_to_file(text) -> None:
     """
     Log data to log file
-    :param text: what data to log
+    :param text: what data to log, text or number
     :return: None
     """
-    global WAVE_LOG
-    WAVE_LOG += text + ','
+    buffer = getattr(capture_log, 'buffer', None)
+
+    if buffer is not None:
+        buffer.append(text)
+    else:
+        wave_values.append(text)
 
 
 def log_end_of_wave() -> None:
@@ -56,10 +352,14 @@ def log_end_of_wave() -> None:
     Logs data at end of wave
     :return:
     """
-    global WAVE_LOG, ERROR
-    file_KPI.write(WAVE_LOG + str(ERROR) + '\n')
+    global ERROR
+
+    kpi_table.add_row(wave_values, ERROR)
+    wave_values.clear()
     ERROR = False
-    WAVE_LOG = ''
+
+    if kpi_table.nr_rows - kpi_table.csv_rows >= config_main.LOG_KPI_CHUNK_ROWS:
+        write_log(kpi_table.get_csv_text(), is_kpi=True, console=False)
 
 
 def log_to_console(text: str) -> None:
@@ -68,9 +368,19 @@ def log_to_console(text: str) -> None:
     :param text: What to print and write in console log
     :return: None
     """
-    text = 'APPLICATION: {}'.format(text)
-    file_log.write(text + '\n')
-    print(text)
+    if is_log_level_enabled(LOG_LEVEL_INFO):
+        write_log('APPLICATION: {}\n'.format(text))
+
+
+def debug_log_to_console(text: str, *args, **kwargs) -> None:
+    """
+    Logs data on console if LOG_LEVEL is LOG_LEVEL_DEBUG.
+    The text is formatted with args and kwargs only if it is logged.
+    :param text: What to print and write in console log
+    :return: None
+    """
+    if is_log_level_enabled(LOG_LEVEL_DEBUG):
+        write_log('APPLICATION: {}\n'.format(text.format(*args, **kwargs)))
 
 
 def verbose_log_to_console(text: str) -> None:
@@ -79,9 +389,7 @@ def verbose_log_to_console(text: str) -> None:
     :param text: What to print and write in console log
     :return: None
     """
-    text = 'VERBOSE: ' + text
-    file_log.write(text + '\n')
-    print(text)
+    write_log('VERBOSE: ' + str(text) + '\n')
 
 
 def log_setup_info_to_console(text: str) -> None:
@@ -90,9 +398,7 @@ def log_setup_info_to_console(text: str) -> None:
     :param text: What to print and write in console log
     :return: None
     """
-    text = '### {} ###'.format(text)
-    file_log.write(text + '\n')
-    print(text)
+    write_log('### {} ###\n'.format(text))
 
 
 def log_benchmark_info_to_console(text: str) -> None:
@@ -101,9 +407,7 @@ def log_benchmark_info_to_console(text: str) -> None:
     :param text: What to print and write in console log
     :return: None
     """
-    text = 'BENCHMARK: {}'.format(text)
-    file_log.write(text + '\n')
-    print(text)
+    write_log('BENCHMARK: {}\n'.format(text))
 
 
 def log_ml_info_to_console(text: str) -> None:
@@ -112,9 +416,7 @@ def log_ml_info_to_console(text: str) -> None:
     :param text: What to print and write in console log
     :return: None
     """
-    text = 'ML: {}'.format(text)
-    file_log.write(text + '\n')
-    print(text)
+    write_log('ML: {}\n'.format(text))
 
 
 def log_util_info_to_console(text: str) -> None:
@@ -123,9 +425,7 @@ def log_util_info_to_console(text: str) -> None:
     :param text: What to print and write in console log
     :return: None
     """
-    text = 'DATA_PROCESSING: {}'.format(text)
-    file_log.write(text + '\n')
-    print(text)
+    write_log('DATA_PROCESSING: {}\n'.format(text))
 
 
 def log_job_to_config(name: str, input_ports: str, output_ports: str) -> None:
@@ -139,8 +439,7 @@ def log_job_to_config(name: str, input_ports: str, output_ports: str) -> None:
     text = '### \nJOB   : {name:100s} \nINPUT : {input:155} \nOUTPUT: {output:155} \n###'. \
         format(name=name, input=input_ports, output=output_ports)
 
-    file_log.write(text + '\n')
-    print(text)
+    write_log(text + '\n')
 
 
 def log_error_to_console(detail_text: str = None, detail_msg: str = None) -> None:
@@ -150,9 +449,7 @@ def log_error_to_console(detail_text: str = None, detail_msg: str = None) -> Non
     :param detail_msg: Msg from python error
     :return: None
     """
-    text = 'ERROR: {error_detail}: {error_msg}'.format(error_detail=detail_text, error_msg=detail_msg)
-    file_log.write(text + '\n')
-    print(text)
+    write_log('ERROR: {error_detail}: {error_msg}\n'.format(error_detail=detail_text, error_msg=detail_msg))
 
 
 def close_files():
@@ -160,6 +457,8 @@ def close_files():
     Closes file resources
     :return: None
     """
+    end_kpi_table()
+    wait_log_writer()
     file_KPI.close()
     file_log.close()
 
@@ -5,6 +5,8 @@ import numpy as np
 import os
 from operator import add
 
+from Utils.kpi_recorder import get_kpi_table_file, load_kpi_table
+
 """
 Module handles the plotting for the EECVF
 """
@@ -34,6 +36,26 @@ def get_table_data_from_csv(content: str, table_number: int) -> dict:
     return table_dict
 
 
+def get_table_data(input_location: str, table_number: int) -> dict:
+    """
+    Get data of a KPI table produced by the APPL block into a dictionary.
+    The npz file of the table is used if it exists, else the csv file is parsed. In both cases the values are the texts written in
+    the csv file.
+    :param input_location: location of csv file
+    :param table_number: csv can have multiple tables inside
+    :return: dictionary with the data
+    """
+    table_file = get_kpi_table_file(input_location, table_number)
+
+    if os.path.exists(table_file):
+        names, columns, _, _ = load_kpi_table(table_file)
+        return {names[index]: list(map(str if columns[index].dtype.kind == 'U' else repr, columns[index].tolist()))
+                for index in range(len(names))}
+
+    with open(input_location, 'r') as file:
+        return get_table_data_from_csv(file.read(), table_number)
+
+
 def plot_avg_time_jobs(input_location: str = CONFIG.LOG_KPI_FILE, table_number: int = 1, save_location: str = 'Logs/',
                        show_plot: bool = False, save_plot: bool = False, eliminate_get_image=False, show_legend=True) -> None:
     """
@@ -47,8 +69,7 @@ def plot_avg_time_jobs(input_location: str = CONFIG.LOG_KPI_FILE, table_number:
     :param save_location: location to save the plots
     :return None
     """
-    file = open(input_location, 'r')
-    table_dict = get_table_data_from_csv(file.read(), table_number)
+    table_dict = get_table_data(input_location, table_number)
 
     if eliminate_get_image is True:
         table_dict.pop('Get frame Avg Time[ms]')
@@ -82,8 +103,6 @@ def plot_avg_time_jobs(input_location: str = CONFIG.LOG_KPI_FILE, table_number:
     if save_plot is True:
         plt.savefig(os.path.join(save_location, 'avg_time_plot.jpg'))
 
-    file.close()
-
 
 def plot_custom_list(port_list: list, name_to_save: str, input_location: str = CONFIG.LOG_KPI_FILE, table_number: int = 1,
                      save_location: str = 'Logs/', show_plot: bool = False, save_plot: bool = True, y_plot_name: str = 'Avg time [ms]'):
@@ -99,8 +118,7 @@ def plot_custom_list(port_list: list, name_to_save: str, input_location: str = C
       :param save_location: where to save
       :return None
       """
-    file = open(input_location, 'r')
-    table_dict = get_table_data_from_csv(file.read(), table_number)
+    table_dict = get_table_data(input_location, table_number)
 
     keys = []
 
@@ -139,7 +157,6 @@ def plot_custom_list(port_list: list, name_to_save: str, input_location: str = C
         plt.savefig(os.path.join(save_location, name_to_save + '.jpg'))
 
     plt.close()
-    file.close()
 
 
 def plot_GLCM_data(port_list: list, caracteristic: str, title: str,
@@ -157,8 +174,7 @@ def plot_GLCM_data(port_list: list, caracteristic: str, title: str,
       :param save_location: where to save
       :return None
       """
-    file = open(input_location, 'r')
-    table_dict = get_table_data_from_csv(file.read(), table_number)
+    table_dict = get_table_data(input_location, table_number)
 
     keys = []
 
@@ -219,7 +235,6 @@ def plot_GLCM_data(port_list: list, caracteristic: str, title: str,
         plt.savefig(os.path.join(save_location, name_to_save + '.jpg'))
 
     plt.close()
-    file.close()
 
 
 # noinspection PyUnusedLocal
@@ -237,8 +252,7 @@ def plot_time_jobs(port_list: list, series_names: list, name_to_save: str, input
       :param save_location: where to save
       :return None
       """
-    file = open(input_location, 'r')
-    table_dict = get_table_data_from_csv(file.read(), table_number)
+    table_dict = get_table_data(input_location, table_number)
 
     new_dict = dict()
 
@@ -277,7 +291,6 @@ def plot_time_jobs(port_list: list, series_names: list, name_to_save: str, input
         plt.savefig(os.path.join(save_location, name_to_save + '.jpg'))
 
     plt.close()
-    file.close()
 
 
 if __name__ == "__main__":
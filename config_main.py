@@ -28,10 +28,89 @@ APPL_INPUT_VIDEO = ''
 APPL_NR_FRAMES_CAPTURE = 0
 # folder for image input
 APPL_INPUT_IMG_DIR = []
+# If the sizes of the input images are kept in a manifest file and used when the files didn't change
+APPL_INPUT_MANIFEST = False
+# Folder of the manifest files of the input folders
+APPL_INPUT_MANIFEST_LOCATION = 'Logs/input_manifest'
 # job json file relative to Application
 APPL_INPUT_JOB_LIST = ''
+# If the sorted job list is kept in a binary plan file that is used again by runs with the same jobs and configuration
+APPL_PLAN_CACHE = True
+# If the json file of the jobs is written also when the plan file is used. The jobs are read from the plan file, the json file is for debug
+APPL_PLAN_JSON = True
+# Number of frames after which the state of the run is saved in a checkpoint. 0 for no checkpoints
+APPL_CHECKPOINT_FRAMES = 0
+# Folder of the checkpoints of the runs
+APPL_CHECKPOINT_LOCATION = 'Logs/checkpoint'
+# If a run with the same jobs and configuration continues from its checkpoint
+APPL_CHECKPOINT_RESUME = False
 # Number of waves to support
 APPL_NR_WAVES = 1
+# Number of threads used to run the jobs of a wave. 1 uses the round robin scheduler
+APPL_NR_WORKERS = 1
+# Number of frames processed in the same time by the pipeline scheduler. 1 to process one frame after another
+APPL_PIPELINE_DEPTH = 1
+# Number of processes that share the frames of the image folder input. 1 to run all frames in this process
+APPL_NR_PROCESSES = 1
+# Folder where the port arrays are memory mapped so other processes can read them(see port.map_port_memory). None for private arrays.
+# The mapped ports are read only by external tools, the processes of APPL_NR_PROCESSES don't exchange ports through them.
+# Use a folder from a RAM file system(ex: /dev/shm) to avoid disk writes.
+APPL_PORT_MEMORY_LOCATION = None
+# Maximum bytes of free port arrays kept for reuse when ports change size.
+# Port arrays are reused in place between waves, jobs that keep data of older frames must copy it(see Port.self_reset)
+APPL_PORT_POOL_MAX_BYTES = 1 << 30
+# If ports written in a wave are filled with zero before reuse. Can be False if all jobs write the full output arrays
+APPL_PORT_ZERO_ON_RESET = True
+# If a port is filled with zero before reuse, by port name(ex: 'GREY_L0'). Ports that are not here use APPL_PORT_ZERO_ON_RESET
+APPL_PORT_ZERO_PORTS = dict()
+# If ports that are not used in the same time in a wave share the same memory. Ports saved or shown are never shared
+APPL_PORT_ALIASING = False
+# Number of array shapes kept by each port. Ports of frames with a shape used before take the array kept for it.
+# 1 to give the array back to the pool when the shape changes
+APPL_PORT_SHAPES_KEPT = 1
+# If jobs whose output ports are not needed by saved, shown or root ports are removed before the run
+APPL_DEAD_JOB_ELIMINATION = False
+# Ports that are needed after the run even if they are not saved or shown(ex: ports read by logging jobs)
+APPL_ROOT_PORTS = []
+# Folder of the cache of job outputs that is kept between runs. None to run all the jobs
+APPL_JOB_CACHE_LOCATION = None
+# Maximum bytes of the job cache. The outputs used least recently are deleted
+APPL_JOB_CACHE_MAX_BYTES = 10 << 30
+# Version of the job cache. Change it to compute again all the outputs, for example after a change in a library used by the jobs
+APPL_JOB_CACHE_VERSION = 0
+# Number of last cycles kept by each timer for latency percentiles
+APPL_TIMER_SAMPLES = 10000
+# File where the trace of jobs, ports and image read/write is saved in Chrome Trace Event format. None to not trace
+APPL_TRACE_FILE = None
+# Maximum number of events kept in memory by the tracer. The oldest events are dropped
+APPL_TRACE_BUFFER_EVENTS = 1 << 20
+# Number of next frames whose input images are read by background threads. 0 to read the image of a frame when it starts
+APPL_PREFETCH_FRAMES = 0
+# Number of threads that read the input images
+APPL_PREFETCH_THREADS = 2
+# Number of threads that write the saved ports. 0 to write the images when the ports are saved
+APPL_SAVE_THREADS = 0
+# Maximum number of saved images waiting to be written. Frames wait for the writer when the queue is full
+APPL_SAVE_QUEUE_SIZE = 64
+# Compression level of saved png images, 0 to 9. None for the default of OpenCV
+APPL_SAVE_PNG_COMPRESSION = None
+# If saved ports are appended to an array store in the folder of the port instead of one image file for every frame
+APPL_SAVE_ARRAY_STORE = False
+# Size of the chunk files of array stores
+APPL_SAVE_STORE_CHUNK_BYTES = 1 << 28
+# Number of preallocated arrays where a thread decodes the next video or camera frames. 0 to decode a frame when it starts
+APPL_VIDEO_RING_SIZE = 4
+# If the decoder drops the oldest decoded frame when all the arrays are full instead of waiting.
+# None to drop frames only for camera input, where waiting would make the frames stale
+APPL_VIDEO_DROP_FRAMES = None
+# Every n-th frame of the video or camera is processed, the frames between are skipped without decoding
+APPL_VIDEO_FRAME_STEP = 1
+# Frame of the video where the processing starts
+APPL_VIDEO_START_FRAME = 0
+# Time budget of a frame in ms. Optional jobs are skipped when the frame would miss it. None to run all the jobs of every frame
+APPL_FRAME_DEADLINE_MS = None
+# Priorities of the optional jobs by job name. Jobs with lower priority are skipped first, jobs that are not here are never skipped
+APPL_JOB_PRIORITIES = dict()
 # pictures to show
 APPL_SHOW_PICT = False
 APPL_SHOW_LIST = []
@@ -40,6 +119,8 @@ APPL_SHOW_TIME = 0  # 0 to hold picture.
 APPL_SAVE_PICT = True
 APPL_SAVE_PICT_LIST = []
 APPL_SAVE_JOB_NAME = False
+# ports of deleted duplicated jobs and the port that replaces them. The ports are saved and shown with the names requested by user
+APPL_MERGED_PORTS = dict()
 APPl_SAVE_PICT_EXTENSION = '.png'
 APPL_SAVE_LOCATION = 'Logs/application_results'  # use '' for default
 
@@ -65,6 +146,15 @@ BENCHMARK_BSDS_500_N_THRESHOLDS = 5
 # log files configuration
 LOG_FILE = 'Logs/console.log'
 LOG_KPI_FILE = 'Logs/log.csv'
+LOG_TIME_FILE = 'Logs/time_statistics.json'
+# Level of texts that are logged: 10 debug(state of jobs every frame), 20 info, 40 only errors
+LOG_LEVEL = 20
+# If the console and the log files are written by a writer thread
+LOG_ASYNC = True
+# Maximum number of texts the writer thread writes together
+LOG_BATCH_SIZE = 1024
+# Number of KPI rows written together in the KPI file
+LOG_KPI_CHUNK_ROWS = 1024
 
 
 class PYRAMID_LEVEL:
@@ -0,0 +1,175 @@
+import csv
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+"""
+Fixtures of the tests of the EECVF.
+The runs of the APPL block are done by tests/synthetic_main.py in a new process, in a folder of the test, because the APPL block
+keeps its configuration in global variables.
+"""
+
+REPO_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYNTHETIC_MAIN = os.path.join(REPO_FOLDER, 'tests', 'synthetic_main.py')
+NR_FRAMES = 8
+FRAME_SHAPE = (24, 32, 3)
+
+# the tests import the modules of the repository
+if REPO_FOLDER not in sys.path:
+    sys.path.insert(0, REPO_FOLDER)
+
+
+def get_run_env() -> dict:
+    """
+    :return: environment of the processes that run the APPL block, with the repository in the python path
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([REPO_FOLDER] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+
+    return env
+
+
+def start_synthetic_main(folder: str, settings: dict, clean: bool = True) -> subprocess.Popen:
+    """
+    Starts the synthetic main in a new process
+    :param folder: folder where the run writes
+    :param settings: settings of synthetic main
+    :param clean: if the saved ports and the KPI file of a previous run in the folder are removed
+    :return: process
+    """
+    os.makedirs(folder, exist_ok=True)
+    if clean is True:
+        shutil.rmtree(os.path.join(folder, 'out'), ignore_errors=True)
+        if os.path.isfile(os.path.join(folder, 'Logs', 'log.csv')):
+            os.remove(os.path.join(folder, 'Logs', 'log.csv'))
+
+    settings = dict(settings, save_location='out')
+
+    return subprocess.Popen([sys.executable, SYNTHETIC_MAIN, json.dumps(settings)], cwd=folder, env=get_run_env(),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+
+def read_saved_ports(folder: str) -> dict:
+    """
+    :param folder: folder of the run
+    :return: dictionary of saved image file, relative to the save location, and image
+    """
+    location = os.path.join(folder, 'out')
+    images = dict()
+
+    for root, _, files in os.walk(location):
+        for file in files:
+            images[os.path.relpath(os.path.join(root, file), location)] = cv2.imread(os.path.join(root, file), cv2.IMREAD_UNCHANGED)
+
+    return images
+
+
+def read_kpi(folder: str) -> list:
+    """
+    :param folder: folder of the run
+    :return: rows of the KPI file without the time columns of the jobs, first row is the header
+    """
+    with open(os.path.join(folder, 'Logs', 'log.csv'), 'r', newline='') as file:
+        rows = [row for row in csv.reader(file) if len(row) > 0]
+
+    kept = [index for index in range(len(rows[0])) if not rows[0][index].endswith('Avg Time[ms]')]
+
+    return [[row[index] if index < len(row) else None for index in kept] for row in rows]
+
+
+class RunResult:
+    """
+    Saved ports and KPI values of a run of synthetic main
+    """
+
+    def __init__(self, folder: str) -> None:
+        self.images = read_saved_ports(folder)
+        self.kpi = read_kpi(folder)
+
+    def assert_same(self, other: 'RunResult') -> None:
+        """
+        Checks that two runs saved the same ports and logged the same KPI values
+        :param other: run to compare with
+        :return: None
+        """
+        assert len(self.images) > 0
+        assert sorted(self.images.keys()) == sorted(other.images.keys())
+        for file in self.images.keys():
+            assert self.images[file] is not None, file
+            assert np.array_equal(self.images[file], other.images[file]), file
+        assert self.kpi == other.kpi
+
+
+def run_synthetic_main(folder: str, **settings) -> RunResult:
+    """
+    Runs the synthetic main until it ends
+    :param folder: folder where the run writes
+    :param settings: settings of synthetic main
+    :return: result of run
+    """
+    process = start_synthetic_main(folder, settings)
+    _, error = process.communicate(timeout=600)
+    assert process.returncode == 0, error.decode(errors='replace')
+
+    return RunResult(folder)
+
+
+@pytest.fixture(scope='session')
+def image_folder(tmp_path_factory) -> str:
+    """
+    :return: folder with random images
+    """
+    folder = str(tmp_path_factory.mktemp('images'))
+    generator = np.random.default_rng(0)
+
+    for frame in range(NR_FRAMES):
+        cv2.imwrite(os.path.join(folder, 'img_{:02d}.png'.format(frame)), generator.integers(0, 256, FRAME_SHAPE, dtype=np.uint8))
+
+    return folder
+
+
+@pytest.fixture(scope='session')
+def video_file(tmp_path_factory) -> str:
+    """
+    :return: location of a video with random frames
+    """
+    file = os.path.join(str(tmp_path_factory.mktemp('video')), 'video.avi')
+    generator = np.random.default_rng(1)
+    writer = cv2.VideoWriter(file, cv2.VideoWriter_fourcc(*'MJPG'), 10, (FRAME_SHAPE[1], FRAME_SHAPE[0]))
+
+    for frame in range(NR_FRAMES):
+        writer.write(generator.integers(0, 256, FRAME_SHAPE, dtype=np.uint8))
+    writer.release()
+
+    return file
+
+
+@pytest.fixture
+def run_synthetic():
+    """
+    :return: function that runs the synthetic main in a folder with the settings given as keywords and returns the result
+    """
+    return run_synthetic_main
+
+
+@pytest.fixture
+def start_synthetic():
+    """
+    :return: function that starts the synthetic main in a folder with a dictionary of settings and returns the process, clean=False
+             keeps the saved ports and the KPI file of the previous run
+    """
+    return start_synthetic_main
+
+
+@pytest.fixture
+def read_run():
+    """
+    :return: function that reads the result of a run from its folder
+    """
+    return RunResult
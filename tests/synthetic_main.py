@@ -0,0 +1,66 @@
+import json
+import sys
+
+import Application
+import config_main as CONFIG
+
+"""
+Main used by the tests to run a small synthetic job graph with the schedulers and run modes of the APPL block.
+The settings are given as a json dictionary in the first argument and the run writes in the current folder.
+"""
+
+
+def main(settings: dict) -> None:
+    """
+    Configures and runs the synthetic job graph.
+    :param settings: dictionary with: input_folder or input_video, save_location, workers, pipeline_depth, processes, waves,
+                     port_aliasing, dead_job_elimination, job_cache, checkpoint_frames, resume, tact_ms
+    :return: None
+    """
+    CONFIG.JSON_FILE_LOCATION = 'Logs'
+    Application.set_logging(level='ERROR', asynchronous=False)
+
+    if settings.get('input_video') is not None:
+        Application.set_input_video(settings['input_video'])
+        raw = Application.do_get_video_job(port_output_name='RAW')
+    else:
+        Application.set_input_image_folder(settings['input_folder'])
+        raw = Application.do_get_image_job(port_output_name='RAW')
+
+    waves = settings.get('waves', 1)
+    Application.set_number_waves(waves)
+
+    blur_a = Application.do_gaussian_blur_image_job(port_input_name=raw, port_output_name='BLUR_A', kernel_size=3, is_rgb=True)
+    blur_b = Application.do_gaussian_blur_image_job(port_input_name=raw, port_output_name='BLUR_B', kernel_size=5, is_rgb=True)
+    # same job as BLUR_A with other output port
+    blur_c = Application.do_gaussian_blur_image_job(port_input_name=raw, port_output_name='BLUR_C', kernel_size=3, is_rgb=True)
+    sum_ab = Application.do_matrix_sum_job(port_input_name_1=blur_a, port_input_name_2=blur_b, port_output_name='SUM', is_rgb=True)
+    diff_bc = Application.do_matrix_difference_job(port_input_name_1=blur_b, port_input_name_2=blur_c, port_output_name='DIFF',
+                                                   normalize_image=False, is_rgb=True)
+    # job that no saved port needs
+    Application.do_gaussian_blur_image_job(port_input_name=sum_ab, port_output_name='DEAD', kernel_size=7, is_rgb=True)
+    ports_to_save = [sum_ab + '_L0', diff_bc + '_L0', blur_c + '_L0']
+
+    if waves > 1:
+        motion = Application.do_matrix_difference_job(port_input_name_1=blur_a, port_input_name_2=blur_a, wave_offset_port_2=1,
+                                                      port_output_name='MOTION', normalize_image=False, is_rgb=True)
+        ports_to_save.append(motion + '_L0')
+
+    if settings.get('tact_ms', 0) > 0:
+        Application.do_tact_simulation_job(time_ms=settings['tact_ms'], port_input_name=sum_ab)
+
+    Application.set_number_workers(settings.get('workers', 1))
+    Application.set_pipeline_depth(settings.get('pipeline_depth', 1))
+    Application.set_number_processes(settings.get('processes', 1))
+    Application.set_port_aliasing(settings.get('port_aliasing', False))
+    Application.set_dead_job_elimination(settings.get('dead_job_elimination', False))
+    Application.set_job_cache(location='Logs/job_cache' if settings.get('job_cache', False) is True else None)
+    Application.set_checkpoint(frames=settings.get('checkpoint_frames', 0), resume=settings.get('resume', False))
+
+    Application.create_config_file()
+    Application.configure_save_pictures(location=settings['save_location'], ports_to_save=ports_to_save)
+    Application.run_application()
+
+
+if __name__ == "__main__":
+    main(json.loads(sys.argv[1]))
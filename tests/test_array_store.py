@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+
+from Utils.array_store import ArrayStore, get_store_state, remove_array_store
+
+"""
+Tests of the array stores of the saved ports.
+"""
+
+
+def test_append_and_read(tmp_path):
+    store = ArrayStore(str(tmp_path))
+    image = np.arange(24 * 32 * 3, dtype=np.uint8).reshape((24, 32, 3))
+    values = np.linspace(0, 1, 10, dtype=np.float32)
+
+    store.append('image', image)
+    store.append('values', values)
+
+    assert store.keys() == ['image', 'values']
+    assert np.array_equal(store.read('image'), image)
+    assert store.read('values').dtype == np.float32
+    assert np.array_equal(store.read('values'), values)
+    assert store.read('missing') is None
+    store.close()
+
+
+def test_store_is_read_again(tmp_path):
+    store = ArrayStore(str(tmp_path))
+    store.append('a', np.full((4, 4), 1, dtype=np.uint8))
+    store.append('b', np.full((4, 4), 2, dtype=np.uint8))
+    # the last array of a key is used
+    store.append('a', np.full((4, 4), 3, dtype=np.uint8))
+    store.append('empty', np.zeros((0, 4), dtype=np.uint8))
+    store.close()
+
+    store = ArrayStore(str(tmp_path))
+
+    assert sorted(store.keys()) == ['a', 'b', 'empty']
+    assert np.array_equal(store.read('a'), np.full((4, 4), 3, dtype=np.uint8))
+    assert np.array_equal(store.read('b'), np.full((4, 4), 2, dtype=np.uint8))
+    assert store.read('empty').shape == (0, 4)
+
+
+def test_new_chunk_after_chunk_size(tmp_path):
+    store = ArrayStore(str(tmp_path), chunk_bytes=100)
+    arrays = [np.full((8, 8), value, dtype=np.uint8) for value in range(5)]
+
+    for index in range(len(arrays)):
+        store.append(str(index), arrays[index])
+    store.close()
+
+    assert sorted(file for file in os.listdir(str(tmp_path)) if file.startswith('chunk')) == \
+        ['chunk_{:05d}.bin'.format(chunk) for chunk in range(5)]
+
+    # appending after the store is read again continues in the last chunk
+    store = ArrayStore(str(tmp_path), chunk_bytes=100)
+    store.append('5', np.full((8, 8), 5, dtype=np.uint8))
+    store.close()
+
+    store = ArrayStore(str(tmp_path))
+    for index in range(6):
+        assert np.array_equal(store.read(str(index)), np.full((8, 8), index, dtype=np.uint8))
+    assert len([file for file in os.listdir(str(tmp_path)) if file.startswith('chunk')]) == 6
+
+
+def test_writers_of_store(tmp_path):
+    for writer in ['_0', '_1']:
+        store = ArrayStore(str(tmp_path), writer=writer)
+        store.append('frame' + writer, np.full((2, 2), int(writer[1]), dtype=np.uint8))
+        store.close()
+
+    store = ArrayStore(str(tmp_path))
+
+    assert sorted(store.keys()) == ['frame_0', 'frame_1']
+    assert np.array_equal(store.read('frame_1'), np.ones((2, 2), dtype=np.uint8))
+    assert len(get_store_state(str(tmp_path))) == 2
+
+    remove_array_store(str(tmp_path))
+
+    assert get_store_state(str(tmp_path)) == ()
+    assert os.listdir(str(tmp_path)) == []
@@ -0,0 +1,55 @@
+import glob
+import os
+import signal
+import time
+
+"""
+Tests that a run killed after a checkpoint continues from the checkpoint and ends with the same saved ports and KPI values as a
+run that was not interrupted.
+"""
+
+
+def get_file_times(folder: str) -> dict:
+    """
+    :param folder: folder of the run
+    :return: dictionary of saved image file and time of change
+    """
+    times = dict()
+
+    for root, _, files in os.walk(os.path.join(folder, 'out')):
+        for file in files:
+            times[os.path.join(root, file)] = os.stat(os.path.join(root, file)).st_mtime_ns
+
+    return times
+
+
+def test_killed_run_resumes(tmp_path, image_folder, run_synthetic, start_synthetic, read_run):
+    # the tact job makes every frame last 100 ms so the run is killed between the checkpoint and its end
+    settings = dict(input_folder=image_folder, waves=2, tact_ms=100, checkpoint_frames=2)
+    expected = run_synthetic(str(tmp_path / 'uninterrupted'), **settings)
+
+    folder = str(tmp_path / 'killed')
+    process = start_synthetic(folder, settings)
+    checkpoint = os.path.join(folder, 'Logs', 'checkpoint', 'checkpoint_*.pkl')
+    end = time.time() + 600
+    while not glob.glob(checkpoint) and process.poll() is None and time.time() < end:
+        time.sleep(0.01)
+
+    assert process.poll() is None, 'run ended before the first checkpoint'
+    assert glob.glob(checkpoint), 'no checkpoint saved'
+    process.kill()
+    process.communicate()
+
+    assert process.returncode == (-signal.SIGKILL if hasattr(signal, 'SIGKILL') else 1)
+    # the checkpoint is deleted when a run ends
+    assert glob.glob(checkpoint), 'run ended before it was killed'
+    written = get_file_times(folder)
+
+    process = start_synthetic(folder, dict(settings, resume=True), clean=False)
+    _, error = process.communicate(timeout=600)
+    assert process.returncode == 0, error.decode(errors='replace')
+
+    read_run(folder).assert_same(expected)
+    # the frames before the checkpoint are not run again
+    assert any(os.stat(file).st_mtime_ns == written_time for file, written_time in written.items())
+    assert not glob.glob(checkpoint)
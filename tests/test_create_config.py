@@ -0,0 +1,101 @@
+import pytest
+
+import config_main
+from Application.Config import create_config
+
+"""
+Tests of the job sort of the config creation.
+"""
+
+
+@pytest.fixture(autouse=True)
+def empty_job_list(monkeypatch):
+    monkeypatch.setattr(create_config, 'jobs_dict', [])
+    monkeypatch.setattr(create_config, 'created_port_list', [])
+    monkeypatch.setattr(create_config, 'plan_warnings', [])
+    monkeypatch.setattr(config_main, 'APPL_NR_WAVES', 2)
+
+
+def add_job(name: str, input_ports: list = None, output_ports: list = None, input_wave_offsets: list = None) -> None:
+    output_ports = [(port, 'L0_SIZE', 'B', True) for port in output_ports or []]
+    create_config.jobs_dict.append(create_config.create_dictionary_element(
+        job_module='module', job_name=name, init_func_name='init_func', main_func_name='main_func', output_ports=output_ports,
+        input_ports=input_ports, max_wave=max(input_wave_offsets or [0]), input_wave_offsets=input_wave_offsets))
+
+
+def get_order() -> list:
+    """
+    :return: names of the active jobs in order of processing level
+    """
+    jobs = [job for job in create_config.jobs_dict if job['active'] is True]
+
+    return [job['name'] for job in sorted(jobs, key=lambda job: job['processing level'])]
+
+
+def get_disabled() -> list:
+    return [job['name'] for job in create_config.jobs_dict if job['active'] is False]
+
+
+def test_jobs_after_the_jobs_of_their_inputs():
+    add_job('sum', ['A', 'B'], ['SUM'])
+    add_job('a', ['RAW'], ['A'])
+    add_job('get image', None, ['RAW'])
+    add_job('b', ['RAW'], ['B'])
+
+    create_config.sort_jobs_to_avoid_missing_inputs()
+
+    assert get_order() == ['get image', 'a', 'b', 'sum']
+    assert get_disabled() == []
+
+
+def test_order_of_independent_jobs_is_kept():
+    add_job('get image', None, ['RAW'])
+    for name in ['d', 'c', 'b', 'a']:
+        add_job(name, ['RAW'], [name.upper()])
+    add_job('late input', ['LATE'], ['X'])
+    add_job('late', ['RAW'], ['LATE'])
+
+    create_config.sort_jobs_to_avoid_missing_inputs()
+
+    assert get_order() == ['get image', 'd', 'c', 'b', 'a', 'late', 'late input']
+
+
+def test_cycle_is_disabled():
+    add_job('get image', None, ['RAW'])
+    add_job('a', ['RAW', 'C'], ['A'])
+    add_job('b', ['A'], ['B'])
+    add_job('c', ['B'], ['C'])
+    add_job('after cycle', ['C'], ['D'])
+    add_job('other', ['RAW'], ['E'])
+
+    create_config.sort_jobs_to_avoid_missing_inputs()
+
+    assert get_order() == ['get image', 'other']
+    assert get_disabled() == ['a', 'b', 'c', 'after cycle']
+    assert any(text.startswith('CYCLE OF JOBS a, b, c') for text, _ in create_config.plan_warnings)
+    assert any(text.startswith('JOB after cycle WAITS FOR DISABLED JOBS') for text, _ in create_config.plan_warnings)
+
+
+def test_dangling_input_is_disabled():
+    add_job('get image', None, ['RAW'])
+    add_job('dangling', ['RAW', 'NOT_CREATED'], ['A'])
+    add_job('after dangling', ['A'], ['B'])
+    add_job('other', ['RAW'], ['C'])
+
+    create_config.sort_jobs_to_avoid_missing_inputs()
+
+    assert get_order() == ['get image', 'other']
+    assert get_disabled() == ['dangling', 'after dangling']
+    assert ('JOB dangling INPUT PORTS NOT CREATED BY ANY JOB', 'NOT_CREATED') in create_config.plan_warnings
+
+
+def test_input_of_previous_wave_is_not_a_cycle():
+    add_job('get image', None, ['RAW'])
+    # uses its own output and the output of a later job from the previous wave
+    add_job('accumulate', ['RAW', 'ACC', 'B'], ['ACC'], input_wave_offsets=[0, 1, 1])
+    add_job('b', ['ACC'], ['B'])
+
+    create_config.sort_jobs_to_avoid_missing_inputs()
+
+    assert get_order() == ['get image', 'accumulate', 'b']
+    assert get_disabled() == []
@@ -0,0 +1,82 @@
+import pytest
+
+import config_main
+from Application.Schedulers import frame_deadline
+
+"""
+Tests of the decision to skip the optional jobs of a frame with a deadline.
+"""
+
+
+class FakeJob:
+    """
+    Job with a fixed average time
+    """
+
+    def __init__(self, name: str, time: float, priority: int = None) -> None:
+        self.__name__ = name
+        self.time = time
+        self.priority = priority
+
+    def can_skip(self) -> bool:
+        return self.priority is not None
+
+    def get_priority(self) -> int:
+        return self.priority
+
+    def get_average_time(self) -> float:
+        return self.time
+
+
+@pytest.fixture(autouse=True)
+def frame_start(monkeypatch):
+    monkeypatch.setattr(frame_deadline, 'get_frame_time', lambda: 5.0)
+    monkeypatch.setattr(frame_deadline, 'JOBS_SHED', dict())
+    monkeypatch.setattr(config_main, 'APPL_FRAME_DEADLINE_MS', 30.0)
+
+
+def test_no_deadline(monkeypatch):
+    monkeypatch.setattr(config_main, 'APPL_FRAME_DEADLINE_MS', None)
+    jobs = [FakeJob('optional', 100.0, priority=1)]
+
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[]) is False
+
+
+def test_required_job_is_not_skipped():
+    jobs = [FakeJob('required', 100.0)]
+
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[]) is False
+
+
+def test_serial_jobs_sum_of_times():
+    jobs = [FakeJob('optional', 10.0, priority=1), FakeJob('a', 10.0), FakeJob('b', 10.0)]
+
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[1, 2]) is True
+    assert frame_deadline.JOBS_SHED == {'optional': 1}
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[1]) is False
+
+
+def test_optional_jobs_with_lower_priority_are_not_counted():
+    jobs = [FakeJob('optional', 10.0, priority=1), FakeJob('lower', 10.0, priority=0), FakeJob('higher', 10.0, priority=2),
+            FakeJob('a', 6.0)]
+
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[1, 3]) is False
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[1, 2, 3]) is True
+
+
+def test_parallel_jobs_share_workers():
+    jobs = [FakeJob('optional', 10.0, priority=1), FakeJob('a', 10.0), FakeJob('b', 10.0)]
+    dependents = [[], [], []]
+
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[1, 2], dependents=dependents, workers=1) is True
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[1, 2], dependents=dependents, workers=2) is False
+
+
+def test_parallel_jobs_critical_path():
+    jobs = [FakeJob('optional', 10.0, priority=1), FakeJob('a', 10.0), FakeJob('b', 10.0)]
+    # optional -> a -> b
+    dependents = [[1], [2], []]
+
+    assert frame_deadline.get_critical_path_time(jobs, {0, 1, 2}, dependents) == 30.0
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[1, 2], dependents=dependents, workers=3) is True
+    assert frame_deadline.is_job_shed(jobs, 0, waiting=[2], dependents=dependents, workers=3) is False
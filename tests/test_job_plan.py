@@ -0,0 +1,71 @@
+from Application.Utils.job_plan import JobPlan
+
+"""
+Tests of the check of the job plan.
+"""
+
+
+def get_element(name: str, input_ports: list = None, output_ports: list = None, main_function: str = 'main_func', size=100,
+                port_type: str = 'B') -> dict:
+    """
+    :return: job as in the json file, with the functions of the tact simulation job
+    """
+    return {'name': name, 'package': 'Jobs', 'module': 'simulation_tact_1ms', 'init function': 'init_func',
+            'main function': main_function, 'init function parameters': None, 'main function parameters': None,
+            'input ports': [{'port name': port, 'wave offset': 0} for port in input_ports] if input_ports is not None else None,
+            'output ports': [{'port name': port, 'port size': size, 'port type': port_type, 'is image': True}
+                             for port in output_ports] if output_ports is not None else None,
+            'max wave': 0}
+
+
+def get_plan(*elements) -> JobPlan:
+    plan = JobPlan()
+    for element in elements:
+        plan.add_job(element)
+    plan.validate()
+
+    return plan
+
+
+def test_valid_jobs_are_kept():
+    plan = get_plan(get_element('get', None, ['RAW']), get_element('a', ['RAW'], ['A']), get_element('b', ['RAW', 'A'], ['B']))
+
+    assert [job.name for job in plan.jobs] == ['get', 'a', 'b']
+    assert len(plan.errors) == 0
+    assert plan.ports == {'RAW': (100, 'B', 'get'), 'A': (100, 'B', 'a'), 'B': (100, 'B', 'b')}
+
+
+def test_jobs_using_removed_jobs_are_removed():
+    plan = get_plan(get_element('get', None, ['RAW']),
+                    get_element('broken', ['RAW'], ['A'], main_function='not_a_function'),
+                    get_element('uses broken', ['A'], ['B']),
+                    get_element('uses uses broken', ['RAW', 'B'], ['C']),
+                    get_element('other', ['RAW'], ['D']))
+
+    assert [job.name for job in plan.jobs] == ['get', 'other']
+    assert list(plan.errors.keys()) == ['broken', 'uses broken', 'uses uses broken']
+    assert plan.errors['uses broken'] == ['input port A is created by job broken that is removed']
+    assert plan.errors['uses uses broken'] == ['input port B is created by job uses broken that is removed']
+    assert sorted(plan.ports.keys()) == ['D', 'RAW']
+
+
+def test_input_port_not_created():
+    plan = get_plan(get_element('get', None, ['RAW']), get_element('a', ['RAW', 'MISSING'], ['A']))
+
+    assert [job.name for job in plan.jobs] == ['get']
+    assert plan.errors['a'] == ['input port MISSING is not created by any job']
+
+
+def test_port_created_with_other_size():
+    plan = get_plan(get_element('get', None, ['RAW']), get_element('a', ['RAW'], ['A']), get_element('b', ['RAW'], ['A'], size=50))
+
+    assert [job.name for job in plan.jobs] == ['get', 'a']
+    assert list(plan.errors.keys()) == ['b']
+
+
+def test_unknown_port_type_and_size():
+    plan = get_plan(get_element('get', None, ['RAW']), get_element('a', ['RAW'], ['A'], port_type='X'),
+                    get_element('b', ['RAW'], ['B'], size='UNKNOWN_SIZE'))
+
+    assert [job.name for job in plan.jobs] == ['get']
+    assert list(plan.errors.keys()) == ['a', 'b']
@@ -0,0 +1,56 @@
+from Application.Frame.port_planner import assign_shared_memory, get_port_lifetimes
+
+"""
+Tests of the memory planner of the ports.
+"""
+
+
+class FakeJob:
+    """
+    Job with input and output ports
+    """
+
+    def __init__(self, input_ports: list, output_ports: list) -> None:
+        self.input_ports = input_ports
+        self.output_ports = [(port, 'L0_SIZE', 'B', True) for port in output_ports]
+
+    def get_input_ports(self) -> list:
+        return self.input_ports
+
+    def get_out_ports(self) -> list:
+        return self.output_ports
+
+
+def test_port_lifetimes():
+    jobs = [FakeJob([], ['RAW']), FakeJob(['RAW', 'PREV'], ['A']), FakeJob(['A'], ['B']), FakeJob(['RAW'], ['A'])]
+
+    lifetimes, read_before_write = get_port_lifetimes(jobs)
+
+    assert lifetimes == {'RAW': (0, 3), 'A': (1, 3), 'B': (2, 2)}
+    assert read_before_write == {'PREV'}
+
+
+def test_ports_used_in_other_times_share_memory():
+    groups = assign_shared_memory({'A': (0, 1), 'B': (2, 3), 'C': (4, 5)}, {'A': 10, 'B': 10, 'C': 10})
+
+    assert groups == [['A', 'B', 'C']]
+
+
+def test_ports_used_in_same_time_do_not_share_memory():
+    # B is written by the job that reads A last
+    groups = assign_shared_memory({'A': (0, 1), 'B': (1, 2), 'C': (0, 3)}, {'A': 10, 'B': 10, 'C': 10})
+
+    assert sorted(sorted(group) for group in groups) == [['A'], ['B'], ['C']]
+    assert all(len(set(group) & {'A', 'B'}) < 2 for group in groups)
+
+
+def test_port_takes_group_with_closest_size():
+    groups = assign_shared_memory({'BIG': (0, 0), 'SMALL': (0, 0), 'C': (1, 1)}, {'BIG': 100, 'SMALL': 10, 'C': 8})
+
+    assert groups == [['BIG'], ['SMALL', 'C']]
+
+
+def test_port_larger_than_free_groups_takes_largest_group():
+    groups = assign_shared_memory({'A': (0, 0), 'B': (0, 0), 'C': (1, 1), 'D': (1, 1)}, {'A': 10, 'B': 20, 'C': 50, 'D': 5})
+
+    assert groups == [['B', 'C'], ['A', 'D']]
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+"""
+Tests that the schedulers and the run modes of the APPL block save the same ports and log the same KPI values as the round robin
+scheduler, run_rr, on the synthetic job graph.
+"""
+
+
+@pytest.mark.parametrize('waves', [1, 2])
+def test_dag_scheduler(tmp_path, image_folder, run_synthetic, waves):
+    expected = run_synthetic(str(tmp_path / 'rr'), input_folder=image_folder, waves=waves)
+    result = run_synthetic(str(tmp_path / 'dag'), input_folder=image_folder, waves=waves, workers=4)
+
+    result.assert_same(expected)
+
+
+def test_pipeline_scheduler(tmp_path, video_file, run_synthetic):
+    expected = run_synthetic(str(tmp_path / 'rr'), input_video=video_file)
+    result = run_synthetic(str(tmp_path / 'pipeline'), input_video=video_file, pipeline_depth=3, workers=3)
+
+    result.assert_same(expected)
+
+
+def test_process_sharding(tmp_path, image_folder, run_synthetic):
+    expected = run_synthetic(str(tmp_path / 'rr'), input_folder=image_folder)
+    result = run_synthetic(str(tmp_path / 'sharded'), input_folder=image_folder, processes=2)
+
+    result.assert_same(expected)
+
+
+def test_job_cache(tmp_path, image_folder, run_synthetic):
+    expected = run_synthetic(str(tmp_path / 'rr'), input_folder=image_folder)
+    first = run_synthetic(str(tmp_path / 'cache'), input_folder=image_folder, job_cache=True)
+    assert len(os.listdir(str(tmp_path / 'cache' / 'Logs' / 'job_cache'))) > 0
+    # the second run loads the outputs of the jobs from cache
+    second = run_synthetic(str(tmp_path / 'cache'), input_folder=image_folder, job_cache=True)
+
+    first.assert_same(expected)
+    second.assert_same(expected)
+
+
+def test_port_aliasing(tmp_path, image_folder, run_synthetic):
+    expected = run_synthetic(str(tmp_path / 'rr'), input_folder=image_folder)
+    result = run_synthetic(str(tmp_path / 'aliasing'), input_folder=image_folder, port_aliasing=True)
+
+    result.assert_same(expected)
+
+
+def test_dead_job_elimination(tmp_path, image_folder, run_synthetic):
+    expected = run_synthetic(str(tmp_path / 'rr'), input_folder=image_folder)
+    result = run_synthetic(str(tmp_path / 'dead_jobs'), input_folder=image_folder, dead_job_elimination=True)
+
+    result.assert_same(expected)
+
+
+def test_checkpoint(tmp_path, image_folder, run_synthetic):
+    expected = run_synthetic(str(tmp_path / 'rr'), input_folder=image_folder, waves=2)
+    result = run_synthetic(str(tmp_path / 'checkpoint'), input_folder=image_folder, waves=2, checkpoint_frames=3)
+    # the checkpoint of the run that ended is deleted so the run with resume starts from the first frame
+    resumed = run_synthetic(str(tmp_path / 'checkpoint'), input_folder=image_folder, waves=2, checkpoint_frames=3, resume=True)
+
+    result.assert_same(expected)
+    resumed.assert_same(expected)